@@ -1,6 +1,6 @@
 """Pinet - Erlang/OTP-inspired actor framework."""
 
-from .behaviours import Actor, Supervisor, RestartStrategy, ActorSystem
+from .behaviours import Actor, Supervisor, RestartStrategy, ActorSystem, OverflowPolicy, MailboxFull
 from .agent import Agent
 from .mcp import MCP
 from .llms import LLM
@@ -21,6 +21,8 @@ __all__ = [
     "Supervisor",
     "RestartStrategy",
     "ActorSystem",
+    "OverflowPolicy",
+    "MailboxFull",
     "MCP",
     "LLM",
     "Agent",
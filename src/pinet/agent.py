@@ -1,19 +1,24 @@
 # pinet/agent.py
 
+import asyncio
+import hashlib
 import inspect
 import json
 import logging
 import re
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 import inspect
 
 from pinet.behaviours.gen_server import GenServer
 from pinet.behaviours.supervisor import Supervisor
 from pinet.llms.factory import create_llm
-from pinet.memory import load_memory
-from pinet.mcp import MCP
+from pinet.llms.tool_calling import tool_spec
+from pinet.memory import load_memory, ChromaMemory
+from pinet.mcp import MCP, MCP_POOL
 from pinet import tools as local_tools
 from pinet.knowledge.rag_system import RAGSystem
+from pinet.context import ContextBuilder, truncate
+from pinet.response_cache import ResponseCache, context_scope
 
 import os
 
@@ -21,6 +26,24 @@ LLM_API_KEY = os.getenv("LLM_API_KEY")
 LLM_MODEL = os.getenv("LLM_MODEL")
 LLM_PROVIDER = os.getenv("LLM_PROVIDER")
 
+# Methods that may run side by side when an agent is created with max_concurrency > 1
+CONCURRENT_METHODS = ("tool",)
+# Added with concurrent_asks=True. Concurrent turns share the agent's memory, rolling
+# summary and tool_stats: their history entries interleave, and a turn's context may
+# include another turn's prompt without its reply.
+CONCURRENT_ASK_METHODS = ("ask", "ask_stream")
+
+# Reply prefixes that start a tool call or delegation block
+ACTION_MARKERS = ("[Tool Call]", "[Assign To]")
+
+
+def _partial_marker_len(text: str) -> int:
+    """Length of the longest suffix of text that could still grow into an action marker."""
+    for size in range(max(len(m) for m in ACTION_MARKERS) - 1, 0, -1):
+        if any(m.startswith(text[-size:]) for m in ACTION_MARKERS):
+            return size
+    return 0
+
 logging.basicConfig(level=logging.INFO)
 
 class Agent:
@@ -37,6 +60,26 @@ class Agent:
         self.server = None
         self.allowed_tools = {}
         self.team = {}
+        self.parallel_actions = False
+        self.action_concurrency = 4
+        self.action_timeout = None
+        self.system_prompt = None
+        self.system_prompt_hash = None
+        self._prompt_key = None
+        self._tool_lines_cache = {}
+        self._tool_specs_cache = {}
+        self.native_tools = True
+        self.max_tool_steps = 5
+        self.tool_stats = {"tool_turns": 0, "llm_steps": 0, "tool_calls": 0}
+        self.context = ContextBuilder()
+        self.response_cache = None
+
+    def _chroma_memory(self):
+        """The agent's ChromaMemory (directly or inside a HybridMemory), if any."""
+        for store in [self.memory, *getattr(self.memory, "components", [])]:
+            if isinstance(store, ChromaMemory):
+                return store
+        return None
 
     def _maybe_save_memory(self):
         if self.use_memory and self.memory and hasattr(self.memory, "save"):
@@ -56,6 +99,18 @@ class Agent:
         tools: Optional[Dict[str, str]] = None,  # {tool_name: "route_key"}
         team: Optional[Dict[str, Any]] = None,
         knowledge_source: Optional[str] = None,
+        max_concurrency: int = 1,
+        concurrent_asks: bool = False,
+        mailbox_size: int = 0,
+        overflow: str = "block",
+        parallel_actions: bool = False,
+        action_concurrency: int = 4,
+        action_timeout: Optional[float] = None,
+        context_tokens: int = 3000,
+        summarize: bool = True,
+        response_cache: Optional[Dict[str, Any]] = None,
+        native_tools: bool = True,
+        max_tool_steps: int = 5,
     ):
         self = cls(name)
         self.role = role or "assistant"
@@ -69,19 +124,35 @@ class Agent:
         self.team = { member.name: member for member in team } if team else {}
         self.llm_config = llm_config
         self.knowledge_source = knowledge_source
+        self.parallel_actions = parallel_actions
+        self.action_concurrency = action_concurrency
+        self.action_timeout = action_timeout
+        self.native_tools = native_tools
+        self.max_tool_steps = max_tool_steps
+        self.context = ContextBuilder(
+            token_budget=context_tokens,
+            summarizer=self._summarize_context if summarize else None,
+        )
+        if response_cache:
+            # opt-in: True for exact matching or {"max_entries", "ttl", "similarity"};
+            # similarity enables near-duplicate hits, see ResponseCache
+            self.response_cache = ResponseCache(**(response_cache if isinstance(response_cache, dict) else {}))
 
         # Initialize RAG system
-        self.rag_system =  RAGSystem(name, knowledge_source) if knowledge_source else None
+        self.rag_system =  RAGSystem(name, knowledge_source, vector_store=self._chroma_memory()) if knowledge_source else None
+        if self.rag_system:
+            # chunk and embed the source now (skipped when unchanged) rather than on the first ask
+            await asyncio.to_thread(self.rag_system.ingest)
 
         # Initialize MCPs
         if isinstance(mcp_config, dict) and any("command" in v for v in mcp_config.values()):
             for key, val in mcp_config.items():
-                self.mcps[key] = MCP.create(val)
+                self.mcps[key] = MCP_POOL.get(val)
                 mcp_tools = await self.mcps[key].get_tools()
                 for tool in mcp_tools:
                     self.allowed_tools[tool["name"]] = key
         elif mcp_config:
-            self.mcps["default"] = MCP.create(mcp_config)
+            self.mcps["default"] = MCP_POOL.get(mcp_config)
             mcp_tools = await self.mcps["default"].get_tools()
             for tool in mcp_tools:
                 self.allowed_tools[tool["name"]] = "default"
@@ -95,10 +166,8 @@ class Agent:
             elif route not in self.mcps:
                 raise ValueError(f"[{self.name}] Route '{route}' not found for tool '{tool_name}'")
 
-        # Set LLM with prompt
-        self.system_prompt = await self.build_system_prompt()
+        # Set LLM, then the prompt: its tool section depends on whether the LLM calls tools natively
         if llm_config:
-            llm_config["system"] = self.system_prompt
             self.llm = create_llm(**llm_config)
         elif LLM_API_KEY and LLM_MODEL and LLM_PROVIDER:
             llm_config = {
@@ -106,8 +175,10 @@ class Agent:
                 "api_key": LLM_API_KEY,
                 "model": LLM_MODEL,
             }
+            self.llm = create_llm(**llm_config)
+        await self.refresh_system_prompt()
+        if llm_config:
             llm_config["system"] = self.system_prompt
-            self.llm = create_llm(**llm_config) 
 
         # Set up GenServer
         self.server = GenServer(
@@ -117,76 +188,80 @@ class Agent:
             supervisor=supervisor,
             on_terminate=self._persist,
             on_restart=self.on_restart,
+            max_concurrency=max_concurrency,
+            # asks run alone unless opted in; remember/fail/voice_chat always do
+            concurrent_methods=CONCURRENT_METHODS + (CONCURRENT_ASK_METHODS if concurrent_asks else ()),
+            mailbox_size=mailbox_size,
+            overflow=overflow,
         )
         return self
 
     async def _persist(self, state: Dict[str, Any]):
         self._maybe_save_memory()
+        if self.use_memory and self.memory and hasattr(self.memory, "close"):
+            self.memory.close()
 
-    async def _describe_tools(self) -> list[str]:
-        """Generate signature lines for allowed tools across MCPs and local."""
-        tool_lines = []
+    async def _allowed_tool_entries(self) -> list[tuple[str, str, Any]]:
+        """(route, name, tool) for every allowed tool exposed by the agent's MCPs."""
+        entries = []
         for route, mcp in self.mcps.items():
             try:
                 tools = await mcp.get_tools()
-                if route == "local":
-                    for tool_name, tool in tools.items():
-                        if tool_name in self.allowed_tools:
-                            tname = getattr(tool, "__name__", None)
-                            doc = inspect.getdoc(tool)
-                            if doc:
-                                tool_lines.append(f"  # {doc.splitlines()[0]}")
-                            try:
-                                sig = str(inspect.signature(tool))
-                            except Exception:
-                                sig = "(...)"
-                            tool_lines.append(f"- `{tname}{sig}` (via `{route}`)")
-                        else:
-                            logging.warning(f"[{self.name}] Unknown tool type")
-                            continue
-                else:
-                    for tool in tools:
-                        # Determine tool name
-                        if isinstance(tool, dict):  # JSON-style tool description
-                            tname = tool.get("name")
-                            doc = tool.get("description")
-                            input_schema = tool.get("inputSchema", {})
-                            if not tname or tname not in self.allowed_tools:
-                                continue
-                            # Extract parameters from inputSchema
-                            params = input_schema.get("properties", {})
-                            required_params = input_schema.get("required", [])
-                            # Build parameter signature
-                            param_strs = []
-                            for k, v in params.items():
-                                param_type = v.get('type', 'any')
-                                if k in required_params:
-                                    param_strs.append(f"{k}: {param_type}")
-                                else:
-                                    param_strs.append(f"{k}?: {param_type}")
-                            sig = ", ".join(param_strs)
-                            tool_lines.append(f"- `{tname}({sig})` description: {doc} (via `{route}`)")
-                        elif callable(tool):
-                            tname = getattr(tool, "__name__", None)
-                            if not tname or tname not in self.allowed_tools:
-                                continue
-                            doc = inspect.getdoc(tool)
-                            if doc:
-                                tool_lines.append(f"  # {doc.splitlines()[0]}")
-                            try:
-                                sig = str(inspect.signature(tool))
-                            except Exception:
-                                sig = "(...)"
-                            tool_lines.append(f"- `{tname}{sig}` (via `{route}`)")
-                        else:
-                            logging.warning(f"[{self.name}] Unknown tool type")
-                            continue  # Skip unknown tool type
-
             except Exception as e:
                 logging.warning(f"[{self.name}] Failed to fetch tools from MCP '{route}': {e}")
+                continue
+            if isinstance(tools, dict):  # local tools: {name: callable}
+                items = tools.items()
+            else:
+                items = [(tool.get("name") if isinstance(tool, dict) else getattr(tool, "__name__", None), tool) for tool in tools]
+            for tname, tool in items:
+                if not isinstance(tool, dict) and not callable(tool):
+                    logging.warning(f"[{self.name}] Unknown tool type")
+                    continue  # Skip unknown tool type
+                if tname and tname in self.allowed_tools:
+                    entries.append((route, tname, tool))
+        return entries
 
+    async def _describe_tools(self) -> list[str]:
+        """Generate signature lines for allowed tools across MCPs and local."""
+        tool_lines = []
+        for route, tname, tool in await self._allowed_tool_entries():
+            if isinstance(tool, dict):  # JSON-style tool description
+                doc = tool.get("description")
+                input_schema = tool.get("inputSchema", {})
+                # Extract parameters from inputSchema
+                params = input_schema.get("properties", {})
+                required_params = input_schema.get("required", [])
+                # Build parameter signature
+                param_strs = []
+                for k, v in params.items():
+                    param_type = v.get('type', 'any')
+                    if k in required_params:
+                        param_strs.append(f"{k}: {param_type}")
+                    else:
+                        param_strs.append(f"{k}?: {param_type}")
+                sig = ", ".join(param_strs)
+                tool_lines.append(f"- `{tname}({sig})` description: {doc} (via `{route}`)")
+            else:
+                doc = inspect.getdoc(tool)
+                if doc:
+                    tool_lines.append(f"  # {doc.splitlines()[0]}")
+                try:
+                    sig = str(inspect.signature(tool))
+                except Exception:
+                    sig = "(...)"
+                tool_lines.append(f"- `{tname}{sig}` (via `{route}`)")
         return tool_lines
 
+    async def _describe_tool_specs(self) -> list[dict]:
+        """JSON-schema tool specs for native tool calling, from MCP inputSchema or local signatures."""
+        specs = []
+        for _, tname, tool in await self._allowed_tool_entries():
+            spec = tool_spec(tool, tname)
+            if spec:
+                specs.append(spec)
+        return specs
+
     async def _describe_team(self):
         team_lines = []
         for team_member in self.team.values():
@@ -194,8 +269,48 @@ class Agent:
         return team_lines
 
 
+    def _tools_key(self) -> str:
+        # id(mcp) changes when a route is re-created through /mcp or /tools
+        routes = sorted((route, id(mcp)) for route, mcp in self.mcps.items())
+        return json.dumps([sorted(self.allowed_tools.items()), routes])
+
+    async def _cached_tool_lines(self) -> list[str]:
+        key = self._tools_key()
+        if key not in self._tool_lines_cache:
+            self._tool_lines_cache = {key: await self._describe_tools()}
+        return self._tool_lines_cache[key]
+
+    async def _cached_tool_specs(self) -> list[dict]:
+        key = self._tools_key()
+        if key not in self._tool_specs_cache:
+            self._tool_specs_cache = {key: await self._describe_tool_specs()}
+        return self._tool_specs_cache[key]
+
+    def _uses_native_tools(self) -> bool:
+        """Whether tool turns go through the provider's structured tool calling."""
+        return bool(self.native_tools and self.allowed_tools and getattr(self.llm, "native_tools", False))
+
+    def _prompt_cache_key(self) -> str:
+        team = sorted((m.name, m.role, m.goal) for m in self.team.values())
+        return json.dumps([self.name, self.description, self.role, self.goal, self._tools_key(), self._uses_native_tools(), team])
+
+    async def refresh_system_prompt(self) -> str:
+        """Rebuild the system prompt if tools, team or role changed and push it to the LLM.
+
+        The prompt is kept byte-identical between turns otherwise, so provider-side
+        prefix caches (Anthropic cache_control, OpenAI automatic caching) keep hitting.
+        """
+        key = self._prompt_cache_key()
+        if key != self._prompt_key or self.system_prompt is None:
+            self.system_prompt = await self.build_system_prompt()
+            self.system_prompt_hash = hashlib.sha256(self.system_prompt.encode()).hexdigest()
+            self._prompt_key = key
+        if self.llm and self.llm.system != self.system_prompt:
+            self.llm.system = self.system_prompt
+        return self.system_prompt
+
     async def build_system_prompt(self) -> str:
-        tool_lines = await self._describe_tools()
+        tool_lines = await self._cached_tool_lines()
         team_lines = await self._describe_team()
 
         prompt = (f"""
@@ -238,7 +353,21 @@ Your primary **goal** is: {self.goal}
 ---
 """)
 
-        if self.allowed_tools:
+        if self.allowed_tools and self._uses_native_tools():
+            # the tool schemas travel with each request, so they are not repeated here
+            prompt += (f"""
+## Tool Usage
+You can call the tools provided with this conversation.
+
+**Use tools only when necessary** — for example, when a question cannot be answered directly with your own reasoning.
+**Rules:**
+- Do **not** invent tool names or arguments.
+- Never use tools for greetings, definitions, or general knowledge.
+- Once you have the tool results you need, answer the user directly.
+
+---
+""")
+        elif self.allowed_tools:
             prompt += (f"""
 ## Tool Usage
 You have access to the following optional tool(s):
@@ -318,12 +447,63 @@ You may also delegate tasks to the following team members or worker agents:
     async def stop(self):
         await self.server.stop()
 
+    def metrics(self) -> Dict[str, Any]:
+        metrics = self.server.metrics()
+        metrics["context"] = self.context.metrics()
+        if self.response_cache:
+            metrics["response_cache"] = self.response_cache.metrics()
+        metrics["tools"] = dict(self.tool_stats)
+        return metrics
+
     async def ask(self, prompt: str) -> str:
         return await self.server.call("ask", prompt)
 
+    async def ask_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Like ask, but yields the reply in chunks as the LLM produces them.
+
+        Text-protocol tool calls and delegations are not streamed: once one starts, the
+        rest of the turn is handled as in ask and its combined result is yielded as the
+        last chunk. With native tool calling the text of every step is streamed.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        call = asyncio.create_task(self.server.call("ask_stream", {"prompt": prompt, "queue": queue}))
+        try:
+            while True:
+                get = asyncio.create_task(queue.get())
+                done, _ = await asyncio.wait({get, call}, return_when=asyncio.FIRST_COMPLETED)
+                if get in done:
+                    yield get.result()
+                    continue
+                get.cancel()
+                while not queue.empty():
+                    yield queue.get_nowait()
+                call.result()  # re-raise handler errors
+                return
+        finally:
+            call.cancel()
+
     async def remember(self, data: str):
         await self.server.cast("remember", data)
 
+    def store_knowledge(self, source: str, chunks: list[str]) -> bool:
+        """Write knowledge chunks straight to memory, bypassing the mailbox.
+
+        Meant for loading knowledge before the agent starts, when nothing drains
+        the mailbox. Returns False if the agent has no memory to store them in.
+        """
+        if not (self.use_memory and self.memory):
+            return False
+        entries = [{"role": "user", "content": f"[Knowledge from {source}] {chunk}"} for chunk in chunks]
+        if hasattr(self.memory, "add_many"):
+            self.memory.add_many(entries)
+        else:
+            for entry in entries:
+                self.memory.add(entry)
+        self._maybe_save_memory()
+        if hasattr(self.memory, "flush"):
+            self.memory.flush()  # batched backends: make sure the chunks are written, not just queued
+        return True
+
     async def cast(self, method: str, payload: dict):
         return await self.server.cast(method, payload)
 
@@ -331,72 +511,291 @@ You may also delegate tasks to the following team members or worker agents:
         return await self.server.call("tool", {"name": tool_name, "payload": payload})
 
     async def _ask(self, prompt: str) -> str:
+        query = prompt
+        prompt, messages = await self._prepare_ask(prompt)
+        scope = self._cache_scope(messages)
+        cached = await self.response_cache.get(scope, query) if scope else None
+        if cached is not None:
+            return await self._finish_ask(prompt, cached)
+
+        tool_calls = 0
+        if self.llm and self._uses_native_tools():
+            response, tool_calls = await self._tool_loop(messages)
+        elif self.llm :
+            response = await self.llm.chat(messages)
+        else:
+            response = "No LLM configured"
+
+        result = await self._finish_ask(prompt, response)
+        await self._cache_response(scope, query, response, tool_calls)
+        return result
+
+    def _cache_scope(self, messages: list[dict]) -> Optional[str]:
+        """Response-cache scope for this turn: system prompt plus everything before the prompt."""
+        if not self.response_cache or not self.llm:
+            return None
+        return context_scope(self.system_prompt_hash, messages[:-1])
+
+    async def _cache_response(self, scope: Optional[str], query: str, response: str, tool_calls: int = 0):
+        if not scope:
+            return
+        if tool_calls or any(marker in response for marker in ACTION_MARKERS):
+            # tool results and delegations depend on the outside world: never replay them
+            self.response_cache.bypass()
+            return
+        await self.response_cache.put(scope, query, response)
+
+    async def _ask_stream(self, prompt: str, queue: asyncio.Queue) -> str:
+        """Stream the reply into `queue`, holding text back once an action block starts."""
+        query = prompt
+        prompt, messages = await self._prepare_ask(prompt)
+        scope = self._cache_scope(messages)
+        cached = await self.response_cache.get(scope, query) if scope else None
+        if not self.llm or cached is not None:
+            response = cached if cached is not None else "No LLM configured"
+            await queue.put(response)
+            return await self._finish_ask(prompt, response)
+
+        text, sent, action = "", 0, False
+
+        async def emit(chunk: str):
+            nonlocal text, sent, action
+            text += chunk
+            if action:
+                return
+            if any(marker in text for marker in ACTION_MARKERS):
+                action = True
+                safe = min(text.find(m) for m in ACTION_MARKERS if m in text)
+            else:
+                safe = len(text) - _partial_marker_len(text)
+            if safe > sent:
+                await queue.put(text[sent:safe])
+                sent = safe
+
+        if self._uses_native_tools():
+            # text of every step is streamed; tool calls themselves never reach the queue
+            reply, tool_calls = await self._tool_loop(messages, on_text=emit)
+        else:
+            async for chunk in self.llm.chat_stream(messages):
+                await emit(chunk)
+            reply, tool_calls = text, 0
+
+        response = await self._finish_ask(prompt, reply)
+        await self._cache_response(scope, query, reply, tool_calls)
+        # no action actually ran: the reply is the streamed text itself
+        rest = text[sent:] if response == reply else ("\n" if sent else "") + response
+        if rest:
+            await queue.put(rest)
+        return response
+
+    async def _prepare_ask(self, prompt: str) -> tuple[str, list[dict]]:
         logging.info(f"[{self.name}] Asking: {prompt}")
+        query = prompt
+        history = self.memory.tail(self.context.scan) if self.use_memory else []
         if self.use_memory:
             self.memory.add({"role": "user", "content": prompt})
             self._maybe_save_memory()
 
-        if self.rag_system:
-            prompt = f"{prompt}\n\n[Knowledge] {self.rag_system.retrieve_and_generate(prompt)}"
-        messages = (
-            self.memory.get_messages()[-8:]
-            if self.use_memory
-            else [{"role": "user", "content": prompt}]
-        ) 
-
-        if self.llm :
-            response = await self.llm.chat(messages)
-        else:
-            response = "No LLM configured"
-       
+        # retrieval embeds the query and searches on worker threads, so other asks and streams keep running
+        knowledge, retrieved = await asyncio.gather(self._retrieve_knowledge(query), self._search_memory(query))
+        if knowledge:
+            prompt = f"{prompt}\n\n[Knowledge]\n{knowledge}"
+        return prompt, self._context_messages(prompt, history=history, retrieved=retrieved)
+
+    async def _retrieve_knowledge(self, query: str) -> str:
+        if not self.rag_system:
+            return ""
+        return await asyncio.to_thread(self.rag_system.retrieve_knowledge, query)
+
+    async def _search_memory(self, query: str) -> Optional[list[str]]:
+        """Past messages similar to the query, from the agent's vector memory if it has one."""
+        vector_store = self._chroma_memory() if self.use_memory else None
+        if vector_store is None:
+            return None
+        try:
+            hits = await asyncio.to_thread(vector_store.search, query, 5)
+        except Exception as e:
+            logging.warning(f"[{self.name}] Memory search failed: {e}")
+            return None
+        return [text for text in hits if text != query]
+
+    async def _finish_ask(self, prompt: str, response: str) -> str:
         if self.use_memory:
             self.memory.add({"role": "assistant", "content": response})
             self._maybe_save_memory()
         
 
-        tool_calls = re.finditer(r"\[Tool Call\]\s*(\w+)\s*(\{.*?\})", response, re.DOTALL)
-        assignments = re.finditer(r"\[Assign To\]\s*(\w+)\s*(\{.*?\})", response, re.DOTALL)
+        tool_calls = [m.groups() for m in re.finditer(r"\[Tool Call\]\s*(\w+)\s*(\{.*?\})", response, re.DOTALL)]
+        assignments = [m.groups() for m in re.finditer(r"\[Assign To\]\s*(\w+)\s*(\{.*?\})", response, re.DOTALL)]
+
+        if self.parallel_actions and len(tool_calls) + len(assignments) > 1:
+            responses = await self._run_actions_parallel(prompt, tool_calls, assignments)
+        else:
+            responses = await self._run_actions(prompt, tool_calls, assignments)
+
+        # Combine final result
+        response = "\n".join(responses) if responses else response
+
+        return response
+
+    def _context_messages(
+        self,
+        prompt: str,
+        history: Optional[list] = None,
+        retrieved: Optional[list[str]] = None,
+        include_prompt: bool = True,
+    ) -> list[dict]:
+        """Token-budgeted messages for the LLM; see ContextBuilder."""
+        if not self.use_memory:
+            return [{"role": "user", "content": prompt}]
+        if history is None:
+            history = self.memory.tail(self.context.scan)
+        return self.context.build(prompt, history, retrieved, include_prompt=include_prompt)
+
+    async def _summarize_context(self, messages: list[dict]) -> str:
+        if not self.llm:
+            return ""
+        return await self.llm.chat(messages)
+
+    async def _tool_loop(self, messages: list[dict], on_text=None) -> tuple[str, int]:
+        """Native tool calling: the LLM calls tools and reads their results in the same
+        conversation until it answers, for at most max_tool_steps rounds of calls.
+
+        Returns the final reply and the number of tool calls made.
+        """
+        tools = await self._cached_tool_specs()
+        messages = list(messages)
+        tool_calls = 0
+        self.tool_stats["tool_turns"] += 1
+        for step in range(self.max_tool_steps + 1):
+            # the last step may not call tools, so the turn always ends with an answer
+            reply = await self.llm.chat_tools(messages, tools, final=step == self.max_tool_steps, on_text=on_text)
+            self.tool_stats["llm_steps"] += 1
+            if not reply["tool_calls"]:
+                break
+            tool_calls += len(reply["tool_calls"])
+            self.tool_stats["tool_calls"] += len(reply["tool_calls"])
+            results = await self._call_tools(reply["tool_calls"])
+            messages.append(reply["message"])
+            messages.extend(self.llm.tool_results(reply["tool_calls"], results))
+            if on_text and reply["content"]:
+                await on_text("\n")
+        return reply["content"], tool_calls
+
+    async def _call_tools(self, tool_calls: list[dict]) -> list[str]:
+        """Run one step's tool calls; results and errors become text for the LLM.
+
+        With parallel_actions the calls run concurrently, at most action_concurrency at
+        once. Each is bounded by action_timeout and its result by the context's
+        max_message_tokens.
+        """
+        async def call(tool_call: dict) -> str:
+            name = tool_call["name"]
+            try:
+                result = await asyncio.wait_for(self.run_tool(name, tool_call["arguments"]), self.action_timeout)
+            except asyncio.TimeoutError:
+                return f"[Tool {name} Error] timed out after {self.action_timeout}s"
+            except Exception as e:
+                return f"[Tool {name} Error] {e}"
+            text = result if isinstance(result, str) else json.dumps(result, default=str)
+            return truncate(text, self.context.max_message_tokens)
+
+        if not self.parallel_actions or len(tool_calls) < 2:
+            return [await call(tool_call) for tool_call in tool_calls]
 
+        limit = asyncio.Semaphore(self.action_concurrency)
+
+        async def bounded(tool_call: dict) -> str:
+            async with limit:
+                return await call(tool_call)
+
+        return list(await asyncio.gather(*[bounded(tool_call) for tool_call in tool_calls]))
+
+    async def _format_tool_results(self, prompt: str, results: str) -> str:
+        """Follow-up LLM call that turns raw tool output into the answer for prompt."""
+        messages = self._context_messages(prompt, include_prompt=False)
+        messages.append({"role": "user", "content": f"{results} \n--- format the tool result according to the {prompt}"})
+        if not self.llm:
+            return "No LLM configured"
+        response = await self.llm.chat(messages)
+        if self.use_memory:
+            self.memory.add({"role": "assistant", "content": response})
+            self._maybe_save_memory()
+        return response
+
+    async def _delegate(self, to_agent: str, raw_args: str) -> Any:
+        args = json.loads(raw_args)
+        return await self.send_to(self.team[to_agent], args["method"], args["payload"], await_reply=True, role="assistant")
+
+    async def _run_actions(self, prompt: str, tool_calls: list, assignments: list) -> list[str]:
         responses = []
 
         # Process all tool calls
-        for match in tool_calls:
-            tool_name, raw_args = match.groups()
+        for tool_name, raw_args in tool_calls:
             try:
                 args = json.loads(raw_args)
                 result = await self.run_tool(tool_name, args)
                 # resend to llm
-                messages = (
-                    self.memory.get_messages()[-8:]
-                    if self.use_memory
-                    else [{"role": "user", "content": prompt}]
-                ) 
-                messages.append({"role": "user", "content": f"[Tool {tool_name} Result] {result} \n--- format the tool result according to the {prompt}"})
-                if self.llm :
-                    response = await self.llm.chat(messages)
-                    if self.use_memory:
-                        self.memory.add({"role": "assistant", "content": response})
-                        self._maybe_save_memory()
-                else:
-                    response = "No LLM configured"
+                response = await self._format_tool_results(prompt, f"[Tool {tool_name} Result] {result}")
                 responses.append(f"[Tool {tool_name} Result] {response}")
             except Exception as e:
                 responses.append(f"[Tool {tool_name} Error] {e}")
 
         # Process all agent assignments
-        for match in assignments:
-            to_agent, raw_args = match.groups()
+        for to_agent, raw_args in assignments:
             try:
-                args = json.loads(raw_args)
-                result = await self.send_to(self.team[to_agent], args["method"], args["payload"], await_reply=True, role="assistant")
+                result = await self._delegate(to_agent, raw_args)
                 responses.append(f"[Assign {to_agent} To Result] {result}")
             except Exception as e:
                 responses.append(f"[Assign {to_agent} To Error] {e}")
 
-        # Combine final result
-        response = "\n".join(responses) if responses else response
+        return responses
 
-        return response
+    async def _run_actions_parallel(self, prompt: str, tool_calls: list, assignments: list) -> list[str]:
+        """Run all tool calls and delegations of a turn concurrently.
+
+        At most action_concurrency run at once, each bounded by action_timeout. Successful
+        tool results are formatted by a single follow-up LLM call instead of one per tool.
+        """
+        limit = asyncio.Semaphore(self.action_concurrency)
+
+        async def bounded(coro):
+            async with limit:
+                return await asyncio.wait_for(coro, self.action_timeout)
+
+        async def tool(tool_name, raw_args):
+            return await self.run_tool(tool_name, json.loads(raw_args))
+
+        results = await asyncio.gather(
+            *[bounded(tool(*call)) for call in tool_calls],
+            *[bounded(self._delegate(*assignment)) for assignment in assignments],
+            return_exceptions=True,
+        )
+        tool_results, assignment_results = results[:len(tool_calls)], results[len(tool_calls):]
+
+        def error(e: BaseException) -> str:
+            return f"timed out after {self.action_timeout}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+
+        responses, succeeded = [], []
+        for (tool_name, _), result in zip(tool_calls, tool_results):
+            if isinstance(result, BaseException):
+                responses.append(f"[Tool {tool_name} Error] {error(result)}")
+            else:
+                succeeded.append(f"[Tool {tool_name} Result] {result}")
+        if succeeded:
+            try:
+                response = await self._format_tool_results(prompt, "\n".join(succeeded))
+                responses.insert(0, f"[Tool Results] {response}")
+            except Exception as e:
+                responses.insert(0, f"[Tool Results Error] {e}")
+
+        for (to_agent, _), result in zip(assignments, assignment_results):
+            if isinstance(result, BaseException):
+                responses.append(f"[Assign {to_agent} To Error] {error(result)}")
+            else:
+                responses.append(f"[Assign {to_agent} To Result] {result}")
+
+        return responses
 
     async def run_tool(self, name: str, args: dict) -> Any:
         # print("run_tool", name, args)
@@ -414,6 +813,9 @@ You may also delegate tasks to the following team members or worker agents:
         if method == "ask":
             return await self._ask(payload)
 
+        elif method == "ask_stream":
+            return await self._ask_stream(payload["prompt"], payload["queue"])
+
         elif method == "remember":
             if self.use_memory:
                 self.memory.add({"role": "user", "content": payload})
@@ -445,8 +847,8 @@ You may also delegate tasks to the following team members or worker agents:
             self.memory.load()
 
     async def serve(self, port: int = 8000, routes: Optional[list[str]] = None, auth_secret: str = "supersecret"):
-        from fastapi import FastAPI, Request, HTTPException
-        from fastapi.responses import JSONResponse
+        from fastapi import FastAPI, Request, HTTPException, WebSocket, WebSocketDisconnect
+        from fastapi.responses import JSONResponse, StreamingResponse
         import uvicorn
         # jwt
         import jwt
@@ -454,12 +856,12 @@ You may also delegate tasks to the following team members or worker agents:
         await self.start()
 
         app = FastAPI()
-        routes = set(routes or ["ask", "remember", "tool", "status", "mcp", "tools"])
+        routes = set(routes or ["ask", "remember", "tool", "status", "mcp", "tools", "ws"])
 
         def create_jwt(payload: dict):
             return jwt.encode(payload, auth_secret, algorithm="HS256")
 
-        def check_auth(request: Request):
+        def check_auth(request: Request | WebSocket):
             if auth_secret:
                 auth_header = request.headers.get("Authorization")
                 
@@ -484,6 +886,24 @@ You may also delegate tasks to the following team members or worker agents:
                 result = await self.ask(prompt)
                 return JSONResponse(content={"response": result})
 
+            @app.post("/ask/stream")
+            async def ask_stream_endpoint(request: Request):
+                check_auth(request)
+                data = await request.json()
+                prompt = data.get("prompt")
+                if not prompt:
+                    raise HTTPException(status_code=400, detail="Missing prompt")
+
+                async def events():
+                    try:
+                        async for chunk in self.ask_stream(prompt):
+                            yield f"data: {json.dumps({'token': chunk})}\n\n"
+                        yield "event: done\ndata: {}\n\n"
+                    except Exception as e:
+                        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+
+                return StreamingResponse(events(), media_type="text/event-stream")
+
         if "remember" in routes:
             @app.post("/remember")
             async def remember_endpoint(request: Request):
@@ -506,7 +926,7 @@ You may also delegate tasks to the following team members or worker agents:
             @app.get("/status")
             async def status_endpoint(request: Request):
                 check_auth(request)
-                return {"name": self.name, "role": self.role, "goal": self.goal}
+                return {"name": self.name, "role": self.role, "goal": self.goal, "mailbox": self.metrics()}
 
         if "mcp" in routes:
             @app.post("/mcp")
@@ -518,12 +938,11 @@ You may also delegate tasks to the following team members or worker agents:
                 if not key or not config:
                     raise HTTPException(status_code=400, detail="Missing key or config")
 
-                self.mcps[key] = MCP.create(config)
+                self.mcps[key] = MCP_POOL.get(config)
                 mcp_tools = await self.mcps[key].get_tools()
                 for tool in mcp_tools:
                     self.allowed_tools[tool["name"]] = key
-                self.system_prompt = await self.build_system_prompt()
-                self.llm.system = self.system_prompt
+                await self.refresh_system_prompt()
                 return {"status": "MCP added", "tools": [t["name"] for t in mcp_tools]}
 
             @app.get("/mcp")
@@ -541,11 +960,9 @@ You may also delegate tasks to the following team members or worker agents:
                 check_auth(request)
                 if key in self.mcps:
                     del self.mcps[key]
-                    for tool in self.allowed_tools:
-                        if self.allowed_tools[tool] == key:
-                            del self.allowed_tools[tool]
-                self.system_prompt = await self.build_system_prompt()
-                self.llm.system = self.system_prompt
+                    for tool in [t for t, route in self.allowed_tools.items() if route == key]:
+                        del self.allowed_tools[tool]
+                await self.refresh_system_prompt()
                 return {"status": "MCP deleted"}
 
         if "tools" in routes:
@@ -567,8 +984,7 @@ You may also delegate tasks to the following team members or worker agents:
 
                 if local:
                     self.mcps["local"] = MCP.create({"local": local})
-                self.system_prompt = await self.build_system_prompt()
-                self.llm.system = self.system_prompt
+                await self.refresh_system_prompt()
                 return {"status": "Tools added", "tools": list(tools.keys())}
 
             @app.delete("/tools")
@@ -582,8 +998,7 @@ You may also delegate tasks to the following team members or worker agents:
                 for tool_name in tools:
                     if tool_name in self.allowed_tools:
                         del self.allowed_tools[tool_name]
-                self.system_prompt = await self.build_system_prompt()
-                self.llm.system = self.system_prompt
+                await self.refresh_system_prompt()
                 return {"status": "Tools deleted", "tools": tools}
 
             @app.get("/tools")
@@ -599,10 +1014,30 @@ You may also delegate tasks to the following team members or worker agents:
         if "ws" in routes:
             @app.websocket("/ws")
             async def ws_endpoint(websocket: WebSocket):
+                try:
+                    check_auth(websocket)
+                except HTTPException as e:
+                    await websocket.close(code=1008, reason=e.detail)
+                    return
                 await websocket.accept()
-                while True:
-                    data = await websocket.receive_text()
-                    await websocket.send_text(f"Future release feature")
+                try:
+                    while True:
+                        data = await websocket.receive_text()
+                        try:
+                            prompt = json.loads(data).get("prompt")
+                        except (json.JSONDecodeError, AttributeError):
+                            prompt = data
+                        if not prompt:
+                            await websocket.send_json({"error": "Missing prompt"})
+                            continue
+                        try:
+                            async for chunk in self.ask_stream(prompt):
+                                await websocket.send_json({"token": chunk})
+                            await websocket.send_json({"done": True})
+                        except Exception as e:
+                            await websocket.send_json({"error": str(e)})
+                except WebSocketDisconnect:
+                    logging.info(f"[{self.name}] websocket disconnected")
 
         config = uvicorn.Config(app, host="0.0.0.0", port=port, log_level="info")
         server = uvicorn.Server(config)
@@ -1,7 +1,7 @@
-from .actor import Actor
+from .actor import Actor, MailboxFull, OverflowPolicy
 from .supervisor import Supervisor
 from .supervisor import RestartStrategy
 from .gen_server import GenServer
 from .system import ActorSystem
 
-__all__ = ["Actor", "GenServer", "Supervisor", "RestartStrategy", "ActorSystem"]
+__all__ = ["Actor", "GenServer", "Supervisor", "RestartStrategy", "ActorSystem", "OverflowPolicy", "MailboxFull"]
@@ -1,21 +1,61 @@
 from __future__ import annotations
 import asyncio
-from typing import Any, Awaitable, Callable, Optional
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
 
 import logging
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+class OverflowPolicy(Enum):
+    """What a bounded mailbox does with a message that arrives while it is full."""
+    BLOCK = "block"              # sender waits for space
+    DROP_OLDEST = "drop_oldest"  # evict the oldest queued message
+    DROP_NEWEST = "drop_newest"  # discard the incoming message
+    REJECT = "reject"            # raise MailboxFull in the sender
+
+class MailboxFull(Exception):
+    """Raised when a message cannot be delivered to a full mailbox."""
+    pass
+
 class Actor:
     """Lightweight co‑operative process with a private mailbox."""
 
-    def __init__(self, name: str, handler: Callable[["Actor", Any], Awaitable[None]], *, supervisor: Optional["Supervisor"] = None):
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[["Actor", Any], Awaitable[None]],
+        *,
+        supervisor: Optional["Supervisor"] = None,
+        capacity: int = 0,
+        overflow: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+        on_drop: Optional[Callable[[Any], None]] = None,
+    ):
+        """
+        Args:
+            capacity: Maximum number of queued messages; 0 means unbounded.
+            overflow: Policy applied when a bounded mailbox is full.
+            on_drop: Called with every message discarded by a drop policy.
+        """
         self.name = name
-        self._mailbox: asyncio.Queue[Any] = asyncio.Queue()
+        self.capacity = capacity
+        self.overflow = OverflowPolicy(overflow)
+        self._mailbox: asyncio.Queue[Tuple[float, Any]] = asyncio.Queue(maxsize=capacity)
         self._handler = handler
         self._task: Optional[asyncio.Task[None]] = None
         self._supervisor = supervisor
+        self._on_drop = on_drop
+        self._stats: Dict[str, float] = {
+            "received": 0,
+            "processed": 0,
+            "dropped": 0,
+            "rejected": 0,
+            "max_depth": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+        }
 
     async def start(self) -> None:
         logger.info(f"[{self.name}] Actor.start() called")
@@ -33,7 +73,37 @@ class Actor:
 
     async def send(self, msg: Any) -> None:
         logger.info(f"[{self.name}] Sending message: {msg}")
-        await self._mailbox.put(msg)
+        if self._mailbox.full():
+            if self.overflow is OverflowPolicy.REJECT:
+                self._stats["rejected"] += 1
+                raise MailboxFull(f"Mailbox of {self.name} is full ({self.capacity} messages)")
+            if self.overflow is OverflowPolicy.DROP_NEWEST:
+                logger.warning(f"[{self.name}] Mailbox full, dropping newest message")
+                self._drop(msg)
+                return
+            if self.overflow is OverflowPolicy.DROP_OLDEST:
+                logger.warning(f"[{self.name}] Mailbox full, dropping oldest message")
+                _, oldest = self._mailbox.get_nowait()
+                self._drop(oldest)
+        await self._mailbox.put((time.monotonic(), msg))
+        self._stats["received"] += 1
+        self._stats["max_depth"] = max(self._stats["max_depth"], self._mailbox.qsize())
+
+    def _drop(self, msg: Any) -> None:
+        self._stats["dropped"] += 1
+        if self._on_drop:
+            self._on_drop(msg)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, drop counts and mailbox wait times (seconds)."""
+        processed = self._stats["processed"]
+        return {
+            **self._stats,
+            "depth": self._mailbox.qsize(),
+            "capacity": self.capacity,
+            "overflow": self.overflow.value,
+            "avg_wait": self._stats["total_wait"] / processed if processed else 0.0,
+        }
 
     async def stop(self) -> None:
         logger.info(f"[{self.name}] Stopping...")
@@ -51,7 +121,11 @@ class Actor:
     async def _run(self) -> None:
         logger.info(f"[{self.name}] 🔁 Actor loop started")
         while True:
-            msg = await self._mailbox.get()
+            enqueued_at, msg = await self._mailbox.get()
+            wait = time.monotonic() - enqueued_at
+            self._stats["processed"] += 1
+            self._stats["total_wait"] += wait
+            self._stats["max_wait"] = max(self._stats["max_wait"], wait)
             logger.info(f"[{self.name}] ↪️ Dispatching message: {msg}")
             await self._handler(self, msg)
 
@@ -1,6 +1,6 @@
 import asyncio
-from typing import Any, Callable, Awaitable, Dict, Optional
-from .actor import Actor
+from typing import Any, Callable, Awaitable, Dict, Iterable, Optional, Set, Union
+from .actor import Actor, MailboxFull, OverflowPolicy
 from .supervisor import Supervisor
 import logging
 
@@ -20,7 +20,28 @@ class GenServer:
         on_terminate: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
         on_info: Optional[Callable[[Any, Dict[str, Any]], Awaitable[None]]] = None,
         on_restart: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        max_concurrency: int = 1,
+        concurrent_methods: Optional[Iterable[str]] = None,
+        mailbox_size: int = 0,
+        overflow: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+        shutdown_timeout: Optional[float] = 30.0,
     ):
+        """
+        Args:
+            max_concurrency: Maximum number of calls handled at the same time.
+                The default of 1 keeps the classic one-message-at-a-time behaviour.
+            concurrent_methods: Call methods allowed to run alongside each other when
+                max_concurrency > 1. None means every call method. Casts, info messages
+                and calls to any other method are treated as state-mutating: they wait
+                for in-flight calls to finish and run alone, in mailbox order.
+            mailbox_size: Capacity of the actor mailbox; 0 means unbounded.
+            overflow: OverflowPolicy (or its value) applied when the mailbox is full.
+                Calls dropped by a drop policy fail with MailboxFull.
+            shutdown_timeout: Seconds stop() (and so a supervisor restart) waits for
+                in-flight calls to finish before cancelling them; None waits for good.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
         self.name = name
         self._handler = handler
         self._state: Dict[str, Any] = initial_state or {}
@@ -28,8 +49,14 @@ class GenServer:
         self._on_terminate = on_terminate
         self._on_info = on_info
         self._on_restart = on_restart
+        self.max_concurrency = max_concurrency
+        self._concurrent_methods = set(concurrent_methods) if concurrent_methods is not None else None
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._inflight: Set[asyncio.Task] = set()
+        self._busy = False  # the actor loop holds a dequeued message (running it, or waiting to start it)
+        self.shutdown_timeout = shutdown_timeout
         self._supervisor = supervisor or Supervisor("supervisor")
-        self._actor = Actor(name, self._dispatch)
+        self._actor = Actor(name, self._dispatch, capacity=mailbox_size, overflow=overflow, on_drop=self._dropped)
         if supervisor is not None:
             supervisor._register_child(self)
 
@@ -42,9 +69,15 @@ class GenServer:
 
     async def stop(self) -> None:
         logging.info(f"[{self.name}] GenServer.stop() called")
+        # stop taking messages, let calls already running finish, then terminate
+        await self._actor.stop()
+        try:
+            await asyncio.wait_for(self._drain(), self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"[{self.name}] In-flight calls still running after {self.shutdown_timeout}s, cancelling")
+        await self._cancel_inflight()
         if self._on_terminate:
             await self._on_terminate(self._state)
-        await self._actor.stop()
 
     async def call(self, method: str, payload: Any) -> Any:
         logging.info(f"[{self.name}] Calling {method}")
@@ -64,19 +97,80 @@ class GenServer:
         logging.info(f"[{self.name}] Failing: {reason}")
         await self._supervisor._child_failed(self, RuntimeError(reason))
 
+    def metrics(self) -> Dict[str, Any]:
+        """Mailbox metrics, calls in flight, and whether a dequeued message is being handled."""
+        return {**self._actor.metrics(), "inflight": len(self._inflight), "busy": int(self._busy)}
+
+    def _dropped(self, msg: Any) -> None:
+        kind, method, _, fut = msg
+        logging.warning(f"[{self.name}] Dropped {kind} for {method}: mailbox full")
+        if fut and not fut.done():
+            fut.set_exception(MailboxFull(f"{self.name} dropped {kind} '{method}': mailbox full"))
+
+    def _runs_concurrently(self, kind: str, method: str) -> bool:
+        if self.max_concurrency == 1 or kind != "call":
+            return False
+        return self._concurrent_methods is None or method in self._concurrent_methods
+
+    async def _drain(self) -> None:
+        """Wait until every in-flight call (other than the current task) has finished."""
+        while pending := self._inflight - {asyncio.current_task()}:
+            await asyncio.wait(pending)
+
+    async def _cancel_inflight(self) -> None:
+        tasks = list(self._inflight)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _release_slot(self, task: asyncio.Task) -> None:
+        self._inflight.discard(task)
+        self._slots.release()
 
-# in pinet/behaviours/gen_server.py
     async def _dispatch(self, _: Actor, msg: Any) -> None:
         kind, method, payload, fut = msg
         logging.info(f"[{self.name}] Dispatching {kind} for {method}")
+        self._busy = True
+        try:
+            if self._runs_concurrently(kind, method):
+                # Blocks the mailbox once max_concurrency calls are in flight.
+                await self._wait_or_fail(self._slots.acquire(), fut)
+                task = asyncio.create_task(self._invoke(kind, method, payload, fut), name=f"{self.name}:{method}")
+                self._inflight.add(task)
+                task.add_done_callback(self._release_slot)
+                return
+            await self._wait_or_fail(self._drain(), fut)
+            await self._invoke(kind, method, payload, fut)
+        finally:
+            self._busy = False
+
+    async def _wait_or_fail(self, waiting: Awaitable[Any], fut: Optional[asyncio.Future]) -> None:
+        """Await a dispatch precondition; the message is already dequeued, so fail its caller if stopped meanwhile."""
+        try:
+            await waiting
+        except asyncio.CancelledError:
+            self._fail_stopped(fut)
+            raise
+
+    def _fail_stopped(self, fut: Optional[asyncio.Future]) -> None:
+        if fut and not fut.done():
+            fut.set_exception(RuntimeError(f"{self.name} stopped"))
+
+    async def _invoke(self, kind: str, method: str, payload: Any, fut: Optional[asyncio.Future]) -> None:
         try:
             if kind in ("call", "cast"):
                 result = await self._handler(method, payload, self._state)
-                if fut:
+                if fut and not fut.done():
                     fut.set_result(result)
             elif kind == "info" and self._on_info:
                 await self._on_info(payload, self._state)
 
+        except asyncio.CancelledError:
+            # stopped while in flight: release the caller instead of leaving it hanging
+            self._fail_stopped(fut)
+            raise
+
         except Exception as e:
             # 1) if it was a call, immediately return an error instead of hanging
             if fut and not fut.done():
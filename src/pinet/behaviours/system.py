@@ -1,5 +1,7 @@
 # pinet/system.py
 
+from .actor import MailboxFull
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -33,7 +35,14 @@ class ActorSystem:
 
     async def broadcast(self, method, payload):
         for agent in self.agents.values():
-            await agent.cast(method, payload)
+            try:
+                await agent.cast(method, payload)
+            except MailboxFull as e:
+                # one overloaded agent must not stop the broadcast
+                logger.warning(f"[ActorSystem] Broadcast to {agent.name} rejected: {e}")
+
+    def metrics(self):
+        return {name: agent.metrics() for name, agent in self.agents.items() if hasattr(agent, "metrics")}
 
     async def shutdown(self):
         for agent in self.agents.values():
@@ -0,0 +1,197 @@
+# pinet/context.py
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pinet.utils.tokens import estimate_tokens
+
+TRUNCATED = " …[truncated]"
+
+
+def _content(message: Any) -> str:
+    if isinstance(message, dict):
+        content = message.get("content", "")
+        return content if isinstance(content, str) else json.dumps(content, default=str)
+    return str(message)
+
+
+def _as_message(message: Any) -> Dict[str, str]:
+    if isinstance(message, dict) and message.get("role") in ("user", "assistant"):
+        return {"role": message["role"], "content": _content(message)}
+    if isinstance(message, dict) and message.get("role") == "system":
+        # providers such as Anthropic only accept system text outside `messages`
+        return {"role": "user", "content": f"[System note] {_content(message)}"}
+    return {"role": "user", "content": _content(message)}
+
+
+def _fingerprint(message: Any) -> str:
+    return hashlib.sha1(json.dumps(message, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def truncate(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, keeping the start."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # estimate_tokens is ~4 chars per token on prose; shrink until it fits
+    end = max_tokens * 4
+    while end > 0 and estimate_tokens(text[:end]) > max_tokens:
+        end = int(end * 0.8)
+    return text[:end] + TRUNCATED
+
+
+class ContextBuilder:
+    """Packs the messages sent to the LLM for one turn into a token budget.
+
+    The current prompt always goes in. Vector-memory hits (when the agent has a
+    vector store) get up to `retrieval_share` of what is left, then recent turns
+    fill the rest, newest first. No single message may take more than
+    `max_message_tokens`, so one large tool result cannot evict the whole
+    conversation.
+
+    Turns that no longer fit are folded into a rolling summary by the agent's
+    LLM, in the background and `summarize_batch` messages at a time; the summary
+    is sent ahead of the recent turns.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 3000,
+        max_message_tokens: Optional[int] = None,
+        retrieval_share: float = 0.25,
+        summary_tokens: int = 300,
+        summarize_batch: int = 8,
+        scan: int = 200,
+        summarizer: Optional[Callable[[List[dict]], Awaitable[str]]] = None,
+    ):
+        self.token_budget = token_budget
+        self.max_message_tokens = max_message_tokens or max(64, token_budget // 4)
+        self.retrieval_share = retrieval_share
+        self.summary_tokens = summary_tokens
+        self.summarize_batch = summarize_batch
+        self.scan = scan
+        self.summarizer = summarizer
+
+        self.summary = ""
+        self._summary_boundary: Optional[str] = None  # fingerprint of the newest summarized messages
+        self._summary_task: Optional[asyncio.Task] = None
+        self.stats = {"turns": 0, "tokens": 0, "max_tokens": 0, "summaries": 0}
+
+    def build(
+        self,
+        prompt: str,
+        history: List[Any],
+        retrieved: Optional[List[str]] = None,
+        include_prompt: bool = True,
+    ) -> List[Dict[str, str]]:
+        """Messages for one LLM call, oldest first, within token_budget.
+
+        history is the tail of memory, oldest first, without the current prompt;
+        `prompt` (which may carry RAG snippets) is appended as the last message.
+        """
+        history = list(history)
+        budget = self.token_budget
+        tail: List[Dict[str, str]] = []
+        if include_prompt:
+            current = {"role": "user", "content": truncate(prompt, max(budget - self.summary_tokens, 64))}
+            tail.append(current)
+            budget -= estimate_tokens(current["content"])
+
+        summary_cost = estimate_tokens(self.summary) if self.summary else 0
+        budget -= summary_cost
+
+        head: List[Dict[str, str]] = []
+        if retrieved:
+            seen = {_content(m) for m in history}
+            share = int(max(budget, 0) * self.retrieval_share)
+            notes, used = [], 0
+            for text in retrieved:
+                if not isinstance(text, str) or text in seen:
+                    continue
+                text = truncate(text, self.max_message_tokens)
+                cost = estimate_tokens(text)
+                if used + cost > share:
+                    break
+                notes.append(text)
+                used += cost
+            if notes:
+                head.append({"role": "user", "content": "[Relevant memories]\n" + "\n".join(notes)})
+                budget -= used
+
+        recent: List[Dict[str, str]] = []
+        cut = len(history)
+        for i in range(len(history) - 1, -1, -1):
+            message = _as_message(history[i])
+            message["content"] = truncate(message["content"], self.max_message_tokens)
+            cost = estimate_tokens(message["content"])
+            if cost > budget:
+                break
+            recent.append(message)
+            budget -= cost
+            cut = i
+        recent.reverse()
+
+        self._maybe_summarize(history, cut)
+
+        messages = []
+        if self.summary:
+            messages.append({"role": "user", "content": f"[Conversation summary] {self.summary}"})
+        messages += head + recent + tail
+
+        used = self.token_budget - budget
+        self.stats["turns"] += 1
+        self.stats["tokens"] += used
+        self.stats["max_tokens"] = max(self.stats["max_tokens"], used)
+        return messages
+
+    def _maybe_summarize(self, history: List[Any], cut: int):
+        """Fold evicted messages (history[:cut]) newer than the summary into it, in the background."""
+        if cut == 0 or self.summarizer is None:
+            return
+        if self._summary_task and not self._summary_task.done():
+            return
+        start = 0
+        if self._summary_boundary is not None:
+            for i in range(len(history), 0, -1):
+                if _fingerprint(history[max(0, i - 3):i]) == self._summary_boundary:
+                    start = i
+                    break
+        pending = history[start:cut]
+        if len(pending) < self.summarize_batch:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # the boundary is the last few summarized messages, so repeated replies don't confuse it
+        boundary = _fingerprint(history[max(0, cut - 3):cut])
+        self._summary_task = loop.create_task(self._summarize(pending, boundary))
+
+    async def _summarize(self, messages: List[Any], boundary: str):
+        transcript = "\n".join(
+            f"{_as_message(m)['role']}: {truncate(_content(m), self.max_message_tokens)}" for m in messages
+        )
+        request = [{
+            "role": "user",
+            "content": (
+                f"Update the running summary of this conversation in at most {self.summary_tokens * 3 // 4} words. "
+                "Keep facts, decisions, names and open tasks; drop pleasantries.\n\n"
+                f"Current summary:\n{self.summary or '(none)'}\n\nNew messages:\n{transcript}"
+            ),
+        }]
+        try:
+            summary = await self.summarizer(request)
+        except Exception as e:
+            logging.warning(f"[ContextBuilder] Summarization failed: {e}")
+            return
+        if isinstance(summary, str) and summary.strip():
+            self.summary = truncate(summary.strip(), self.summary_tokens)
+            self._summary_boundary = boundary
+            self.stats["summaries"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["avg_tokens"] = stats["tokens"] / stats["turns"] if stats["turns"] else 0.0
+        stats["summary_tokens"] = estimate_tokens(self.summary)
+        return stats
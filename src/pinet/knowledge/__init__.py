@@ -1,6 +1,9 @@
 from .knowledge import load_knowledge
+from .loader import KnowledgeCache, KNOWLEDGE_CACHE, load_knowledge_sources
 
 __all__ = [
     "load_knowledge",
+    "load_knowledge_sources",
+    "KnowledgeCache",
+    "KNOWLEDGE_CACHE",
 ]
-    
\ No newline at end of file
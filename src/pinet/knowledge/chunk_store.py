@@ -0,0 +1,116 @@
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+from pinet.memory.vector_chroma import ChromaMemory
+
+_TOKEN = re.compile(r"\w+")
+
+# ChromaMemory's document ids, so vector hits map straight back to stored chunks
+chunk_id = ChromaMemory._doc_id
+
+
+class ChunkStore:
+    """Knowledge chunks of one source in SQLite, with an FTS5 index for BM25 search.
+
+    Chunks are appended a batch at a time and read back on demand, so neither
+    ingest nor retrieval holds the corpus in memory. rewrite() replaces the whole
+    set in one transaction on its own connection: searches keep seeing the old
+    chunks until it commits, and nothing changes if loading the source fails.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS chunks (rowid INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, text TEXT NOT NULL);
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(text, content='chunks', content_rowid='rowid');
+        """)
+        return conn
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    @contextmanager
+    def rewrite(self) -> Iterator[Callable[[Iterable[str]], List[str]]]:
+        """Yield add(chunks), which stores chunks not seen yet and returns them."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM chunks")
+                conn.execute("INSERT INTO chunks_fts (chunks_fts) VALUES ('delete-all')")
+
+                def add(chunks: Iterable[str]) -> List[str]:
+                    added = []
+                    for text in chunks:
+                        cursor = conn.execute("INSERT OR IGNORE INTO chunks (id, text) VALUES (?, ?)", (chunk_id(text), text))
+                        if cursor.rowcount:
+                            conn.execute("INSERT INTO chunks_fts (rowid, text) VALUES (?, ?)", (cursor.lastrowid, text))
+                            added.append(text)
+                    return added
+
+                yield add
+        finally:
+            conn.close()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def batches(self, size: int) -> Iterator[List[str]]:
+        """Every chunk, in insertion order, `size` at a time."""
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._db().execute(
+                    "SELECT rowid, text FROM chunks WHERE rowid > ? ORDER BY rowid LIMIT ?", (last, size)
+                ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield [text for _, text in rows]
+
+    def existing(self, ids: List[str]) -> Set[str]:
+        if not ids:
+            return set()
+        with self._lock:
+            rows = self._db().execute(f"SELECT id FROM chunks WHERE id IN ({','.join('?' * len(ids))})", ids)
+            return {row[0] for row in rows}
+
+    def texts(self, ids: List[str]) -> Dict[str, str]:
+        if not ids:
+            return {}
+        with self._lock:
+            rows = self._db().execute(f"SELECT id, text FROM chunks WHERE id IN ({','.join('?' * len(ids))})", ids)
+            return dict(rows.fetchall())
+
+    def search(self, query: str, top_k: int = 10) -> List[str]:
+        """Ids of the chunks best matching any query term, by BM25."""
+        terms = _TOKEN.findall(query.lower())
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT chunks.id FROM chunks_fts JOIN chunks ON chunks.rowid = chunks_fts.rowid "
+                "WHERE chunks_fts MATCH ? ORDER BY bm25(chunks_fts) LIMIT ?",
+                (match, top_k),
+            )
+            return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,8 +1,12 @@
 import os
+import csv
 import json
-import requests
+import re
 import pandas as pd
 from pathlib import Path
+from typing import Iterable, Iterator, List
+from pinet.utils.http_cache import HTTP_CACHE
+from pinet.utils.tokens import estimate_tokens
 
 try:
     import fitz  # PyMuPDF
@@ -14,97 +18,194 @@ try:
 except ImportError:
     docx = None
 
-def load_knowledge(path_or_url: str, chunk_size: int = 500) -> str:
-    """Load knowledge from various formats with chunking."""
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_HEADING = re.compile(r"^(#{1,6}\s|(?=.*[A-Z])[A-Z0-9][A-Z0-9 \-:]{2,80}$)")
+
+def load_knowledge(path_or_url: str, chunk_size: int = 500, overlap: int = 50) -> Iterator[str]:
+    """Stream chunks of knowledge from various formats.
+
+    Returns a generator: sources are read page by page / row batch by row batch,
+    so memory stays bounded by the chunk size. `chunk_size` and `overlap` are in
+    (estimated) tokens; text is split at heading, paragraph and sentence
+    boundaries, tables at row boundaries with the header repeated per chunk.
+    """
     if path_or_url.startswith("http://") or path_or_url.startswith("https://"):
-        return _load_url(path_or_url, chunk_size)
+        return _load_url(path_or_url, chunk_size, overlap)
 
     ext = Path(path_or_url).suffix.lower()
 
     if ext == ".pdf" and fitz:
-        return _load_pdf(path_or_url, chunk_size)
+        return _load_pdf(path_or_url, chunk_size, overlap)
     elif ext == ".docx" and docx:
-        return _load_docx(path_or_url, chunk_size)
+        return _load_docx(path_or_url, chunk_size, overlap)
     elif ext == ".csv":
         return _load_csv(path_or_url, chunk_size)
     elif ext in [".json"]:
-        return _load_json(path_or_url, chunk_size)
+        return _load_json(path_or_url, chunk_size, overlap)
     elif ext in [".xlsx", ".xls"]:
         return _load_excel(path_or_url, chunk_size)
     elif ext in [".txt", ".md"]:
-        return _load_text(path_or_url, chunk_size)
+        return _load_text(path_or_url, chunk_size, overlap)
     else:
         raise ValueError(f"Unsupported knowledge format: {path_or_url}")
 
+def _paragraphs(lines: Iterable[str]) -> Iterator[str]:
+    """Group lines into paragraphs; headings are always paragraphs of their own."""
+    buffer: List[str] = []
+    for line in lines:
+        line = line.rstrip("\n").strip()
+        if not line or _HEADING.match(line):
+            if buffer:
+                yield " ".join(buffer)
+                buffer = []
+            if line:
+                yield line
+        else:
+            buffer.append(line)
+    if buffer:
+        yield " ".join(buffer)
+
+def _split_long(sentence: str, chunk_size: int) -> Iterator[str]:
+    # a single "sentence" over the budget (tables, code, run-on text): split on words
+    words, piece, size = sentence.split(), [], 0
+    for word in words:
+        cost = estimate_tokens(word)
+        if piece and size + cost > chunk_size:
+            yield " ".join(piece)
+            piece, size = [], 0
+        piece.append(word)
+        size += cost
+    if piece:
+        yield " ".join(piece)
+
+def chunk_text(paragraphs: Iterable[str], chunk_size: int = 500, overlap: int = 50) -> Iterator[str]:
+    """Pack paragraphs into chunks of about chunk_size tokens.
+
+    Chunks end on sentence boundaries and a heading always starts a new chunk.
+    Each chunk repeats up to `overlap` tokens of trailing sentences from the
+    previous one, so facts spanning a boundary are retrievable from either side.
+    """
+    current: List[tuple[str, int]] = []  # (sentence, tokens)
+    size = 0
+    fresh = False  # whether current holds anything beyond the carried-over overlap
+
+    def emit():
+        nonlocal current, size, fresh
+        chunk = " ".join(s for s, _ in current)
+        tail, tail_size = [], 0
+        for sentence, cost in reversed(current):
+            if tail_size + cost > overlap:
+                break
+            tail.insert(0, (sentence, cost))
+            tail_size += cost
+        current, size, fresh = tail, tail_size, False
+        return chunk
+
+    for paragraph in paragraphs:
+        if _HEADING.match(paragraph):
+            if fresh:
+                yield emit()
+            # no overlap across sections
+            current, size = [], 0
+        for sentence in _SENTENCE_END.split(paragraph):
+            cost = estimate_tokens(sentence)
+            pieces = [(sentence, cost)] if cost <= chunk_size else [
+                (p, estimate_tokens(p)) for p in _split_long(sentence, chunk_size)
+            ]
+            for piece, piece_cost in pieces:
+                if fresh and size + piece_cost > chunk_size:
+                    yield emit()
+                current.append((piece, piece_cost))
+                size += piece_cost
+                fresh = True
+    if fresh:
+        yield " ".join(s for s, _ in current)
+
+def _table_chunks(header: List[str], rows: Iterable[List[str]], chunk_size: int) -> Iterator[str]:
+    """Markdown tables of consecutive rows, each within chunk_size tokens."""
+    head = "| " + " | ".join(map(str, header)) + " |\n|" + "---|" * len(header)
+    head_size = estimate_tokens(head)
+    lines, size = [], head_size
+    for row in rows:
+        line = "| " + " | ".join("" if v is None else str(v).replace("\n", " ") for v in row) + " |"
+        cost = estimate_tokens(line)
+        if lines and size + cost > chunk_size:
+            yield head + "\n" + "\n".join(lines)
+            lines, size = [], head_size
+        lines.append(line)
+        size += cost
+    if lines:
+        yield head + "\n" + "\n".join(lines)
+
 # Function to process PDF in chunks
-def _load_pdf(path, chunk_size: int):
-    doc = fitz.open(path)
-    full_text = "\n".join([page.get_text() for page in doc])
-    
-    # Split the full text into chunks of the specified size
-    return [full_text[i:i+chunk_size] for i in range(0, len(full_text), chunk_size)]
+def _load_pdf(path, chunk_size: int, overlap: int):
+    def pages():
+        with fitz.open(path) as doc:
+            for page in doc:
+                yield from page.get_text().splitlines()
+                yield ""
+    return chunk_text(_paragraphs(pages()), chunk_size, overlap)
 
 # Function to process DOCX in chunks
-def _load_docx(path, chunk_size: int):
-    doc = docx.Document(path)
-    paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-    
-    # Split paragraphs into chunks of size chunk_size
-    chunks = []
-    current_chunk = ""
-    for paragraph in paragraphs:
-        if len(current_chunk + paragraph) > chunk_size:
-            chunks.append(current_chunk)
-            current_chunk = paragraph
-        else:
-            current_chunk += paragraph
-    if current_chunk:
-        chunks.append(current_chunk)
-    
-    return chunks
+def _load_docx(path, chunk_size: int, overlap: int):
+    def paragraphs():
+        doc = docx.Document(path)
+        for p in doc.paragraphs:
+            if not p.text.strip():
+                continue
+            # keep section structure: Word headings become markdown headings
+            heading = p.style is not None and p.style.name.startswith("Heading")
+            yield f"# {p.text.strip()}" if heading else p.text.strip()
+    return chunk_text(paragraphs(), chunk_size, overlap)
 
 # Function to process CSV in chunks
 def _load_csv(path, chunk_size: int):
-    df = pd.read_csv(path)
-    chunks = []
-    for start in range(0, len(df), chunk_size):
-        chunk = df.iloc[start:start+chunk_size]
-        chunks.append(chunk.to_markdown(index=False))
-    return chunks
+    def rows():
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is not None:
+                yield from _table_chunks(header, reader, chunk_size)
+    return rows()
 
 # Function to process Excel in chunks
 def _load_excel(path, chunk_size: int):
-    df = pd.read_excel(path)
-    chunks = []
-    for start in range(0, len(df), chunk_size):
-        chunk = df.iloc[start:start+chunk_size]
-        chunks.append(chunk.to_markdown(index=False))
-    return chunks
+    def rows():
+        # pandas has no chunked Excel reader; the sheet is read once, then batched
+        df = pd.read_excel(path)
+        yield from _table_chunks(list(df.columns), df.itertuples(index=False, name=None), chunk_size)
+    return rows()
 
 # Function to process JSON in chunks
-def _load_json(path, chunk_size: int):
-    with open(path) as f:
-        data = json.load(f)
-    
-    # Convert the entire JSON to a string and split into chunks
-    json_str = json.dumps(data, indent=2)
-    return [json_str[i:i+chunk_size] for i in range(0, len(json_str), chunk_size)]
+def _load_json(path, chunk_size: int, overlap: int):
+    def items():
+        with open(path) as f:
+            data = json.load(f)
+        # one record per top-level item, so chunks never cut an object in half
+        if isinstance(data, list):
+            for item in data:
+                yield json.dumps(item, ensure_ascii=False)
+        elif isinstance(data, dict):
+            for key, value in data.items():
+                yield f"{key}: {json.dumps(value, ensure_ascii=False)}"
+        else:
+            yield json.dumps(data, ensure_ascii=False)
+    return chunk_text(items(), chunk_size, overlap)
 
 # Function to process text files in chunks
-def _load_text(path, chunk_size: int):
-    with open(path, encoding="utf-8") as f:
-        text = f.read()
-    
-    # Split text into chunks of chunk_size
-    return [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
+def _load_text(path, chunk_size: int, overlap: int):
+    def lines():
+        with open(path, encoding="utf-8") as f:
+            yield from f
+    return chunk_text(_paragraphs(lines()), chunk_size, overlap)
 
 # Function to load URL content and chunk it
-def _load_url(url, chunk_size: int):
-    try:
-        resp = requests.get(url)
+def _load_url(url, chunk_size: int, overlap: int):
+    def lines():
+        # the body is cached whole, so unchanged pages are only revalidated; fetch errors
+        # propagate so loaders report them rather than ingesting them as text
+        resp = HTTP_CACHE.get(url, timeout=30)
         resp.raise_for_status()
-        full_text = resp.text
-        # Split the content into chunks of chunk_size
-        return [full_text[i:i+chunk_size] for i in range(0, len(full_text), chunk_size)]
-    except Exception as e:
-        return [f"[Failed to load {url}: {e}]"]
+        resp.encoding = resp.encoding or "utf-8"
+        yield from resp.iter_lines(decode_unicode=True)
+    return chunk_text(_paragraphs(lines()), chunk_size, overlap)
@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+from .knowledge import load_knowledge
+
+
+def _is_url(source: str) -> bool:
+    return source.startswith("http://") or source.startswith("https://")
+
+def source_fingerprint(source: str) -> Optional[List[Any]]:
+    """Cheap change marker: path + size + mtime, or a URL's ETag / Last-Modified.
+
+    None means the source cannot be validated without reading it.
+    """
+    if _is_url(source):
+        try:
+            resp = requests.head(source, allow_redirects=True, timeout=10)
+            validator = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+            return [source, validator] if resp.ok and validator else None
+        except Exception:
+            return None
+    try:
+        st = os.stat(source)
+        return [os.path.abspath(source), st.st_size, st.st_mtime_ns]
+    except OSError:
+        return None
+
+def _parse(cache: "KnowledgeCache", source: str, fingerprint: Optional[List[Any]], settings: List[int]) -> str:
+    # module-level so it can run in a process pool; chunks go straight to disk
+    chunk_size, overlap = settings
+    return cache.put(source, fingerprint, settings, load_knowledge(source, chunk_size=chunk_size, overlap=overlap))
+
+
+class KnowledgeCache:
+    """Parsed chunks on disk, one directory per source under agent_data/knowledge_cache.
+
+    An entry is reused while the source fingerprint and chunking settings match.
+    Entries also record which agents already ingested which version (a digest of
+    the chunks), so an unchanged source is not pushed into their memory again.
+    """
+
+    def __init__(self, path: Path = Path("./agent_data") / "knowledge_cache"):
+        self.path = Path(path)
+
+    def _dir(self, source: str) -> Path:
+        return self.path / hashlib.sha256(source.encode()).hexdigest()[:32]
+
+    def _meta(self, source: str) -> dict:
+        try:
+            with open(self._dir(source) / "meta.json", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, source: str, meta: dict):
+        directory = self._dir(source)
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / "meta.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, directory / "meta.json")
+
+    def fresh(self, source: str, fingerprint: Optional[List[Any]], settings: List[int]) -> bool:
+        """Whether the stored chunks still match the source and chunking settings."""
+        meta = self._meta(source)
+        return (
+            fingerprint is not None
+            and meta.get("fingerprint") == fingerprint
+            and meta.get("settings") == settings
+            and (self._dir(source) / "chunks.jsonl").exists()
+        )
+
+    def put(self, source: str, fingerprint: Optional[List[Any]], settings: List[int], chunks: Iterable[str]) -> str:
+        """Stream chunks to disk and return their digest."""
+        digest = hashlib.sha256()
+        directory = self._dir(source)
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / "chunks.jsonl.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for i, chunk in enumerate(chunks):
+                digest.update((("\0" if i else "") + chunk).encode())
+                f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+        os.replace(tmp, directory / "chunks.jsonl")
+        meta = self._meta(source)
+        # a new version keeps the ingestion records; digests tell whether they still apply
+        self._write_meta(source, {
+            "source": source,
+            "fingerprint": fingerprint,
+            "settings": settings,
+            "digest": digest.hexdigest(),
+            "ingested": meta.get("ingested", {}),
+        })
+        return digest.hexdigest()
+
+    def batches(self, source: str, size: int = 256) -> Iterator[List[str]]:
+        """The stored chunks of a source, `size` at a time."""
+        batch: List[str] = []
+        with open(self._dir(source) / "chunks.jsonl", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    batch.append(json.loads(line))
+                if len(batch) >= size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def digest(self, source: str) -> Optional[str]:
+        return self._meta(source).get("digest")
+
+    def is_ingested(self, agent_name: str, source: str, digest: str) -> bool:
+        return self._meta(source).get("ingested", {}).get(agent_name) == digest
+
+    def mark_ingested(self, agent_name: str, source: str, digest: str):
+        meta = self._meta(source)
+        if meta:
+            meta.setdefault("ingested", {})[agent_name] = digest
+            self._write_meta(source, meta)
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+KNOWLEDGE_CACHE = KnowledgeCache()
+
+
+async def load_knowledge_sources(
+    sources: Iterable[str],
+    chunk_size: int = 500,
+    overlap: int = 50,
+    workers: int = 4,
+    processes: bool = False,
+    cache: KnowledgeCache = KNOWLEDGE_CACHE,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch and parse many knowledge sources concurrently into the disk cache.
+
+    Parsing runs in a thread pool (or a process pool with processes=True, for
+    CPU-bound PDF/spreadsheet parsing) and streams chunks to disk as they are
+    produced. Sources whose fingerprint matches the cache are not read again.
+    Returns {source: {"digest", "cached"}} or {source: {"error"}} for sources
+    that failed; read the chunks back with cache.batches(source).
+    """
+    sources = list(dict.fromkeys(sources))
+    settings = [chunk_size, overlap]
+    loop = asyncio.get_running_loop()
+    pool: Executor = ProcessPoolExecutor(workers) if processes else ThreadPoolExecutor(workers)
+
+    async def load(source: str) -> Dict[str, Any]:
+        try:
+            fingerprint = await asyncio.to_thread(source_fingerprint, source)
+            if await asyncio.to_thread(cache.fresh, source, fingerprint, settings):
+                return {"digest": cache.digest(source), "cached": True}
+            digest = await loop.run_in_executor(pool, _parse, cache, source, fingerprint, settings)
+            return {"digest": digest, "cached": False}
+        except Exception as e:
+            return {"error": e}
+
+    try:
+        results = await asyncio.gather(*[load(source) for source in sources])
+    finally:
+        pool.shutdown(wait=False)
+    loaded = dict(zip(sources, results))
+    cached = sum(1 for r in results if r.get("cached"))
+    logging.info(f"[Knowledge] Loaded {len(sources)} sources ({cached} from cache)")
+    return loaded
@@ -1,19 +1,215 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
 from pinet.memory.knowledge_graph import KnowledgeGraphMemory
 from pinet.memory.json_memory import JSONMemory
 from pinet.memory.vector_chroma import ChromaMemory
+from pinet.utils.tokens import estimate_tokens
+from .chunk_store import ChunkStore, chunk_id
 from .knowledge import load_knowledge
-from typing import Any, Optional
+from typing import Any, Dict, Iterator, List, Optional
+
+# reciprocal rank fusion constant; 60 is the usual choice and rarely needs tuning
+RRF_K = 60
 
 class RAGSystem:
-    def __init__(self, agent_name: str, knowledge_source: Optional[str] = None):
+    """Retrieval over an agent's knowledge source.
+
+    The source is chunked and indexed once by ingest(), streaming `batch_size`
+    chunks at a time into the vector store and an on-disk ChunkStore
+    (agent_data/<agent>/rag_chunks.sqlite) that also serves BM25 keyword search.
+    agent_data/<agent>/rag_index.json keeps the source's fingerprint, digest and
+    chunk ids, so a restart skips re-reading an unchanged file (chunks missing
+    from the vector store, e.g. a non-persistent one, are still re-added).
+    Queries are answered by fusing vector similarity and BM25 ranks, then packing
+    the best chunks into `token_budget` tokens. Results are cached per query
+    until the next ingest.
+    """
+
+    def __init__(
+        self,
+        agent_name: str,
+        knowledge_source: Optional[str] = None,
+        vector_store: Optional[ChromaMemory] = None,
+        top_k: int = 4,
+        token_budget: int = 1000,
+        vector_weight: float = 0.5,
+        cache_size: int = 256,
+        batch_size: int = 256,
+    ):
         self.knowledge_source = knowledge_source
-        self.vector_chroma = ChromaMemory(agent_name)
+        # reuse the agent's own chroma memory when it has one instead of opening a second store
+        self.vector_chroma = vector_store or ChromaMemory(agent_name)
         self.graph_memory = KnowledgeGraphMemory(agent_name)
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self.vector_weight = vector_weight
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.index_path = Path("./agent_data") / agent_name / "rag_index.json"
+        self.store = ChunkStore(Path("./agent_data") / agent_name / "rag_chunks.sqlite")
+
+        self._cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ingested = False
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def load_knowledge(self):
         # Loading the knowledge from the provided source
         return load_knowledge(self.knowledge_source)
 
+    def _source_stat(self) -> Optional[List[int]]:
+        try:
+            st = os.stat(self.knowledge_source)
+            return [st.st_size, st.st_mtime_ns]
+        except (OSError, TypeError):
+            return None  # URLs and missing files are always re-read
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: dict):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self.index_path)
+
+    def _batches(self) -> Iterator[List[str]]:
+        loaded = self.load_knowledge()
+        chunks = (c for c in ([loaded] if isinstance(loaded, str) else loaded) if isinstance(c, str) and c.strip())
+        while batch := list(islice(chunks, self.batch_size)):
+            yield batch
+
+    def ingest(self, force: bool = False) -> int:
+        """Chunk and index the knowledge source if it changed since the last run.
+
+        Returns the number of chunks available for retrieval.
+        """
+        if not self.knowledge_source:
+            self._ingested = True
+            return 0
+        manifest = self._read_manifest()
+        stat = self._source_stat()
+        unchanged = (
+            manifest.get("source") == self.knowledge_source
+            and stat is not None and manifest.get("stat") == stat
+            and self.store.count() == len(manifest.get("ids", []))
+        )
+
+        if not force and unchanged:
+            # the chunk store outlives a non-persistent (or wiped) vector store; flush looks
+            # the ids up and only embeds the chunks the store no longer holds
+            for batch in self.store.batches(self.batch_size):
+                self.vector_chroma.add_many(batch)
+            self.vector_chroma.flush()
+        else:
+            digest, ids = hashlib.sha256(), []
+            try:
+                # chunks are streamed, so read errors only surface while iterating; the
+                # rewrite rolls back, keeping whatever was indexed before and the old manifest
+                with self.store.rewrite() as add:
+                    for batch in self._batches():
+                        added = add(batch)
+                        for chunk in added:
+                            digest.update(chunk.encode() + b"\0")
+                            ids.append(chunk_id(chunk))
+                        # ids are content hashes, so unchanged chunks are not re-embedded
+                        self.vector_chroma.add_many(added)
+            except Exception as e:
+                logging.warning(f"[RAGSystem] Failed to load knowledge from {self.knowledge_source}: {e}")
+                self._ingested = True
+                return self.store.count()
+            self.vector_chroma.flush()
+            logging.info(f"[RAGSystem] Indexed {len(ids)} chunks from {self.knowledge_source}")
+            self._write_manifest({
+                "source": self.knowledge_source,
+                "stat": stat,
+                "digest": digest.hexdigest(),
+                "ids": ids,
+            })
+
+        with self._lock:
+            self._cache.clear()
+            self._ingested = True
+        return self.store.count()
+
+    def _rank(self, query: str, top_k: int) -> List[str]:
+        candidates = max(top_k * 4, 10)
+        scores: Dict[str, float] = {}
+        try:
+            vector_hits = [chunk_id(d) for d in self.vector_chroma.search(query, top_k=candidates)]
+        except Exception as e:
+            logging.warning(f"[RAGSystem] Vector search failed: {e}")
+            vector_hits = []
+        # the store may be shared with conversation memory: keep only knowledge chunks
+        known = self.store.existing(vector_hits)
+        vector_ranked = [i for i in vector_hits if i in known]
+        for rank, i in enumerate(vector_ranked):
+            scores[i] = scores.get(i, 0.0) + self.vector_weight / (RRF_K + rank + 1)
+        for rank, i in enumerate(self.store.search(query, candidates)):
+            scores[i] = scores.get(i, 0.0) + (1 - self.vector_weight) / (RRF_K + rank + 1)
+        return sorted(scores, key=scores.get, reverse=True)[:top_k]
+
+    def _graph_facts(self, query: str) -> List[str]:
+        facts = []
+        # the graph is queried by entity, so look up the entities the query mentions
+        for entity in self.graph_memory.find_entities(query):
+            facts.extend(self.graph_memory.query(subject=entity, limit=self.top_k))
+            facts.extend(self.graph_memory.query(obj=entity, limit=self.top_k))
+        return list(dict.fromkeys(facts))
+
+    def retrieve_knowledge(self, query: str, top_k: Optional[int] = None, token_budget: Optional[int] = None) -> str:
+        """
+        Retrieves relevant chunks from knowledge base using vector search and/or graph search.
+        """
+        if not self._ingested:
+            self.ingest()
+        top_k = top_k or self.top_k
+        token_budget = token_budget or self.token_budget
+        key = (" ".join(query.lower().split()), top_k, token_budget)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return self._cache[key]
+        self.cache_misses += 1
+
+        ranked = self._rank(query, top_k)
+        texts = self.store.texts(ranked)
+        selected, used = [], 0
+        for text in [texts[i] for i in ranked if i in texts] + self._graph_facts(query):
+            cost = estimate_tokens(text)
+            if used + cost > token_budget:
+                continue
+            selected.append(text)
+            used += cost
+        result = "\n\n".join(selected)
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "chunks": self.store.count(),
+            "cache_size": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
     def retrieve_and_generate(self, query: str) -> Any:
         """
         Retrieve relevant chunks of knowledge using vector search and memory-based graph.
@@ -21,20 +217,11 @@ class RAGSystem:
         """
         # Retrieve knowledge from chunked source (assuming file or database)
         relevant_knowledge = self.retrieve_knowledge(query)
-        
+
         # Use this knowledge to generate a response (you can integrate with an LLM here)
         answer = self.generate_response(query, relevant_knowledge)
         return answer
 
-    def retrieve_knowledge(self, query: str) -> str:
-        """
-        Retrieves relevant chunks from knowledge base using vector search and/or graph search.
-        """
-        vector_results = self.vector_chroma.search(query)  # Modify as per your vector search method
-        graph_results = self.graph_memory.query(query)
-        
-        return vector_results + "\n" + "\n".join(graph_results)
-
     def generate_response(self, query: str, knowledge: str) -> str:
         """
         Generate the response using the combined knowledge (this is where the LLM or other models come into play).
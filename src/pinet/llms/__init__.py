@@ -1,5 +1,8 @@
 from .llm import LLM
+from .registry import ClientRegistry, LLM_REGISTRY
 
 __all__ = [
     "LLM",
+    "ClientRegistry",
+    "LLM_REGISTRY",
 ]
@@ -1,27 +1,118 @@
 # pinet/llms/anthropic_llm.py
 
+import httpx
 from anthropic import AsyncAnthropic
 from pinet.llms.base import BaseLLM
-from typing import List, Dict, Optional
+from pinet.llms.registry import LLM_REGISTRY
+from pinet.llms.tool_calling import tool_reply
+from typing import Any, AsyncIterator, List, Dict, Optional
 import logging
 
 class AnthropicLLM(BaseLLM):
-    def __init__(self, api_key: str, model: str = "claude-3-opus-20240229", system: Optional[str] = None):
-        self.client = AsyncAnthropic(api_key=api_key)
+    native_tools = True
+
+    def __init__(self, api_key: str, model: str = "claude-3-opus-20240229", system: Optional[str] = None, cache_prompt: bool = True, max_tokens: int = 1024, limits: Optional[Dict[str, Any]] = None):
+        # one pooled client per API key, shared with every other agent using it
+        self.key = LLM_REGISTRY.key("anthropic", api_key)
+        LLM_REGISTRY.configure(self.key, **(limits or {}))
+        self.client = LLM_REGISTRY.client(
+            self.key,
+            # retries are done by the registry, which also knows the rate limits
+            lambda limits, timeout: AsyncAnthropic(api_key=api_key, max_retries=0, http_client=httpx.AsyncClient(limits=limits, timeout=timeout)),
+        )
         self.model = model
         self.system = system
+        self.cache_prompt = cache_prompt
+        self.max_tokens = max_tokens
+
+    def _system_blocks(self):
+        """System prompt, marked as a cacheable prefix so it is not re-billed every turn."""
+        if not self.system or not self.cache_prompt:
+            return self.system
+        return [{"type": "text", "text": self.system, "cache_control": {"type": "ephemeral"}}]
+
+    def _request(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        request = dict(model=self.model, messages=messages, max_tokens=self.max_tokens)
+        if self.system:
+            request["system"] = self._system_blocks()
+        return request
 
     async def chat(self, messages: List[Dict[str, str]]) -> str:
         logging.info(f"Anthropic sending messages")
-        response = await self.client.messages.create(
-            model=self.model,
-            messages=messages,  
-            max_tokens=1024,
-            system=self.system
+        request = self._request(messages)
+        response = await LLM_REGISTRY.call(
+            self.key,
+            lambda: self.client.messages.create(**request),
+            tokens=self._request_tokens(messages, self.system),
+            coalesce=request,
         )
 
         logging.info(f"Anthropic response")
         return response.content[0].text if response.content else "[no content]"
 
+    async def chat_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        logging.info(f"Anthropic streaming messages")
+        request = self._request(messages)
+
+        async def open_stream():
+            async with self.client.messages.stream(**request) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
+        async for text in LLM_REGISTRY.stream(self.key, open_stream, tokens=self._request_tokens(messages, self.system)):
+            yield text
+
+    async def chat_tools(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]], final: bool = False, on_text=None) -> Dict[str, Any]:
+        logging.info(f"Anthropic sending messages with {len(tools or [])} tools")
+        request = self._request(messages)
+        if tools:
+            # tools stay declared on the final step: earlier tool_use blocks must match them
+            request["tools"] = [
+                {"name": t["name"], "description": t["description"], "input_schema": t["parameters"]} for t in tools
+            ]
+            if final:
+                request["tool_choice"] = {"type": "none"}
+        tokens = self._request_tokens(messages, self.system)
+
+        if on_text is None:
+            response = await LLM_REGISTRY.call(
+                self.key,
+                lambda: self.client.messages.create(**request),
+                tokens=tokens,
+                coalesce=request,
+            )
+        else:
+            final_message = {}
+
+            async def open_stream():
+                async with self.client.messages.stream(**request) as stream:
+                    async for text in stream.text_stream:
+                        yield text
+                    final_message["response"] = await stream.get_final_message()
+
+            async for text in LLM_REGISTRY.stream(self.key, open_stream, tokens=tokens):
+                await on_text(text)
+            response = final_message["response"]
+
+        blocks, calls, content = [], [], ""
+        for block in response.content or []:
+            if block.type == "text":
+                content += block.text
+                blocks.append({"type": "text", "text": block.text})
+            elif block.type == "tool_use":
+                calls.append({"id": block.id, "name": block.name, "arguments": block.input or {}})
+                blocks.append({"type": "tool_use", "id": block.id, "name": block.name, "input": block.input or {}})
+        return tool_reply(content, calls, {"role": "assistant", "content": blocks})
+
+    def tool_results(self, tool_calls: List[Dict[str, Any]], results: List[str]) -> List[Dict[str, Any]]:
+        # all results of one step go back together in a single user turn
+        return [{
+            "role": "user",
+            "content": [
+                {"type": "tool_result", "tool_use_id": call["id"], "content": result}
+                for call, result in zip(tool_calls, results)
+            ],
+        }]
+
     async def complete(self, prompt: str) -> str:
         raise NotImplementedError("AnthropicLLM does not support 'complete', use 'chat' instead.")
@@ -1,9 +1,14 @@
 # pinet/llms/base.py
 
 from abc import ABC, abstractmethod
-from typing import List, Dict
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional
+from pinet.utils.tokens import estimate_tokens
 
 class BaseLLM(ABC):
+    # True when chat_tools() uses the provider's structured tool calling
+    native_tools = False
+
     @abstractmethod
     async def complete(self, prompt: str) -> str:
         """Simple prompt completion"""
@@ -13,3 +18,41 @@ class BaseLLM(ABC):
     async def chat(self, messages: List[Dict[str, str]]) -> str:
         """Chat-style interaction using message history"""
         pass
+
+    async def chat_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """Chat-style interaction yielding text as it is generated.
+
+        Providers without native streaming yield the full reply as a single chunk.
+        """
+        yield await self.chat(messages)
+
+    def _request_tokens(self, messages: List[Dict[str, str]], system: Optional[str] = None) -> int:
+        """Tokens a request counts against a tokens-per-minute limit: prompt plus the reply budget."""
+        prompt = 0
+        for m in messages:
+            content = m.get("content", "")
+            # tool-calling turns carry lists of content blocks instead of plain text
+            prompt += estimate_tokens(content if isinstance(content, str) else json.dumps(content, default=str))
+        return prompt + estimate_tokens(system or "") + getattr(self, "max_tokens", 0)
+
+    async def chat_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        final: bool = False,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """One step of a tool-calling conversation; see pinet.llms.tool_calling.tool_reply.
+
+        tools are {"name", "description", "parameters"} specs. With final=True the
+        model must answer without calling tools. on_text, if given, receives the
+        reply text as it is generated.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support native tool calling")
+
+    def tool_results(self, tool_calls: List[Dict[str, Any]], results: List[str]) -> List[Dict[str, Any]]:
+        """Messages that hand tool results back to the model, in the provider's format."""
+        return [
+            {"role": "tool", "tool_call_id": call["id"], "content": result}
+            for call, result in zip(tool_calls, results)
+        ]
@@ -8,32 +8,42 @@ from pinet.llms.grok_llm import GrokLLM
 
 import os
 
+# Keys of an `llms:` entry that configure the shared client for its API key (see LLM_REGISTRY)
+LIMIT_KEYS = ("rpm", "tpm", "max_retries", "backoff", "max_backoff", "max_connections", "timeout")
+
+
+def _options(kwargs) -> dict:
+    return {
+        "max_tokens": kwargs.get("max_tokens", 1024),
+        "limits": {k: kwargs[k] for k in LIMIT_KEYS if kwargs.get(k) is not None},
+    }
+
 
 def create_llm(provider: str, vision: bool = False, **kwargs):
     provider = provider.lower()
     if vision:
         if provider == "openai":
-            return OpenAILLM(api_key=kwargs.get("api_key", os.getenv("OPENAI_API_KEY")), model=kwargs.get("model", "gpt-4o-vision-preview"), system=kwargs.get("system", "You are a helpful assistant."))
+            return OpenAILLM(api_key=kwargs.get("api_key", os.getenv("OPENAI_API_KEY")), model=kwargs.get("model", "gpt-4o-vision-preview"), system=kwargs.get("system", "You are a helpful assistant."), **_options(kwargs))
         elif provider == "anthropic":
-            return AnthropicLLM(api_key=kwargs.get("api_key", os.getenv("ANTHROPIC_API_KEY")), model=kwargs.get("model", "claude-3-opus-20240229"), system=kwargs.get("system", "You are a helpful assistant."))
+            return AnthropicLLM(api_key=kwargs.get("api_key", os.getenv("ANTHROPIC_API_KEY")), model=kwargs.get("model", "claude-3-opus-20240229"), system=kwargs.get("system", "You are a helpful assistant."), cache_prompt=kwargs.get("cache_prompt", True), **_options(kwargs))
         elif provider == "grok":
-            return GrokLLM(token=kwargs.get("api_key", os.getenv("GROK_API_KEY")), model=kwargs.get("model", "grok-1"), system=kwargs.get("system", "You are a helpful assistant."))
+            return GrokLLM(token=kwargs.get("api_key", os.getenv("GROK_API_KEY")), model=kwargs.get("model", "grok-1"), system=kwargs.get("system", "You are a helpful assistant."), **_options(kwargs))
         elif provider == "ollama":
-            return OllamaLLM(model=kwargs.get("model", "mistral"), host=kwargs.get("host", "http://localhost:11434"), system=kwargs.get("system", "You are a helpful assistant."))
+            return OllamaLLM(model=kwargs.get("model", "mistral"), host=kwargs.get("host", "http://localhost:11434"), system=kwargs.get("system", "You are a helpful assistant."), **_options(kwargs))
         else:
             raise ValueError(f"Unsupported LLM provider: {provider}")
     else:
         if provider == "anthropic":
-            return AnthropicLLM(api_key=kwargs.get("api_key", os.getenv("ANTHROPIC_API_KEY")), model=kwargs.get("model", "claude-3-opus-20240229"), system=kwargs.get("system", "You are a helpful assistant."))
+            return AnthropicLLM(api_key=kwargs.get("api_key", os.getenv("ANTHROPIC_API_KEY")), model=kwargs.get("model", "claude-3-opus-20240229"), system=kwargs.get("system", "You are a helpful assistant."), cache_prompt=kwargs.get("cache_prompt", True), **_options(kwargs))
 
         elif provider == "openai":
-            return OpenAILLM(api_key=kwargs.get("api_key", os.getenv("OPENAI_API_KEY")), model=kwargs.get("model", "gpt-4o"), system=kwargs.get("system", "You are a helpful assistant."))
+            return OpenAILLM(api_key=kwargs.get("api_key", os.getenv("OPENAI_API_KEY")), model=kwargs.get("model", "gpt-4o"), system=kwargs.get("system", "You are a helpful assistant."), **_options(kwargs))
 
         elif provider == "ollama":
-            return OllamaLLM(model=kwargs.get("model", "mistral"), host=kwargs.get("host", "http://localhost:11434"), system=kwargs.get("system", "You are a helpful assistant."))
+            return OllamaLLM(model=kwargs.get("model", "mistral"), host=kwargs.get("host", "http://localhost:11434"), system=kwargs.get("system", "You are a helpful assistant."), **_options(kwargs))
 
         elif provider == "grok":
-            return GrokLLM(token=kwargs.get("api_key", os.getenv("GROK_API_KEY")), model=kwargs.get("model", "grok-1"), system=kwargs.get("system", "You are a helpful assistant."))
+            return GrokLLM(token=kwargs.get("api_key", os.getenv("GROK_API_KEY")), model=kwargs.get("model", "grok-1"), system=kwargs.get("system", "You are a helpful assistant."), **_options(kwargs))
 
         else:
             raise ValueError(f"Unsupported LLM provider: {provider}")
@@ -1,33 +1,67 @@
 # pinet/llms/grok_llm.py
 
+import json
 import httpx
-from typing import List, Dict, Optional
+from typing import Any, AsyncIterator, List, Dict, Optional
 from .base import BaseLLM
+from .registry import LLM_REGISTRY
 
 class GrokLLM(BaseLLM):
-    def __init__(self, token: str, model: str = "grok-1", system: Optional[str] = None):
+    def __init__(self, token: str, model: str = "grok-1", system: Optional[str] = None, max_tokens: int = 1024, limits: Optional[Dict[str, Any]] = None):
         self.token = token
         self.model = model
         self.base_url = "https://grok.openapi.musk/api/chat"
         self.system = system
+        self.max_tokens = max_tokens
+        # one pooled HTTP client per token instead of a new connection per request
+        self.key = LLM_REGISTRY.key("grok", token)
+        LLM_REGISTRY.configure(self.key, **(limits or {}))
+        self.client = LLM_REGISTRY.client(self.key, lambda limits, timeout: httpx.AsyncClient(limits=limits, timeout=timeout))
 
-    async def chat(self, messages: List[Dict[str, str]]) -> str:
-        headers = {
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
         }
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.base_url,
-                headers=headers,
-                json={
-                    "model": self.model,
-                    "messages": messages,
-                    "system_prompt": self.system
-                }
-            )
+
+    def _body(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": messages,
+            "system_prompt": self.system,
+            "max_tokens": self.max_tokens,
+        }
+
+    async def chat(self, messages: List[Dict[str, str]]) -> str:
+        body = self._body(messages)
+
+        async def post():
+            response = await self.client.post(self.base_url, headers=self._headers(), json=body)
             response.raise_for_status()
-            return response.json().get("choices", [{}])[0].get("message", {}).get("content", "")
+            return response.json()
+
+        data = await LLM_REGISTRY.call(self.key, post, tokens=self._request_tokens(messages, self.system), coalesce=body)
+        return data.get("choices", [{}])[0].get("message", {}).get("content", "")
+
+    async def chat_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        body = {**self._body(messages), "stream": True}
+
+        async def open_stream():
+            async with self.client.stream("POST", self.base_url, headers=self._headers(), json=body) as response:
+                response.raise_for_status()
+                # server-sent events: "data: {json}" lines, terminated by "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    delta = json.loads(data).get("choices", [{}])[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+
+        async for text in LLM_REGISTRY.stream(self.key, open_stream, tokens=self._request_tokens(messages, self.system)):
+            yield text
 
     async def complete(self, prompt: str) -> str:
         return await self.chat([{"role": "user", "content": prompt}])
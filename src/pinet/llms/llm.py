@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional, Any
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Optional, Any
 from pinet.llms.factory import create_llm
 from pinet.llms.base import BaseLLM
 
@@ -9,8 +9,28 @@ class LLM(BaseLLM):
         self.llm = create_llm(**llm_config)
         self.system = system
 
+    @property
+    def native_tools(self) -> bool:
+        return getattr(self.llm, "native_tools", False)
+
     async def chat(self, messages: List[Dict[str, str]]) -> str:
         return await self.llm.chat(messages)
 
+    async def chat_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        async for chunk in self.llm.chat_stream(messages):
+            yield chunk
+
     async def complete(self, prompt: str) -> str:
-        return await self.llm.complete(prompt)
\ No newline at end of file
+        return await self.llm.complete(prompt)
+
+    async def chat_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        final: bool = False,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        return await self.llm.chat_tools(messages, tools, final=final, on_text=on_text)
+
+    def tool_results(self, tool_calls: List[Dict[str, Any]], results: List[str]) -> List[Dict[str, Any]]:
+        return self.llm.tool_results(tool_calls, results)
@@ -2,18 +2,90 @@
 
 from ollama import AsyncClient
 from pinet.llms.base import BaseLLM
-from typing import List, Dict, Optional
+from pinet.llms.registry import LLM_REGISTRY
+from pinet.llms.tool_calling import parse_arguments, tool_reply
+from typing import Any, AsyncIterator, List, Dict, Optional
 
 class OllamaLLM(BaseLLM):
-    def __init__(self, model: str = "mistral", host: str = "http://localhost:11434", system: Optional[str] = None):
+    native_tools = True
+
+    def __init__(self, model: str = "mistral", host: str = "http://localhost:11434", system: Optional[str] = None, max_tokens: int = 1024, limits: Optional[Dict[str, Any]] = None):
         self.model = model
-        self.client = AsyncClient(host=host)
+        # one pooled client per server, shared with every other agent using it
+        self.key = LLM_REGISTRY.key("ollama", host=host)
+        LLM_REGISTRY.configure(self.key, **(limits or {}))
+        self.client = LLM_REGISTRY.client(self.key, lambda limits, timeout: AsyncClient(host=host, limits=limits, timeout=timeout))
         self.system = system
+        self.max_tokens = max_tokens
+
+    def _prompt(self, messages: List[Dict[str, str]]) -> str:
+        return "\n".join([f"{m['role']}: {m['content']}" for m in messages])
 
     async def chat(self, messages: List[Dict[str, str]]) -> str:
-        prompt = "\n".join([f"{m['role']}: {m['content']}" for m in messages])
-        return await self.complete(prompt)
+        return await self.complete(self._prompt(messages))
+
+    async def chat_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        prompt = self._prompt(messages)
+
+        async def open_stream():
+            async for part in await self.client.generate(model=self.model, prompt=prompt, stream=True, options={"num_predict": self.max_tokens}):
+                if part.get('response'):
+                    yield part['response']
+
+        async for text in LLM_REGISTRY.stream(self.key, open_stream, tokens=self._request_tokens([{"content": prompt}])):
+            yield text
+
+    async def chat_tools(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]], final: bool = False, on_text=None) -> Dict[str, Any]:
+        # tool calling needs the chat endpoint; plain chat() keeps using generate
+        request = dict(
+            model=self.model,
+            messages=([{"role": "system", "content": self.system}] if self.system else []) + messages,
+            options={"num_predict": self.max_tokens},
+        )
+        if tools and not final:  # Ollama has no tool_choice: leaving the tools out forces an answer
+            request["tools"] = [{"type": "function", "function": spec} for spec in tools]
+        tokens = self._request_tokens(request["messages"])
+
+        if on_text is None:
+            response = await LLM_REGISTRY.call(self.key, lambda: self.client.chat(**request), tokens=tokens, coalesce=request)
+            content = response["message"].get("content") or ""
+            raw_calls = list(response["message"].get("tool_calls") or [])
+        else:
+            content, raw_calls = "", []
+
+            async def open_stream():
+                raw_calls.clear()  # a retried stream starts over
+                async for part in await self.client.chat(**request, stream=True):
+                    raw_calls.extend(part["message"].get("tool_calls") or [])
+                    if part["message"].get("content"):
+                        yield part["message"]["content"]
+
+            async for text in LLM_REGISTRY.stream(self.key, open_stream, tokens=tokens):
+                content += text
+                await on_text(text)
+
+        # Ollama does not id its tool calls; results are matched back by name and position
+        calls = [
+            {"id": f"{c['function']['name']}-{i}", "name": c["function"]["name"], "arguments": parse_arguments(c["function"]["arguments"])}
+            for i, c in enumerate(raw_calls)
+        ]
+        assistant = {"role": "assistant", "content": content}
+        if calls:
+            assistant["tool_calls"] = [{"function": {"name": c["name"], "arguments": c["arguments"]}} for c in calls]
+        return tool_reply(content.strip(), calls, assistant)
+
+    def tool_results(self, tool_calls: List[Dict[str, Any]], results: List[str]) -> List[Dict[str, Any]]:
+        return [
+            {"role": "tool", "tool_name": call["name"], "content": result}
+            for call, result in zip(tool_calls, results)
+        ]
 
     async def complete(self, prompt: str) -> str:
-        response = await self.client.generate(model=self.model, prompt=prompt)
+        request = dict(model=self.model, prompt=prompt, options={"num_predict": self.max_tokens})
+        response = await LLM_REGISTRY.call(
+            self.key,
+            lambda: self.client.generate(**request),
+            tokens=self._request_tokens([{"content": prompt}]),
+            coalesce=request,
+        )
         return response['response'].strip() if 'response' in response else "[no content]"
@@ -1,33 +1,131 @@
 # pinet/llms/openai_llm.py
 
+import json
+import httpx
 from openai import AsyncOpenAI
 from pinet.llms.base import BaseLLM
-from typing import List, Dict, Optional
+from pinet.llms.registry import LLM_REGISTRY
+from pinet.llms.tool_calling import parse_arguments, tool_reply
+from typing import Any, AsyncIterator, List, Dict, Optional
 import os
 import logging
 
 class OpenAILLM(BaseLLM):
-    def __init__(self, api_key: str, model: str = "gpt-4o", system: Optional[str] = None):
-        self.client = AsyncOpenAI(api_key=api_key)
+    native_tools = True
+
+    def __init__(self, api_key: str, model: str = "gpt-4o", system: Optional[str] = None, max_tokens: int = 1024, limits: Optional[Dict[str, Any]] = None):
+        # one pooled client per API key, shared with every other agent using it
+        self.key = LLM_REGISTRY.key("openai", api_key)
+        LLM_REGISTRY.configure(self.key, **(limits or {}))
+        self.client = LLM_REGISTRY.client(
+            self.key,
+            # retries are done by the registry, which also knows the rate limits
+            lambda limits, timeout: AsyncOpenAI(api_key=api_key, max_retries=0, http_client=httpx.AsyncClient(limits=limits, timeout=timeout)),
+        )
         self.model = model
         self.system = system
+        self.max_tokens = max_tokens
+
+    def _with_system(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        # Keeping the system prompt as the first message gives OpenAI's automatic
+        # prefix caching a stable prefix to match across turns.
+        if not self.system:
+            return messages
+        return [{"role": "system", "content": self.system}] + messages
 
     async def chat(self, messages: List[Dict[str, str]]) -> str:
         logging.info(f"OpenAI sending messages")
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            max_tokens=1024,
-            system_prompt=self.system
+        request = dict(model=self.model, messages=self._with_system(messages), max_tokens=self.max_tokens)
+        response = await LLM_REGISTRY.call(
+            self.key,
+            lambda: self.client.chat.completions.create(**request),
+            tokens=self._request_tokens(request["messages"]),
+            coalesce=request,
         )
         logging.info(f"OpenAI response")
         return response.choices[0].message.content.strip()
 
+    async def chat_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        logging.info(f"OpenAI streaming messages")
+        request = dict(model=self.model, messages=self._with_system(messages), max_tokens=self.max_tokens)
+
+        async def open_stream():
+            stream = await self.client.chat.completions.create(**request, stream=True)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        async for text in LLM_REGISTRY.stream(self.key, open_stream, tokens=self._request_tokens(request["messages"])):
+            yield text
+
+    def _tool_request(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]], final: bool) -> Dict[str, Any]:
+        request = dict(model=self.model, messages=self._with_system(messages), max_tokens=self.max_tokens)
+        if tools:
+            request["tools"] = [{"type": "function", "function": spec} for spec in tools]
+            request["tool_choice"] = "none" if final else "auto"
+        return request
+
+    async def chat_tools(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]], final: bool = False, on_text=None) -> Dict[str, Any]:
+        logging.info(f"OpenAI sending messages with {len(tools or [])} tools")
+        request = self._tool_request(messages, tools, final)
+        tokens = self._request_tokens(request["messages"])
+
+        if on_text is None:
+            response = await LLM_REGISTRY.call(
+                self.key,
+                lambda: self.client.chat.completions.create(**request),
+                tokens=tokens,
+                coalesce=request,
+            )
+            message = response.choices[0].message
+            content = message.content or ""
+            calls = [
+                {"id": c.id, "name": c.function.name, "arguments": parse_arguments(c.function.arguments)}
+                for c in message.tool_calls or []
+            ]
+        else:
+            content, pending = "", {}
+
+            async def open_stream():
+                pending.clear()  # a retried stream starts over
+                stream = await self.client.chat.completions.create(**request, stream=True)
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    # tool calls arrive as fragments keyed by index
+                    for part in delta.tool_calls or []:
+                        call = pending.setdefault(part.index, {"id": "", "name": "", "arguments": ""})
+                        call["id"] = part.id or call["id"]
+                        if part.function:
+                            call["name"] += part.function.name or ""
+                            call["arguments"] += part.function.arguments or ""
+                    if delta.content:
+                        yield delta.content
+
+            async for text in LLM_REGISTRY.stream(self.key, open_stream, tokens=tokens):
+                content += text
+                await on_text(text)
+            calls = [
+                {"id": c["id"], "name": c["name"], "arguments": parse_arguments(c["arguments"])}
+                for _, c in sorted(pending.items())
+            ]
+
+        assistant = {"role": "assistant", "content": content or None}
+        if calls:
+            assistant["tool_calls"] = [
+                {"id": c["id"], "type": "function", "function": {"name": c["name"], "arguments": json.dumps(c["arguments"])}}
+                for c in calls
+            ]
+        return tool_reply(content.strip(), calls, assistant)
+
     async def complete(self, prompt: str) -> str:
         logging.info(f"OpenAI sending: {prompt}")
-        response = await self.client.completions.create(
-            model=self.model,
-            prompt=prompt,
-            max_tokens=1024
+        request = dict(model=self.model, prompt=prompt, max_tokens=self.max_tokens)
+        response = await LLM_REGISTRY.call(
+            self.key,
+            lambda: self.client.completions.create(**request),
+            tokens=self._request_tokens([{"content": prompt}]),
+            coalesce=request,
         )
         return response.choices[0].text.strip()
@@ -0,0 +1,246 @@
+# pinet/llms/registry.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+# statuses worth retrying: rate limited, timed out / conflicting, or the provider is failing
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+RETRY_ERRORS = ("APIConnectionError", "APITimeoutError", "InternalServerError", "RateLimitError", "OverloadedError")
+
+
+def _status(e: Exception) -> Optional[int]:
+    status = getattr(e, "status_code", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(e: Exception) -> bool:
+    status = _status(e)
+    if status is not None:
+        return status in RETRY_STATUS
+    return isinstance(e, (httpx.TransportError, asyncio.TimeoutError, ConnectionError)) or type(e).__name__ in RETRY_ERRORS
+
+
+def retry_after(e: Exception) -> Optional[float]:
+    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Continuously refilling bucket of `per_minute` units, holding at most one minute's worth.
+
+    Callers reserve their units up front, letting the balance go negative, and
+    then sleep until the refill covers it, so waiters are served in order
+    without anyone holding a lock while they sleep.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _reserve(self, amount: float) -> float:
+        # no await in here, so the read-modify-write cannot interleave with other tasks
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= amount
+        return max(0.0, -self.tokens / self.rate)
+
+    async def acquire(self, amount: float = 1.0):
+        # a single request larger than the bucket waits for a full bucket instead of forever
+        amount = min(amount, self.capacity)
+        wait = self._reserve(amount)
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.tokens = min(self.capacity, self.tokens + amount)  # hand back the reservation
+                raise
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one API key."""
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+
+    async def acquire(self, tokens: int = 0):
+        if self.requests:
+            await self.requests.acquire(1)
+        if self.tokens and tokens:
+            await self.tokens.acquire(tokens)
+
+
+class ClientRegistry:
+    """Process-wide provider clients, rate limits and retries shared by every agent.
+
+    Agents that use the same provider, API key and host share one SDK client,
+    and so one HTTP connection pool of `max_connections`. Calls through the
+    registry are throttled by that key's token buckets, retried with jittered
+    exponential backoff on 429/5xx and connection errors (honouring
+    Retry-After), and identical concurrent requests are coalesced into one.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple, Any] = {}
+        self._limiters: Dict[Tuple, RateLimiter] = {}
+        self._settings: Dict[Tuple, Dict[str, Any]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {"calls": 0, "retries": 0, "coalesced": 0, "failures": 0}
+
+    @staticmethod
+    def key(provider: str, api_key: Optional[str] = None, host: Optional[str] = None) -> Tuple:
+        # never keep raw API keys around as dict keys
+        digest = hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else None
+        return (provider, digest, host)
+
+    def configure(
+        self,
+        key: Tuple,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+        max_backoff: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Set limits for a key; unspecified settings keep their current values.
+
+        max_connections and timeout shape the shared client, so they cannot be
+        changed once it exists: that raises ValueError.
+        """
+        if key in self._clients:
+            current = self._settings[key]
+            for name, value in (("max_connections", max_connections), ("timeout", timeout)):
+                if value is not None and value != current[name]:
+                    raise ValueError(
+                        f"{name} for {key[0]} is already {current[name]} on the shared client; "
+                        f"configure it before the first agent using this key is created"
+                    )
+        settings = self._settings.setdefault(key, {
+            "max_retries": 4, "backoff": 0.5, "max_backoff": 30.0, "max_connections": 100, "timeout": 120.0,
+        })
+        for name, value in (("max_retries", max_retries), ("backoff", backoff), ("max_backoff", max_backoff),
+                            ("max_connections", max_connections), ("timeout", timeout)):
+            if value is not None:
+                settings[name] = value
+        limiter = self._limiters.get(key)
+        if rpm or tpm:
+            if limiter is None or (limiter.rpm, limiter.tpm) != (rpm, tpm):
+                self._limiters[key] = RateLimiter(rpm, tpm)
+
+    def settings(self, key: Tuple) -> Dict[str, Any]:
+        if key not in self._settings:
+            self.configure(key)
+        return self._settings[key]
+
+    def client(self, key: Tuple, factory: Callable[..., Any]) -> Any:
+        """Shared SDK client for key, built once by factory(limits=..., timeout=...)."""
+        if key not in self._clients:
+            settings = self.settings(key)
+            limits = httpx.Limits(
+                max_connections=settings["max_connections"],
+                max_keepalive_connections=settings["max_connections"],
+            )
+            self._clients[key] = factory(limits=limits, timeout=settings["timeout"])
+        return self._clients[key]
+
+    def _backoff(self, key: Tuple, attempt: int, error: Exception) -> float:
+        settings = self.settings(key)
+        hinted = retry_after(error)
+        if hinted is not None:
+            return min(hinted, settings["max_backoff"])
+        # full jitter: spreads out agents that were throttled at the same moment
+        return random.uniform(0, min(settings["max_backoff"], settings["backoff"] * (2 ** attempt)))
+
+    async def _with_retries(self, key: Tuple, call: Callable[[], Awaitable[Any]], tokens: int) -> Any:
+        max_retries = self.settings(key)["max_retries"]
+        limiter = self._limiters.get(key)
+        for attempt in range(max_retries + 1):
+            if limiter:
+                await limiter.acquire(tokens)
+            self.stats["calls"] += 1
+            try:
+                return await call()
+            except Exception as e:
+                if attempt >= max_retries or not is_retryable(e):
+                    self.stats["failures"] += 1
+                    raise
+                delay = self._backoff(key, attempt, e)
+                self.stats["retries"] += 1
+                logging.warning(f"[LLM] {key[0]} request failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def call(self, key: Tuple, call: Callable[[], Awaitable[Any]], tokens: int = 0, coalesce: Optional[Any] = None) -> Any:
+        """Run call() under key's rate limits and retry policy.
+
+        Concurrent calls with the same `coalesce` value (e.g. the full request
+        payload) share one upstream request and its result.
+        """
+        if coalesce is None:
+            return await self._with_retries(key, call, tokens)
+        request_id = hashlib.sha256(json.dumps([key, coalesce], sort_keys=True, default=str).encode()).hexdigest()
+        task = self._inflight.get(request_id)
+        if task is None:
+            # its own task, so a cancelled caller does not cancel the others sharing it
+            task = asyncio.ensure_future(self._with_retries(key, call, tokens))
+            self._inflight[request_id] = task
+            task.add_done_callback(lambda t: (self._inflight.pop(request_id, None), t.cancelled() or t.exception()))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    async def stream(self, key: Tuple, open_stream: Callable[[], AsyncIterator[str]], tokens: int = 0) -> AsyncIterator[str]:
+        """Rate-limited stream; retried only if it fails before the first chunk."""
+        max_retries = self.settings(key)["max_retries"]
+        limiter = self._limiters.get(key)
+        for attempt in range(max_retries + 1):
+            if limiter:
+                await limiter.acquire(tokens)
+            self.stats["calls"] += 1
+            started = False
+            try:
+                async for chunk in open_stream():
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or attempt >= max_retries or not is_retryable(e):
+                    self.stats["failures"] += 1
+                    raise
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._backoff(key, attempt, e))
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**self.stats, "clients": len(self._clients), "inflight": len(self._inflight)}
+
+    async def close(self):
+        for client in self._clients.values():
+            close = getattr(client, "close", None) or getattr(client, "aclose", None)
+            if close:
+                try:
+                    await close()
+                except Exception:
+                    pass
+        self._clients.clear()
+
+
+# Shared by every LLM adapter
+LLM_REGISTRY = ClientRegistry()
@@ -0,0 +1,131 @@
+# pinet/llms/tool_calling.py
+
+import inspect
+import json
+import re
+import typing
+from typing import Any, Callable, Dict, List, Optional
+
+# Python annotation -> JSON schema type
+_JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    tuple: "array",
+    set: "array",
+    dict: "object",
+}
+
+_ARG_LINE = re.compile(r"^\s*(\*{0,2}\w+)\s*(?:\([^)]*\))?\s*:\s*(.+)$")
+
+
+def _type_schema(annotation: Any) -> Dict[str, Any]:
+    if annotation is inspect.Parameter.empty or annotation is Any:
+        return {}
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union or type(annotation).__name__ == "UnionType":
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        # Optional[X] is just X; wider unions are left untyped
+        return _type_schema(args[0]) if len(args) == 1 else {}
+    if origin is typing.Literal:
+        return {"enum": list(typing.get_args(annotation))}
+    base = origin or annotation
+    json_type = _JSON_TYPES.get(base)
+    if json_type is None:
+        return {}
+    schema = {"type": json_type}
+    args = typing.get_args(annotation)
+    if json_type == "array" and len(args) == 1:
+        items = _type_schema(args[0])
+        if items:
+            schema["items"] = items
+    return schema
+
+
+def _doc_args(doc: str) -> Dict[str, str]:
+    """Parameter descriptions from a Google-style `Args:` section."""
+    descriptions, in_args = {}, False
+    for line in doc.splitlines():
+        stripped = line.strip()
+        if stripped in ("Args:", "Arguments:", "Parameters:"):
+            in_args = True
+            continue
+        if in_args:
+            if stripped.endswith(":") and " " not in stripped:
+                break  # next section, e.g. Returns:
+            match = _ARG_LINE.match(line)
+            if match:
+                descriptions[match.group(1).lstrip("*")] = match.group(2).strip()
+    return descriptions
+
+
+def function_schema(func: Callable) -> Dict[str, Any]:
+    """JSON schema for the keyword arguments of a local tool, from its signature and docstring."""
+    properties, required = {}, []
+    doc = inspect.getdoc(func) or ""
+    descriptions = _doc_args(doc)
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        params = []
+    try:
+        hints = typing.get_type_hints(func)
+    except Exception:
+        hints = {}
+    for param in params:
+        if param.name in ("self", "cls") or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        schema = _type_schema(hints.get(param.name, param.annotation))
+        if param.name in descriptions:
+            schema["description"] = descriptions[param.name]
+        properties[param.name] = schema
+        if param.default is inspect.Parameter.empty:
+            required.append(param.name)
+    return {"type": "object", "properties": properties, "required": required}
+
+
+def tool_spec(tool: Any, name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Provider-neutral {"name", "description", "parameters"} for an MCP tool dict or a local callable."""
+    if isinstance(tool, dict):
+        name = name or tool.get("name")
+        if not name:
+            return None
+        parameters = tool.get("inputSchema") or {}
+        return {
+            "name": name,
+            "description": tool.get("description") or "",
+            "parameters": {"type": "object", "properties": {}, **parameters},
+        }
+    if callable(tool):
+        name = name or getattr(tool, "__name__", None)
+        if not name:
+            return None
+        doc = inspect.getdoc(tool) or ""
+        return {
+            "name": name,
+            # the first paragraph; the Args section is already in the schema
+            "description": doc.split("\n\n")[0].strip(),
+            "parameters": function_schema(tool),
+        }
+    return None
+
+
+def parse_arguments(raw: Any) -> Dict[str, Any]:
+    """Tool-call arguments as a dict, whether the provider sent JSON text or an object."""
+    if isinstance(raw, dict):
+        return raw
+    if not raw:
+        return {}
+    try:
+        parsed = json.loads(raw)
+    except (TypeError, ValueError):
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def tool_reply(content: str, tool_calls: List[Dict[str, Any]], message: Dict[str, Any]) -> Dict[str, Any]:
+    """What chat_tools returns: the reply text, the calls it asked for ({"id", "name", "arguments"})
+    and the assistant message to append to the conversation before the results."""
+    return {"content": content or "", "tool_calls": tool_calls, "message": message}
@@ -1,5 +1,8 @@
 # pinet/mcp/__init__.py
 
 from .mcp import MCP
+from .executor import ToolExecutor, LOCAL_TOOL_EXECUTOR
+from .cache import ToolCache, TOOL_CACHE
+from .pool import MCPPool, MCP_POOL
 
-__all__ = ["MCP"]
\ No newline at end of file
+__all__ = ["MCP", "MCPPool", "MCP_POOL", "ToolExecutor", "LOCAL_TOOL_EXECUTOR", "ToolCache", "TOOL_CACHE"]
\ No newline at end of file
@@ -0,0 +1,193 @@
+# pinet/mcp/cache.py
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("mcp_client")
+
+
+def _is_error(value: Any) -> bool:
+    # MCP reports tool failures in the result ({"isError": true, ...}) rather than as an error response
+    if isinstance(value, dict):
+        return bool(value.get("isError"))
+    return bool(getattr(value, "isError", False))
+
+
+def _copy(value: Any) -> Any:
+    """A copy for one caller, so mutating it cannot change what later callers get."""
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return value
+    try:
+        return copy.deepcopy(value)
+    except Exception:
+        return value
+
+
+class ToolCache:
+    """Results of read-only tool calls, shared by every agent in the process.
+
+    Entries are keyed by (namespace, tool, canonical JSON of the arguments) and
+    live for the tool's TTL; tools without a TTL are never cached, and neither are
+    results flagged `isError`. Concurrent identical calls share one upstream call,
+    and every caller gets its own copy of the result. With `path` set, results that are
+    JSON-serializable are also kept in a SQLite file so they survive restarts.
+    """
+
+    def __init__(self, max_entries: int = 1024, path: Optional[Path] = None, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.path = Path(path) if path else None
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "stores": 0, "evictions": 0, "expired": 0, "errors": 0}
+
+    def configure(self, max_entries: Optional[int] = None, path: Optional[Path] = None, enabled: Optional[bool] = None):
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if enabled is not None:
+            self.enabled = enabled
+        if path is not None and Path(path) != self.path:
+            self.close()
+            self.path = Path(path)
+
+    @staticmethod
+    def key(namespace: str, name: str, arguments: Dict[str, Any]) -> str:
+        canonical = json.dumps([namespace, name, arguments or {}], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @property
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, tool TEXT, expires REAL, value TEXT)"
+            )
+            self._conn.execute("DELETE FROM results WHERE expires <= ?", (time.time(),))
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key: str, value: Any, expires: float):
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _lookup(self, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return True, _copy(entry[0])
+            del self._entries[key]
+            self.stats["expired"] += 1
+        db = self._db
+        if db is not None:
+            with self._lock:
+                row = db.execute("SELECT value, expires FROM results WHERE key = ? AND expires > ?", (key, now)).fetchone()
+            if row:
+                value = json.loads(row[0])
+                self._remember(key, value, row[1])
+                self.stats["disk_hits"] += 1
+                return True, _copy(value)
+        return False, None
+
+    def _store(self, key: str, name: str, value: Any, ttl: float):
+        expires = time.time() + ttl
+        self._remember(key, value, expires)
+        self.stats["stores"] += 1
+        db = self._db
+        if db is None:
+            return
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError):
+            return  # kept in memory only
+        with self._lock:
+            db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, name, expires, payload))
+            db.commit()
+
+    async def call(
+        self,
+        namespace: str,
+        name: str,
+        arguments: Dict[str, Any],
+        ttl: Optional[float],
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Cached result of call() for these arguments, calling it on a miss."""
+        if not self.enabled or not ttl:
+            return await call()
+        key = self.key(namespace, name, arguments)
+        found, value = self._lookup(key)
+        if found:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["misses"] += 1
+
+            async def fetch():
+                value = await call()
+                if _is_error(value):
+                    self.stats["errors"] += 1  # returned to the callers, but retried next time
+                else:
+                    self._store(key, name, value, ttl)
+                return value
+
+            # its own task, so a cancelled caller does not cancel the others waiting on it
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: (self._inflight.pop(key, None), t.cancelled() or t.exception()))
+        else:
+            self.stats["coalesced"] += 1
+        return _copy(await asyncio.shield(task))
+
+    def invalidate(self, namespace: str, name: str, arguments: Dict[str, Any]):
+        key = self.key(namespace, name, arguments)
+        self._entries.pop(key, None)
+        db = self._db
+        if db is not None:
+            with self._lock:
+                db.execute("DELETE FROM results WHERE key = ?", (key,))
+                db.commit()
+
+    def clear(self):
+        self._entries.clear()
+        db = self._db
+        if db is not None:
+            with self._lock:
+                db.execute("DELETE FROM results")
+                db.commit()
+
+    def metrics(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"] + stats["coalesced"]
+        stats["size"] = len(self._entries)
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"] + stats["coalesced"]) / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Shared by every MCP client
+TOOL_CACHE = ToolCache()
@@ -0,0 +1,166 @@
+# pinet/mcp/executor.py
+import asyncio
+import contextvars
+import functools
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from pinet.tools import TOOL_POLICIES
+
+logger = logging.getLogger("mcp_client")
+
+
+def _call_by_name(name: str, arguments: Dict[str, Any]) -> Any:
+    # runs in a worker process: tools are looked up there, since bound methods may not pickle
+    import pinet.tools as pinet_tools
+    return getattr(pinet_tools, name)(**arguments)
+
+
+class ToolExecutor:
+    """Runs local tools for every LocalMCPRunner in the process without blocking the event loop.
+
+    Async tools run on the loop as before. Sync tools go to a shared thread
+    pool of `max_workers`; tools marked `cpu` in their policy go to a pool of
+    `max_processes` worker processes instead, when one is configured.
+    Policies (TOOL_POLICIES, overridable with configure) set a per-tool
+    `timeout` and a process-wide `concurrency` cap.
+
+    A timed-out or cancelled call returns to the caller at once and is dropped
+    if it has not started yet. Threads cannot be interrupted, so a call already
+    running keeps its concurrency slot until it actually finishes.
+    """
+
+    def __init__(self, max_workers: int = 32, max_processes: Optional[int] = None, timeout: Optional[float] = None):
+        self.max_workers = max_workers
+        self.max_processes = max_processes
+        self.timeout = timeout
+        self.policies: Dict[str, Dict[str, Any]] = {name: dict(policy) for name, policy in TOOL_POLICIES.items()}
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self.running = 0
+        self.stats = {"calls": 0, "async": 0, "threaded": 0, "processed": 0, "timeouts": 0, "cancelled": 0, "errors": 0}
+
+    def configure(
+        self,
+        max_workers: Optional[int] = None,
+        max_processes: Optional[int] = None,
+        timeout: Optional[float] = None,
+        policies: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """Change pool sizes, the default timeout or per-tool policies; pools are rebuilt on next use."""
+        if max_workers is not None and max_workers != self.max_workers:
+            self.max_workers = max_workers
+            if self._threads:
+                self._threads.shutdown(wait=False)
+                self._threads = None
+        if max_processes is not None and max_processes != self.max_processes:
+            self.max_processes = max_processes
+            if self._processes:
+                self._processes.shutdown(wait=False)
+                self._processes = None
+        if timeout is not None:
+            self.timeout = timeout
+        for name, policy in (policies or {}).items():
+            self.policies.setdefault(name, {}).update(policy)
+            self._limits.pop(name, None)
+
+    @property
+    def threads(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pinet-tool")
+        return self._threads
+
+    @property
+    def processes(self) -> ProcessPoolExecutor:
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(max_workers=self.max_processes)
+        return self._processes
+
+    def policy(self, name: str) -> Dict[str, Any]:
+        return self.policies.get(name, {})
+
+    def _limit(self, name: str) -> Optional[asyncio.Semaphore]:
+        concurrency = self.policy(name).get("concurrency")
+        if not concurrency:
+            return None
+        if name not in self._limits:
+            self._limits[name] = asyncio.Semaphore(concurrency)
+        return self._limits[name]
+
+    def _submit(self, name: str, func: Callable, arguments: Dict[str, Any]) -> Future:
+        if self.max_processes and self.policy(name).get("cpu"):
+            self.stats["processed"] += 1
+            return self.processes.submit(_call_by_name, name, arguments)
+        self.stats["threaded"] += 1
+        # carry contextvars (e.g. request-scoped settings) into the worker thread
+        context = contextvars.copy_context()
+        return self.threads.submit(context.run, functools.partial(func, **arguments))
+
+    async def run(self, name: str, func: Callable, arguments: Dict[str, Any]) -> Any:
+        timeout = self.policy(name).get("timeout", self.timeout)
+        limit = self._limit(name)
+        self.stats["calls"] += 1
+        try:
+            if limit:
+                await asyncio.wait_for(limit.acquire(), timeout)
+            if asyncio.iscoroutinefunction(func):
+                self.stats["async"] += 1
+                try:
+                    return await asyncio.wait_for(func(**arguments), timeout)
+                finally:
+                    if limit:
+                        limit.release()
+            return await self._run_sync(name, func, arguments, timeout, limit)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise TimeoutError(f"Tool '{name}' timed out after {timeout}s") from None
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+    async def _run_sync(self, name: str, func: Callable, arguments: Dict[str, Any], timeout: Optional[float], limit: Optional[asyncio.Semaphore]) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._submit(name, func, arguments)
+        except BaseException:
+            if limit:
+                limit.release()
+            raise
+        self.running += 1
+
+        def finished(_):
+            # the slot is freed when the work really ends, not when the caller gives up
+            def release():
+                self.running -= 1
+                if limit:
+                    limit.release()
+            try:
+                loop.call_soon_threadsafe(release)
+            except RuntimeError:
+                pass  # loop already closed
+
+        future.add_done_callback(finished)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            future.cancel()  # only succeeds if it has not started yet
+            raise
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**self.stats, "running": self.running, "max_workers": self.max_workers, "max_processes": self.max_processes}
+
+    def shutdown(self, wait: bool = False):
+        for pool in (self._threads, self._processes):
+            if pool:
+                pool.shutdown(wait=wait, cancel_futures=True)
+        self._threads = self._processes = None
+        self._limits.clear()
+
+
+# Shared by every LocalMCPRunner
+LOCAL_TOOL_EXECUTOR = ToolExecutor()
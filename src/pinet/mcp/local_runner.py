@@ -1,16 +1,20 @@
 # pinet/mcp/local_runner.py
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import pinet.tools as pinet_tools
+from .executor import LOCAL_TOOL_EXECUTOR, ToolExecutor
 from .runner import MCPRunner
 
-import asyncio
-
 class LocalMCPRunner(MCPRunner):
-    def __init__(self, tools):
+    """In-process tools. Sync tools run on the shared ToolExecutor, off the event loop."""
+
+    def __init__(self, tools, executor: Optional[ToolExecutor] = None):
         self.tools = {}
         for tool in tools:
             self.tools[tool] = getattr(pinet_tools, tool)
-        
+        self.executor = executor or LOCAL_TOOL_EXECUTOR
+
+    def tool_ttl(self, name: str) -> Optional[float]:
+        return self.executor.policy(name).get("ttl")
 
     async def initialize(self) -> Dict[str, Any]:
         return {"status": "local-mcp-ready"}
@@ -25,8 +29,7 @@ class LocalMCPRunner(MCPRunner):
         func = self.tools.get(name, None)
         if callable(func):
             try:
-                # await if async
-                result = await func(**arguments) if asyncio.iscoroutinefunction(func) else func(**arguments)
+                result = await self.executor.run(name, func, arguments)
                 return {"result": result}
             except Exception as e:
                 return {"error": str(e)}
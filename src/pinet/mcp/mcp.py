@@ -1,27 +1,54 @@
 # 📁 pinet/mcp/mcp.py
 from typing import Dict, Any, Optional, List, Union
+import hashlib
+import json
 from .stdio_runner import StdioMCPRunner
 from .http_runner import HTTPMCPRunner
 from .runner import MCPRunner
 from .sse_runner import SSEMCPRunner
 from .local_runner import LocalMCPRunner
+from .cache import TOOL_CACHE, ToolCache
 from .errors import MCPConnectionError, MCPProtocolError
 import logging
 
 logger = logging.getLogger("mcp_client")
 
+# Config keys that tune the client side only; they never change which server is started
+CLIENT_OPTIONS = ("pool_size", "cache_ttl")
+
+
+def server_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """config without CLIENT_OPTIONS: what identifies the MCP server itself."""
+    return {k: v for k, v in config.items() if k not in CLIENT_OPTIONS}
+
 class MCP:
     """Generalized MCP client that can connect to any MCP server type"""
     
-    def __init__(self, runner: MCPRunner):
+    def __init__(
+        self,
+        runner: MCPRunner,
+        namespace: str = "default",
+        cache_ttl: Union[float, Dict[str, float], None] = None,
+        cache: Optional[ToolCache] = None,
+    ):
         self.runner = runner
         self.tools_cache = None
         self.resources_cache = None
+        # tool results are cached per server; cache_ttl is seconds for every tool or {tool: seconds}
+        self.namespace = namespace
+        self.cache_ttl = cache_ttl
+        self.result_cache = cache or TOOL_CACHE
+
+    @staticmethod
+    def namespace_for(config: Dict[str, Any]) -> str:
+        if "local" in config:
+            return "local"
+        return hashlib.sha1(json.dumps(server_config(config), sort_keys=True, default=str).encode()).hexdigest()[:12]
     
     @classmethod
-    def from_stdio(cls, command: Union[str, List[str]], env: Optional[Dict[str, str]] = None):
+    def from_stdio(cls, command: Union[str, List[str]], env: Optional[Dict[str, str]] = None, timeout: Optional[float] = None):
         """Create client for stdio-based MCP server"""
-        runner = StdioMCPRunner(command, env)
+        runner = StdioMCPRunner(command, env, timeout)
         return cls(runner)
     
     @classmethod
@@ -44,12 +71,20 @@ class MCP:
     
     @classmethod
     def create(cls, config: Dict[str, Any]):
-        """Create client from configuration dictionary"""  
+        """Create client from configuration dictionary"""
+        client = cls._create(config)
+        client.namespace = cls.namespace_for(config)
+        client.cache_ttl = config.get("cache_ttl")
+        return client
+
+    @classmethod
+    def _create(cls, config: Dict[str, Any]):
         if "command" in config:
             # Stdio mode
             return cls.from_stdio(
                 config["command"],
-                config.get("env")
+                config.get("env"),
+                config.get("timeout")
             )
         elif "endpoint" in config:
             # HTTP mode
@@ -92,9 +127,25 @@ class MCP:
                 self.resources_cache = []
         return self.resources_cache
     
+    def tool_ttl(self, name: str) -> Optional[float]:
+        """Seconds a result of `name` may be reused; None means never cached."""
+        if isinstance(self.cache_ttl, dict):
+            if name in self.cache_ttl:
+                return self.cache_ttl[name]
+        elif self.cache_ttl is not None:
+            return self.cache_ttl
+        # local tools declare theirs in TOOL_POLICIES
+        runner_ttl = getattr(self.runner, "tool_ttl", None)
+        return runner_ttl(name) if runner_ttl else None
+
     async def call_tool(self, name: str, arguments: Dict[str, Any] = None) -> Any:
-        """Call a tool and return the result"""
+        """Call a tool and return the result, reusing a cached result while it is fresh"""
         arguments = arguments or {}
+        return await self.result_cache.call(
+            self.namespace, name, arguments, self.tool_ttl(name), lambda: self._call_tool(name, arguments)
+        )
+
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         response = await self.runner.call_tool(name, arguments)
         if "result" in response:
             return response["result"]
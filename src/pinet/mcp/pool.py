@@ -0,0 +1,180 @@
+# 📁 pinet/mcp/pool.py
+import asyncio
+import hashlib
+import json
+import logging
+import shlex
+from typing import Any, Dict, Iterable, List, Optional
+
+from pinet.behaviours.supervisor import Supervisor
+from .errors import MCPConnectionError
+from .mcp import MCP, server_config
+from .runner import MCPRunner
+from .stdio_runner import StdioMCPRunner
+
+logger = logging.getLogger("mcp_client")
+
+
+class MCPConnection:
+    """One MCP server instance, restartable by a Supervisor like a GenServer."""
+
+    def __init__(self, name: str, runner: MCPRunner):
+        self.name = name
+        self.runner = runner
+        self.inflight = 0
+        self._state: Dict[str, Any] = {"restart_count": 0}
+
+    async def start(self) -> None:
+        if not getattr(self.runner, "initialized", False):
+            await self.runner.initialize()
+
+    async def stop(self) -> None:
+        await self.runner.close()
+
+    async def _on_restart(self, state: Dict[str, Any]) -> None:
+        state["restart_count"] += 1
+        logger.info(f"[{self.name}] 🔁 Restart #{state['restart_count']}")
+
+    async def healthy(self, timeout: float = 10.0) -> bool:
+        if isinstance(self.runner, StdioMCPRunner):
+            process = self.runner.process
+            if not process or process.returncode is not None:
+                return False
+        try:
+            await asyncio.wait_for(self.runner.list_tools(), timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"[{self.name}] Health check failed: {e}")
+            return False
+
+
+class PooledRunner(MCPRunner):
+    """Spreads requests over N connections to the same server, least busy first."""
+
+    def __init__(self, connections: List[MCPConnection]):
+        self.connections = connections
+
+    @property
+    def initialized(self) -> bool:
+        return all(getattr(c.runner, "initialized", False) for c in self.connections)
+
+    async def _call(self, method: str, *args) -> Dict[str, Any]:
+        conn = min(self.connections, key=lambda c: c.inflight)
+        conn.inflight += 1
+        try:
+            return await getattr(conn.runner, method)(*args)
+        finally:
+            conn.inflight -= 1
+
+    async def initialize(self) -> Dict[str, Any]:
+        results = await asyncio.gather(*[c.runner.initialize() for c in self.connections])
+        return results[0]
+
+    async def list_tools(self) -> Dict[str, Any]:
+        return await self._call("list_tools")
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._call("call_tool", name, arguments)
+
+    async def list_resources(self) -> Dict[str, Any]:
+        return await self._call("list_resources")
+
+    async def read_resource(self, uri: str) -> Dict[str, Any]:
+        return await self._call("read_resource", uri)
+
+    async def close(self):
+        await asyncio.gather(*[c.stop() for c in self.connections])
+
+
+class MCPPool:
+    """Process-wide registry of MCP servers shared by every agent.
+
+    Configs that normalize to the same key share `pool_size` server instances
+    (default 1, set by the first config seen); client-side options such as
+    `cache_ttl` are not part of the key, so configs differing only in those get
+    their own MCP client over the same servers. Each instance is a child of
+    `supervisor`, which restarts it when a health check finds it dead.
+    Local tool configs are in-process and are never pooled.
+    """
+
+    def __init__(self, supervisor: Optional[Supervisor] = None, health_interval: float = 30.0):
+        self.supervisor = supervisor or Supervisor("mcp")
+        self.health_interval = health_interval
+        self._clients: Dict[str, MCP] = {}
+        self._connections: Dict[str, List[MCPConnection]] = {}
+        self._health_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def key(config: Dict[str, Any]) -> str:
+        normalized = server_config(config)
+        if isinstance(normalized.get("command"), str):
+            normalized["command"] = shlex.split(normalized["command"])
+        return json.dumps(normalized, sort_keys=True, default=str)
+
+    def get(self, config: Dict[str, Any]) -> MCP:
+        """Return the shared client for config, creating it on first use."""
+        if "local" in config:
+            return MCP.create(config)
+        key = self.key(config)
+        if key not in self._connections:
+            size = max(1, int(config.get("pool_size", 1)))
+            prefix = f"mcp-{hashlib.sha1(key.encode()).hexdigest()[:8]}"
+            connections = [MCPConnection(f"{prefix}-{i}", MCP.create(config).runner) for i in range(size)]
+            for conn in connections:
+                self.supervisor._register_child(conn)
+            self._connections[key] = connections
+        client_key = json.dumps([key, config.get("cache_ttl")], sort_keys=True, default=str)
+        if client_key not in self._clients:
+            connections = self._connections[key]
+            self._clients[client_key] = MCP(
+                connections[0].runner if len(connections) == 1 else PooledRunner(connections),
+                namespace=MCP.namespace_for(config),
+                cache_ttl=config.get("cache_ttl"),
+            )
+        return self._clients[client_key]
+
+    async def prewarm(self, configs: Iterable[Dict[str, Any]]) -> None:
+        """Start every server and cache its tool list ahead of first use."""
+        clients = [self.get(config) for config in configs if "local" not in config]
+
+        async def warm(client: MCP):
+            try:
+                await client.get_tools()
+            except Exception as e:
+                logger.warning(f"[MCPPool] Failed to pre-warm MCP server: {e}")
+
+        await asyncio.gather(*[warm(client) for client in clients])
+
+    async def check_health(self) -> None:
+        for connections in list(self._connections.values()):
+            for conn in connections:
+                if conn.name in self.supervisor._restarting:
+                    continue
+                if not await conn.healthy():
+                    asyncio.create_task(
+                        self.supervisor._child_failed(conn, MCPConnectionError(f"{conn.name} is not responding"))
+                    )
+
+    def start_health_checks(self) -> None:
+        if self._health_task and not self._health_task.done():
+            return
+
+        async def loop():
+            while True:
+                await asyncio.sleep(self.health_interval)
+                await self.check_health()
+
+        self._health_task = asyncio.create_task(loop(), name="mcp-health")
+
+    async def close(self) -> None:
+        if self._health_task:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        await self.supervisor.stop_all()
+        self._clients.clear()
+        self._connections.clear()
+
+
+# Shared pool used by agents and playbooks
+MCP_POOL = MCPPool()
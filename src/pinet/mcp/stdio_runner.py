@@ -1,20 +1,44 @@
 import asyncio
 import json
+import logging
 import os
-from typing import Any, Dict, List, Optional, Union
+import signal
+from typing import Any, Callable, Dict, List, Optional, Union
 from .errors import MCPConnectionError, MCPProtocolError
 from .runner import MCPRunner
 
+logger = logging.getLogger("mcp_client")
+
+# Largest single JSON-RPC line accepted from the server (tool results can be big)
+STREAM_LIMIT = 16 * 1024 * 1024
+
 
 class StdioMCPRunner(MCPRunner):
-    """MCP runner for stdio-based servers"""
+    """MCP runner for stdio-based servers.
+
+    A background reader routes JSON-RPC responses to the waiting request by id,
+    so any number of requests can be in flight on one subprocess.
+    """
     
-    def __init__(self, command: Union[str, List[str]], env: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        command: Union[str, List[str]],
+        env: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        on_notification: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ):
         self.command = command
         self.env = env or {}
+        self.timeout = timeout
+        self.on_notification = on_notification
         self.process = None
         self.request_id = 0
         self.initialized = False
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._stderr_reader: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        self._init_lock = asyncio.Lock()
     
     async def _start_process(self):
         """Start the subprocess"""
@@ -27,7 +51,10 @@ class StdioMCPRunner(MCPRunner):
                 env=env,
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                limit=STREAM_LIMIT,
+                # own process group, so close() also reaches the command the shell runs
+                start_new_session=os.name == "posix"
             )
         else:
             self.process = await asyncio.create_subprocess_exec(
@@ -35,8 +62,11 @@ class StdioMCPRunner(MCPRunner):
                 env=env,
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                limit=STREAM_LIMIT
             )
+        self._reader = asyncio.create_task(self._read_loop())
+        self._stderr_reader = asyncio.create_task(self._drain_stderr())
     
     async def _send_request(self, request: Dict[str, Any]) -> None:
         """Send a JSON-RPC request"""
@@ -44,38 +74,102 @@ class StdioMCPRunner(MCPRunner):
             raise MCPConnectionError("Process not started")
         
         request_json = json.dumps(request) + "\n"
-        self.process.stdin.write(request_json.encode())
-        await self.process.stdin.drain()
+        async with self._write_lock:
+            self.process.stdin.write(request_json.encode())
+            await self.process.stdin.drain()
     
-    async def _read_response(self) -> Dict[str, Any]:
-        """Read a JSON-RPC response"""
-        if not self.process:
-            raise MCPConnectionError("Process not started")
-        
-        response_line = await self.process.stdout.readline()
-        if not response_line:
-            raise MCPConnectionError("No response from MCP server")
-        
+    async def _read_loop(self) -> None:
+        """Read every line from the server and route it to its waiter"""
+        error: Exception = MCPConnectionError("No response from MCP server")
         try:
-            return json.loads(response_line.decode().strip())
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {response_line}")
-            raise MCPProtocolError(f"Invalid JSON response: {e}")
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line.decode().strip())
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring non JSON-RPC output: {line[:200]!r}")
+                    continue
+                if "method" in message:
+                    await self._handle_server_message(message)
+                    continue
+                fut = self._pending.pop(message.get("id"), None)
+                if fut and not fut.done():
+                    fut.set_result(message)
+        except asyncio.CancelledError:
+            error = MCPConnectionError("MCP connection closed")
+            raise
+        except Exception as e:
+            logger.error(f"MCP reader failed: {e}")
+            error = MCPConnectionError(f"MCP reader failed: {e}")
+        finally:
+            self._fail_pending(error)
+
+    async def _handle_server_message(self, message: Dict[str, Any]) -> None:
+        """Answer server-to-client requests and dispatch notifications"""
+        if "id" in message:
+            # server request; only ping is supported by this client
+            reply = {"jsonrpc": "2.0", "id": message["id"]}
+            if message["method"] == "ping":
+                reply["result"] = {}
+            else:
+                reply["error"] = {"code": -32601, "message": f"Method not found: {message['method']}"}
+            await self._send_request(reply)
+        elif self.on_notification:
+            try:
+                result = self.on_notification(message)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Notification handler failed: {e}")
+        else:
+            logger.debug(f"MCP notification: {message.get('method')}")
+
+    async def _drain_stderr(self) -> None:
+        # an unread stderr pipe fills up and blocks the server
+        while line := await self.process.stderr.readline():
+            logger.debug(f"MCP stderr: {line.decode(errors='replace').rstrip()}")
+
+    def _signal(self, sig: int) -> None:
+        try:
+            if isinstance(self.command, str) and os.name == "posix":
+                os.killpg(self.process.pid, sig)
+            elif self.process.returncode is None:
+                self.process.send_signal(sig)
+        except ProcessLookupError:
+            pass
+
+    def _fail_pending(self, error: Exception) -> None:
+        for fut in self._pending.values():
+            if not fut.done():
+                fut.set_exception(error)
+        self._pending.clear()
     
     async def _make_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a JSON-RPC request and return the response"""
+        if not self._reader or self._reader.done():
+            raise MCPConnectionError("MCP server is not running")
         self.request_id += 1
+        request_id = self.request_id
         request = {
             "jsonrpc": "2.0",
-            "id": self.request_id,
+            "id": request_id,
             "method": method
         }
         
         if params:
             request["params"] = params
         
-        await self._send_request(request)
-        response = await self._read_response()
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = fut
+        try:
+            await self._send_request(request)
+            response = await asyncio.wait_for(fut, self.timeout)
+        except asyncio.TimeoutError:
+            raise MCPConnectionError(f"MCP request '{method}' timed out after {self.timeout}s")
+        finally:
+            self._pending.pop(request_id, None)
         
         if "error" in response:
             raise MCPProtocolError(f"MCP error: {response['error']}")
@@ -84,6 +178,12 @@ class StdioMCPRunner(MCPRunner):
     
     async def initialize(self) -> Dict[str, Any]:
         """Initialize the MCP connection"""
+        async with self._init_lock:
+            if self.initialized:
+                return {"status": "already-initialized"}
+            return await self._initialize()
+
+    async def _initialize(self) -> Dict[str, Any]:
         if not self.process:
             await self._start_process()
         
@@ -142,7 +242,18 @@ class StdioMCPRunner(MCPRunner):
     
     async def close(self):
         """Close the connection"""
+        for task in (self._reader, self._stderr_reader):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._reader = self._stderr_reader = None
+        self._fail_pending(MCPConnectionError("MCP connection closed"))
         if self.process:
-            self.process.terminate()
-            await self.process.wait()
-            self.process = None
\ No newline at end of file
+            self._signal(signal.SIGTERM)
+            try:
+                await asyncio.wait_for(self.process.wait(), 5)
+            except asyncio.TimeoutError:
+                self._signal(signal.SIGKILL if os.name == "posix" else signal.SIGTERM)
+                await self.process.wait()
+            self.process = None
+        self.initialized = False
\ No newline at end of file
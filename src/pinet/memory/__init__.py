@@ -1,22 +1,34 @@
 
 ### pinet/memory/__init__.py
 from .json_memory import JSONMemory
+from .jsonl_memory import JSONLMemory
 from .vector_chroma import ChromaMemory
 from .hybrid import HybridMemory
 from .knowledge_graph import KnowledgeGraphMemory
+from .embedding_cache import EmbeddingCache, EMBEDDING_CACHE
+from .embedding_service import EmbeddingService, EMBEDDING_SERVICE, get_embedding_service
 
 def load_memory(agent_name: str, config: dict):
     backend = config.get("type", "json")
     if backend == "json":
         return JSONMemory(agent_name)
+    elif backend == "jsonl":
+        return JSONLMemory(
+            agent_name,
+            recent=config.get("recent", 1000),
+            fsync_every=config.get("fsync_every", 32),
+            fsync_interval=config.get("fsync_interval", 1.0),
+            max_messages=config.get("max_messages"),
+            path=config.get("path"),
+        )
     elif backend == "chroma":
-        return ChromaMemory(agent_name)
+        return ChromaMemory(agent_name, persist=config.get("persist", True))
     elif backend == "hybrid":
         return HybridMemory(agent_name, config.get("components", []))
     elif backend == "kg":
-        return KnowledgeGraphMemory(agent_name)
+        return KnowledgeGraphMemory(agent_name, persist=config.get("persist", True))
     else:
         raise ValueError(f"Unknown memory backend: {backend}")
 
-__all__ = ["load_memory", "JSONMemory", "ChromaMemory", "HybridMemory", "KnowledgeGraphMemory"]
+__all__ = ["load_memory", "JSONMemory", "JSONLMemory", "ChromaMemory", "HybridMemory", "KnowledgeGraphMemory", "EmbeddingCache", "EMBEDDING_CACHE", "EmbeddingService", "EMBEDDING_SERVICE", "get_embedding_service"]
 
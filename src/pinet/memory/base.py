@@ -18,6 +18,10 @@ class VectorStore(ABC):
         """Search memory and return top-k results."""
         pass
 
+    def tail(self, n: int) -> List[dict]:
+        """The n most recent messages, oldest first."""
+        return self.get_messages()[-n:]
+
     def load(self) -> List[str]:
         """Load memory state if applicable."""
         return []
@@ -0,0 +1,145 @@
+### pinet/memory/embedding_service.py
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+class EmbeddingService:
+    """One embedding model per process, shared by every agent.
+
+    The model is loaded on first use. Encode requests from any thread are queued
+    to a single worker thread, which merges whatever arrives within `max_wait`
+    seconds (up to `max_batch` texts) into one model.encode call.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, max_batch: int = 64, max_wait: float = 0.005):
+        self.model_name = model_name
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._queue: "queue.Queue[tuple[List[str], Future, float]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._stats = {
+            "requests": 0,
+            "texts": 0,
+            "batches": 0,
+            "encode_seconds": 0.0,
+            "latency_seconds": 0.0,
+            "max_latency": 0.0,
+        }
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    logging.info(f"[EmbeddingService] Loading {self.model_name}")
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._load_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name="embedding-service", daemon=True)
+                    self._worker.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue texts for encoding; the future resolves to one vector per text."""
+        fut: Future = Future()
+        if not texts:
+            fut.set_result([])
+            return fut
+        self._ensure_worker()
+        self._queue.put((list(texts), fut, time.monotonic()))
+        return fut
+
+    def encode(self, texts: List[str]) -> List[List[float]]:
+        return self.submit(texts).result()
+
+    async def aencode(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            try:
+                self._encode_batch(batch)
+            except Exception as e:
+                # never let one batch take the worker down with every later request
+                logging.error(f"[EmbeddingService] Batch failed: {e}")
+
+    @staticmethod
+    def _deliver(fut: Future, result: Any = None, error: Optional[BaseException] = None):
+        try:
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
+        except Exception as e:
+            logging.warning(f"[EmbeddingService] Could not deliver embeddings: {e}")
+
+    def _encode_batch(self, batch):
+        # aencode callers cancel through wrap_future; drop those before encoding, and
+        # mark the rest running so they can no longer be cancelled under us
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        texts = [text for item, _, _ in batch for text in item]
+        start = time.monotonic()
+        try:
+            vectors = self.model.encode(texts, batch_size=self.max_batch).tolist()
+        except Exception as e:
+            for _, fut, _ in batch:
+                self._deliver(fut, error=e)
+            return
+        done = time.monotonic()
+        self._stats["batches"] += 1
+        self._stats["encode_seconds"] += done - start
+        offset = 0
+        for item, fut, queued_at in batch:
+            self._deliver(fut, vectors[offset:offset + len(item)])
+            offset += len(item)
+            latency = done - queued_at
+            self._stats["requests"] += 1
+            self._stats["texts"] += len(item)
+            self._stats["latency_seconds"] += latency
+            self._stats["max_latency"] = max(self._stats["max_latency"], latency)
+
+    def metrics(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        stats["avg_batch_size"] = stats["texts"] / stats["batches"] if stats["batches"] else 0.0
+        stats["avg_latency"] = stats["latency_seconds"] / stats["requests"] if stats["requests"] else 0.0
+        stats["texts_per_second"] = stats["texts"] / stats["encode_seconds"] if stats["encode_seconds"] else 0.0
+        return stats
+
+
+# Default model: Chroma embedders and the semantic response cache encode through it
+EMBEDDING_SERVICE = EmbeddingService()
+
+_SERVICES: Dict[str, EmbeddingService] = {MODEL_NAME: EMBEDDING_SERVICE}
+_SERVICES_LOCK = threading.Lock()
+
+def get_embedding_service(model_name: str = MODEL_NAME) -> EmbeddingService:
+    """Process-wide service for model_name, created on first request."""
+    with _SERVICES_LOCK:
+        if model_name not in _SERVICES:
+            _SERVICES[model_name] = EmbeddingService(model_name)
+        return _SERVICES[model_name]
@@ -2,19 +2,14 @@
 
 
 ### pinet/memory/hybrid.py
-from .json_memory import JSONMemory
-from .vector_chroma import ChromaMemory
 from typing import List
 from .base import VectorStore
 
 class HybridMemory(VectorStore):
     def __init__(self, agent_name: str, components_config: list):
-        self.components = []
-        for config in components_config:
-            if config["type"] == "json":
-                self.components.append(JSONMemory(agent_name))
-            elif config["type"] == "chroma":
-                self.components.append(ChromaMemory(agent_name))
+        # same construction (and options) as a standalone backend of that type
+        from . import load_memory
+        self.components = [load_memory(agent_name, config) for config in components_config]
 
     def get_messages(self) -> List[dict]:
         messages = []
@@ -40,6 +35,16 @@ class HybridMemory(VectorStore):
         for comp in self.components:
             comp.save()
 
+    def flush(self):
+        for comp in self.components:
+            if hasattr(comp, "flush"):
+                comp.flush()
+
+    def close(self):
+        for comp in self.components:
+            if hasattr(comp, "close"):
+                comp.close()
+
     def clear(self):
         for comp in self.components:
             comp.clear()
\ No newline at end of file
@@ -19,7 +19,10 @@ class JSONMemory(VectorStore):
         return []
 
     def get_messages(self) -> List[dict]:
-        return self.load()
+        return list(self.data)
+
+    def tail(self, n: int) -> List[dict]:
+        return self.data[-n:]
 
     def add(self, item: str):
         self.data.append(item)
@@ -0,0 +1,159 @@
+### pinet/memory/jsonl_memory.py
+import json
+import logging
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import List, Optional
+from .base import VectorStore
+
+class JSONLMemory(VectorStore):
+    """Append-only JSON-lines memory.
+
+    Each message is one line in `path` (agent_data/<name>.jsonl by default), so saving a turn only
+    appends the new lines instead of rewriting the whole history. The most recent
+    messages are kept in an in-memory ring, fsyncs are batched, and the file is
+    compacted down to `max_messages` once it grows past twice that size.
+    """
+
+    def __init__(
+        self,
+        agent_name: str,
+        recent: int = 1000,
+        fsync_every: int = 32,
+        fsync_interval: float = 1.0,
+        max_messages: Optional[int] = None,
+        path: Optional[Path] = None,
+    ):
+        self.path = Path(path) if path else Path("./agent_data") / f"{agent_name}.jsonl"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.recent = deque(maxlen=recent)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.max_messages = max_messages
+        self._pending: List[str] = []
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lines = 0
+        self._fh = None
+        self._import_legacy(agent_name)
+        self.load()
+
+    def _import_legacy(self, agent_name: str):
+        """One-time migration from a JSONMemory file of the same agent."""
+        legacy = self.path.with_name(f"{agent_name}.json")
+        if self.path.exists() or not legacy.exists():
+            return
+        try:
+            data = json.loads(legacy.read_text())
+        except Exception:
+            return
+        with self.path.open("w", encoding="utf-8") as f:
+            for item in data:
+                f.write(json.dumps(item) + "\n")
+
+    def load(self) -> List[dict]:
+        self._flush(sync=False)
+        self.recent.clear()
+        self._lines = 0
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.recent.append(json.loads(line))
+                        self._lines += 1
+                    except json.JSONDecodeError:
+                        # torn write from a crash; the line is dropped at next compaction
+                        logging.warning(f"[JSONLMemory] Skipping corrupt line in {self.path}")
+        return list(self.recent)
+
+    def get_messages(self) -> List[dict]:
+        return list(self.recent)
+
+    def tail(self, n: int) -> List[dict]:
+        # walk the ring from the newest end instead of copying all of it
+        items = []
+        for item in reversed(self.recent):
+            if len(items) >= n:
+                break
+            items.append(item)
+        return items[::-1]
+
+    def add(self, item: str | dict):
+        self.recent.append(item)
+        self._pending.append(json.dumps(item) + "\n")
+        # bound the data at risk even when nobody calls save()
+        if (
+            len(self._pending) + self._unsynced >= self.fsync_every
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self._flush(sync=False)
+
+    def search(self, query: str, top_k: int = 3):
+        return list(self.recent)[-top_k:]  # simple tail for context
+
+    def save(self, sync: bool = False):
+        """Append pending messages; fsync every `fsync_every` lines or `fsync_interval` seconds."""
+        self._flush(sync)
+        if self.max_messages and self._lines > 2 * self.max_messages:
+            self.compact()
+
+    def _flush(self, sync: bool):
+        if self._pending:
+            if self._fh is None:
+                self._fh = self._open_for_append()
+            self._fh.writelines(self._pending)
+            self._fh.flush()
+            self._lines += len(self._pending)
+            self._unsynced += len(self._pending)
+            self._pending.clear()
+        if self._unsynced and (
+            sync
+            or self._unsynced >= self.fsync_every
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            os.fsync(self._fh.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def _open_for_append(self):
+        fh = self.path.open("a+", encoding="utf-8")
+        if fh.tell() > 0:
+            # terminate a torn last line so the next message starts on its own line
+            fh.seek(fh.tell() - 1)
+            if fh.read(1) != "\n":
+                fh.write("\n")
+        return fh
+
+    def compact(self):
+        """Rewrite the file keeping only the newest `max_messages` entries."""
+        self.close()
+        keep = deque(maxlen=self.max_messages)
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        keep.append(json.dumps(json.loads(line)) + "\n")
+                    except json.JSONDecodeError:
+                        continue
+        tmp = self.path.with_suffix(".jsonl.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            f.writelines(keep)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._lines = len(keep)
+
+    def close(self):
+        self._flush(sync=True)
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+    def clear(self):
+        self.close()
+        self._pending.clear()
+        self.recent.clear()
+        self._lines = 0
+        self.path.unlink(missing_ok=True)
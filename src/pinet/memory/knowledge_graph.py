@@ -1,45 +1,240 @@
-import networkx as nx
-from typing import List, Tuple, Optional, Union, Dict
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from .base import VectorStore
 
-class KnowledgeGraphMemory:
-    def __init__(self, name: str):
+Triple = Tuple[str, str, str]
+
+class KnowledgeGraphMemory(VectorStore):
+    """Triple store backed by SQLite at agent_data/<name>/kg.sqlite.
+
+    Terms are interned to integer ids and triples are stored once per
+    (subject, predicate, object), so one pair of entities can have many
+    predicates. The primary key serves SPO lookups and two covering indexes serve
+    POS and OSP, so every triple pattern is an index range scan rather than a
+    walk over all edges. The database is opened on first use and facts are read
+    on demand, never loaded wholesale.
+    """
+
+    def __init__(self, name: str, persist: bool = True):
         self.name = name
-        self.graph = nx.DiGraph()
+        self.path = Path("./agent_data") / name / "kg.sqlite" if persist else None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path) if self.path else ":memory:", check_same_thread=False)
+            self._conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, value TEXT UNIQUE NOT NULL, norm TEXT NOT NULL);
+                CREATE INDEX IF NOT EXISTS terms_norm ON terms (norm);
+                CREATE TABLE IF NOT EXISTS triples (s INTEGER, p INTEGER, o INTEGER, PRIMARY KEY (s, p, o)) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS triples_pos ON triples (p, o, s);
+                CREATE INDEX IF NOT EXISTS triples_osp ON triples (o, s, p);
+            """)
+        return self._conn
 
     def load(self):
         return self  # Placeholder for compatibility
 
+    def _intern(self, db: sqlite3.Connection, values: Iterable[str]) -> Dict[str, int]:
+        values = list({str(v) for v in values})
+        db.executemany("INSERT OR IGNORE INTO terms (value, norm) VALUES (?, ?)", [(v, v.lower()) for v in values])
+        ids: Dict[str, int] = {}
+        for i in range(0, len(values), 500):
+            chunk = values[i:i + 500]
+            ids.update(db.execute(f"SELECT value, id FROM terms WHERE value IN ({','.join('?' * len(chunk))})", chunk))
+        return ids
+
+    def _term_id(self, value: str) -> Optional[int]:
+        row = self._db().execute("SELECT id FROM terms WHERE value = ?", (str(value),)).fetchone()
+        return row[0] if row else None
+
     def add_triplet(self, subject: str, predicate: str, obj: str):
-        self.graph.add_node(subject, type="entity")
-        self.graph.add_node(obj, type="entity")
-        self.graph.add_edge(subject, obj, predicate=predicate)
-
-    def bulk_add(self, triplets: List[Tuple[str, str, str]]):
-        for s, p, o in triplets:
-            self.add_triplet(s, p, o)
-
-    def query(self, subject: Optional[str] = None, predicate: Optional[str] = None, obj: Optional[str] = None) -> List[str]:
-        results = []
-        for u, v, attrs in self.graph.edges(data=True):
-            if ((subject is None or u == subject) and
-                (obj is None or v == obj) and
-                (predicate is None or attrs.get("predicate") == predicate)):
-                results.append(f"{u} --[{attrs['predicate']}]--> {v}")
-        return results
-
-    def visualize(self) -> str:
-        return "\n".join([f"{u} --[{d['predicate']}]--> {v}" for u, v, d in self.graph.edges(data=True)])
+        self.bulk_add([(subject, predicate, obj)])
+
+    def bulk_add(self, triplets: Iterable[Tuple[str, str, str]]):
+        """Insert many facts in one transaction; duplicates are ignored."""
+        triplets = iter(triplets)
+        with self._lock:
+            db = self._db()
+            with db:
+                while batch := [t for _, t in zip(range(1000), triplets)]:
+                    ids = self._intern(db, (term for triple in batch for term in triple))
+                    rows = [(ids[str(s)], ids[str(p)], ids[str(o)]) for s, p, o in batch]
+                    db.executemany("INSERT OR IGNORE INTO triples (s, p, o) VALUES (?, ?, ?)", rows)
+
+    def remove_triplet(self, subject: str, predicate: str, obj: str):
+        with self._lock:
+            ids = [self._term_id(t) for t in (subject, predicate, obj)]
+            if None not in ids:
+                with self._db() as db:
+                    db.execute("DELETE FROM triples WHERE s = ? AND p = ? AND o = ?", ids)
+
+    def match(
+        self,
+        subject: Optional[str] = None,
+        predicate: Optional[str] = None,
+        obj: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Triple]:
+        """Return (subject, predicate, object) triples matching a pattern; None is a wildcard."""
+        where, params = [], []
+        with self._lock:
+            for column, value in (("s", subject), ("p", predicate), ("o", obj)):
+                if value is None:
+                    continue
+                term = self._term_id(value)
+                if term is None:
+                    return []
+                where.append(f"t.{column} = ?")
+                params.append(term)
+            sql = (
+                "SELECT ts.value, tp.value, tob.value FROM triples t "
+                "JOIN terms ts ON ts.id = t.s JOIN terms tp ON tp.id = t.p JOIN terms tob ON tob.id = t.o"
+            )
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            if limit is not None:
+                sql += f" LIMIT {int(limit)}"
+            return self._db().execute(sql, params).fetchall()
+
+    def query(self, subject: Optional[str] = None, predicate: Optional[str] = None, obj: Optional[str] = None, limit: Optional[int] = None) -> List[str]:
+        return [self._format(t) for t in self.match(subject, predicate, obj, limit)]
+
+    def traverse(
+        self,
+        start: str,
+        max_hops: int = 2,
+        predicate: Optional[str] = None,
+        direction: str = "out",
+        limit: int = 1000,
+    ) -> List[Triple]:
+        """Facts reachable from `start` within max_hops edges (breadth-first).
+
+        direction is "out" (follow subject -> object), "in" or "both"; predicate
+        restricts every hop to one relation. Stops after `limit` facts.
+        """
+        with self._lock:
+            db = self._db()
+            root = self._term_id(start)
+            pred = self._term_id(predicate) if predicate is not None else None
+            if root is None or (predicate is not None and pred is None):
+                return []
+            lookups = []
+            if direction in ("out", "both"):
+                lookups.append(("s", "o"))
+            if direction in ("in", "both"):
+                lookups.append(("o", "s"))
+
+            seen_nodes, seen_edges, found = {root}, set(), []
+            frontier = [root]
+            for _ in range(max_hops):
+                next_frontier = []
+                for start_col, end_col in lookups:
+                    for i in range(0, len(frontier), 500):
+                        chunk = frontier[i:i + 500]
+                        sql = f"SELECT s, p, o FROM triples WHERE {start_col} IN ({','.join('?' * len(chunk))})"
+                        params = list(chunk)
+                        if pred is not None:
+                            sql += " AND p = ?"
+                            params.append(pred)
+                        for edge in db.execute(sql, params):
+                            if edge in seen_edges:
+                                continue
+                            seen_edges.add(edge)
+                            found.append(edge)
+                            end = edge[2] if end_col == "o" else edge[0]
+                            if end not in seen_nodes:
+                                seen_nodes.add(end)
+                                next_frontier.append(end)
+                            if len(found) >= limit:
+                                return self._resolve(found)
+                if not next_frontier:
+                    break
+                frontier = next_frontier
+            return self._resolve(found)
+
+    def _resolve(self, edges: List[Tuple[int, int, int]]) -> List[Triple]:
+        ids = list({term for edge in edges for term in edge})
+        names: Dict[int, str] = {}
+        db = self._db()
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            names.update(db.execute(f"SELECT id, value FROM terms WHERE id IN ({','.join('?' * len(chunk))})", chunk))
+        return [(names[s], names[p], names[o]) for s, p, o in edges]
+
+    def find_entities(self, text: str, max_words: int = 3) -> List[str]:
+        """Terms (case-insensitive) that occur in text as one- to max_words-word phrases."""
+        words = re.findall(r"\w+", text.lower())
+        phrases = list({" ".join(words[i:i + n]) for n in range(1, max_words + 1) for i in range(len(words) - n + 1)})
+        found = []
+        with self._lock:
+            db = self._db()
+            for i in range(0, len(phrases), 500):
+                chunk = phrases[i:i + 500]
+                found += [v for (v,) in db.execute(f"SELECT value FROM terms WHERE norm IN ({','.join('?' * len(chunk))})", chunk)]
+        return found
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+
+    @staticmethod
+    def _format(triple: Triple) -> str:
+        s, p, o = triple
+        return f"{s} --[{p}]--> {o}"
+
+    def visualize(self, limit: Optional[int] = 1000) -> str:
+        return "\n".join(self.query(limit=limit))
+
+    def to_networkx(self, limit: Optional[int] = None):
+        """Export to a networkx MultiDiGraph for analysis or drawing."""
+        import networkx as nx
+        graph = nx.MultiDiGraph()
+        for s, p, o in self.match(limit=limit):
+            graph.add_edge(s, o, key=p, predicate=p)
+        return graph
 
     def append(self, item: Union[str, dict]):
         if isinstance(item, dict) and 'role' in item and 'content' in item:
-            self.add_triplet("user", "says", item['content'])
+            self.add_triplet(item['role'], "says", item['content'])
+
+    def add(self, item: Union[str, dict]):
+        self.append(item)
+
+    def search(self, query: str, top_k: int = 3) -> List[str]:
+        facts = []
+        for entity in self.find_entities(query):
+            facts += self.query(subject=entity, limit=top_k) + self.query(obj=entity, limit=top_k)
+        return list(dict.fromkeys(facts))[:top_k]
+
+    def get_messages(self, limit: int = 50):
+        return [{"role": "assistant", "content": fact} for fact in self.query(limit=limit)]
+
+    def to_facts(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        return [{"subject": s, "predicate": p, "object": o} for s, p, o in self.match(limit=limit)]
+
+    def save(self):
+        pass  # every write is committed in its own transaction
 
-    def get_messages(self):
-        triples = self.graph.get_all_facts()
-        return [{"role": "assistant", "content": f"{u} --[{d['predicate']}]--> {v}"} for u,v,d in triples]
+    def clear(self):
+        with self._lock:
+            with self._db() as db:
+                db.execute("DELETE FROM triples")
+                db.execute("DELETE FROM terms")
 
-    def to_facts(self) -> List[Dict[str, str]]:
-        return [{"subject": u, "predicate": d["predicate"], "object": v} for u, v, d in self.graph.edges(data=True)]
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
 # Tool functions
 KG_INSTANCE = KnowledgeGraphMemory("shared_kg")
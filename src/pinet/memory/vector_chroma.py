@@ -1,48 +1,127 @@
+import hashlib
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, List, Optional
 from pathlib import Path
-from sentence_transformers import SentenceTransformer
 import chromadb
 from .base import VectorStore
+from .embedding_cache import EMBEDDING_CACHE, EmbeddingCache
+from .embedding_service import EMBEDDING_SERVICE, MODEL_NAME, EmbeddingService
 
 # Embedding interface
 class LocalEmbedder:
-    def __init__(self):
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+    def __init__(self, cache: Optional[EmbeddingCache] = EMBEDDING_CACHE, service: EmbeddingService = EMBEDDING_SERVICE):
+        # the model itself lives in the shared service and is loaded on first encode
+        self.service = service
+        self.cache = cache
 
     def __call__(self, input):  # updated to match Chroma's expected signature
-        return self.model.encode(input).tolist()
+        if self.cache is None:
+            return self.service.encode(list(input))
+        keys = [EmbeddingCache.key(self.service.model_name, text) for text in input]
+        vectors = self.cache.get_many(keys)
+        missing = {key: text for key, text in zip(keys, input) if key not in vectors}
+        if missing:
+            encoded = self.service.encode(list(missing.values()))
+            fresh = dict(zip(missing.keys(), encoded))
+            self.cache.put_many(fresh)
+            vectors.update(fresh)
+        return [vectors[key] for key in keys]
 
     def name(self):  # ✅ Add this method
         return "local-embedder"
 
 
+# One client per storage path: Chroma does not support several clients on one directory
+_CLIENTS: dict = {}
+
+def _client(path: Optional[Path]):
+    key = str(path) if path else None
+    if key not in _CLIENTS:
+        _CLIENTS[key] = chromadb.PersistentClient(path=key) if key else chromadb.Client()
+    return _CLIENTS[key]
+
+
 
 # Chroma backend implementing the VectorStore interface
 class ChromaMemory(VectorStore):
-    def __init__(self, name: str):
+    """Vector memory backed by a Chroma collection.
+
+    Writes are buffered and upserted in batches of `batch_size`, or once the oldest
+    buffered item is `flush_interval` seconds old. Ids are content hashes, so adding
+    the same text twice is a no-op and no id scan of the collection is needed.
+    Reads flush the buffer first.
+
+    With persist=True (the default) the index lives in agent_data/<name> and is
+    reopened on restart; embeddings go through the shared on-disk EMBEDDING_CACHE.
+    """
+
+    def __init__(self, name: str, batch_size: int = 256, flush_interval: float = 2.0, persist: bool = True):
         self.name = name
-        self.client = chromadb.Client()
         self.path = Path("./agent_data") / name
         self.path.mkdir(parents=True, exist_ok=True)
+        self.client = _client(self.path if persist else None)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: dict[str, str] = {}
+        self._buffered_since: Optional[float] = None
 
         self.embedder = LocalEmbedder()
         self.collection = self.client.get_or_create_collection(name=self.name, embedding_function=self.embedder)
 
-    def add(self, item: str | dict):
+    @staticmethod
+    def _doc_id(text: str) -> str:
+        return f"doc-{hashlib.sha256(text.encode()).hexdigest()[:32]}"
+
+    @staticmethod
+    def _text(item: str | dict) -> str:
         if isinstance(item, dict):
-            text = item.get("content", str(item))
-        else:
-            text = item
-        doc_id = f"doc-{len(self.collection.get()['ids']) + 1}"
-        self.collection.add(documents=[text], ids=[doc_id])
+            return item.get("content", str(item))
+        return item
+
+    def add(self, item: str | dict):
+        text = self._text(item)
+        if not isinstance(text, str) or not text:
+            return
+        if self._buffered_since is None:
+            self._buffered_since = time.monotonic()
+        self._buffer[self._doc_id(text)] = text
+        self._maybe_flush()
+
+    def add_many(self, items: Iterable[str | dict]):
+        """Queue many items; they are embedded and written batch_size at a time."""
+        for item in items:
+            self.add(item)
+
+    def _maybe_flush(self):
+        if len(self._buffer) >= self.batch_size or (
+            self._buffered_since is not None
+            and time.monotonic() - self._buffered_since >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write every buffered item now."""
+        # swap rather than copy-and-clear: searches flush from worker threads while the loop adds
+        buffer, self._buffer = self._buffer, {}
+        self._buffered_since = None
+        items = list(buffer.items())
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            # id lookup, not a scan: skip documents the persisted index already holds
+            existing = set(self.collection.get(ids=[i for i, _ in batch], include=[])["ids"])
+            batch = [(i, t) for i, t in batch if i not in existing]
+            if batch:
+                self.collection.upsert(ids=[i for i, _ in batch], documents=[t for _, t in batch])
 
     def get_messages(self) -> List[dict]:
+        self.flush()
         results = self.collection.get(limit=10)
-        docs = results.get("documents", [[]])[0]
+        docs = results.get("documents") or []
         return [{"role": "assistant", "content": d} for d in docs if isinstance(d, str)]
 
     def search(self, query: str, top_k: int = 3) -> List[str]:
+        self.flush()
         results = self.collection.query(query_texts=[query], n_results=top_k)
         return results.get("documents", [[]])[0]
 
@@ -50,4 +129,8 @@ class ChromaMemory(VectorStore):
         return self.get_messages()
 
     def save(self):
-        pass  # Chroma handles persistence internally
+        # called after every add; only writes once a size/time threshold is hit
+        self._maybe_flush()
+
+    def close(self):
+        self.flush()
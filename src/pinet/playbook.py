@@ -3,7 +3,10 @@ import asyncio
 import logging
 
 from pinet import Supervisor, RestartStrategy, Agent, TaskFlow, Task
-from pinet.knowledge import load_knowledge
+from pinet.knowledge import KNOWLEDGE_CACHE, load_knowledge_sources
+from pinet.mcp import MCP_POOL, LOCAL_TOOL_EXECUTOR, TOOL_CACHE
+from pinet.llms import LLM_REGISTRY
+from pinet.utils import HTTP_CACHE
 from typing import Dict, Any
 
 
@@ -27,6 +30,10 @@ async def run_playbook(path):
     mcp_defs = config.get("mcps", {})
     llm_defs = config.get("llms", {})
     taskflows_defs = config.get("taskflows", {})
+    knowledge_defs = config.get("knowledge", {})
+    local_tool_defs = config.get("local_tools", {})
+    tool_cache_defs = config.get("tool_cache", {})
+    http_cache_defs = config.get("http_cache", {})
 
     # Default supervisor
     supervisors = {
@@ -37,6 +44,33 @@ async def run_playbook(path):
         strategy = STRATEGY_MAP.get(sup.get("strategy", "one_for_one"), RestartStrategy.ONE_FOR_ONE)
         supervisors[name] = Supervisor(name=name, strategy=strategy)
 
+    # Thread/process pools and per-tool timeouts and caps for in-process tools
+    LOCAL_TOOL_EXECUTOR.configure(
+        max_workers=local_tool_defs.get("max_workers"),
+        max_processes=local_tool_defs.get("max_processes"),
+        timeout=local_tool_defs.get("timeout"),
+        policies=local_tool_defs.get("policies"),
+    )
+
+    # Tool results shared across agents; `path` adds the on-disk backend
+    TOOL_CACHE.configure(
+        max_entries=tool_cache_defs.get("max_entries"),
+        path=tool_cache_defs.get("path"),
+        enabled=tool_cache_defs.get("enabled"),
+    )
+
+    # Conditional-request cache for pages fetched by scrapers and knowledge loading
+    HTTP_CACHE.configure(
+        path=http_cache_defs.get("path"),
+        max_bytes=http_cache_defs.get("max_bytes"),
+        enabled=http_cache_defs.get("enabled"),
+    )
+
+    # Start shared MCP servers once, before any agent asks for its tools. The pool
+    # keeps its own supervisor, outside `supervisors`, so no user name can shadow it.
+    await MCP_POOL.prewarm(mcp_defs.values())
+    MCP_POOL.start_health_checks()
+
     agents = {}
     for name, role in roles.items():
         agent_id = role.get("agent", name)
@@ -82,18 +116,49 @@ async def run_playbook(path):
             mcp_config=mcp_config,
             tools=tools,
             team=team_agents,
+            max_concurrency=role.get("max_concurrency", 1),
+            concurrent_asks=role.get("concurrent_asks", False),
+            mailbox_size=role.get("mailbox_size", 0),
+            overflow=role.get("overflow", "block"),
+            parallel_actions=role.get("parallel_actions", False),
+            action_concurrency=role.get("action_concurrency", 4),
+            action_timeout=role.get("action_timeout"),
+            context_tokens=role.get("context_tokens", 3000),
+            summarize=role.get("summarize", True),
+            response_cache=role.get("response_cache"),
+            native_tools=role.get("native_tools", True),
+            max_tool_steps=role.get("max_tool_steps", 5),
         )
         
         agents[agent_id] = (agent, role)
 
-    # Load knowledge
+    # Load knowledge: every distinct source is parsed once, concurrently, into the
+    # on-disk cache (unchanged sources are not read again); agents then take the
+    # chunks from disk a batch at a time
+    batch_size = knowledge_defs.get("batch_size", 256)
+    loaded = await load_knowledge_sources(
+        [item for _, role in agents.values() for item in role.get("knowledge", [])],
+        chunk_size=knowledge_defs.get("chunk_size", 500),
+        overlap=knowledge_defs.get("overlap", 50),
+        workers=knowledge_defs.get("workers", 4),
+        processes=knowledge_defs.get("processes", False),
+    )
     for agent_id, (agent, role) in agents.items():
         for item in role.get("knowledge", []):
+            result = loaded[item]
+            if "error" in result:
+                logging.warning(f"Failed to load knowledge from {item} for {agent.name}: {result['error']}")
+                continue
+            if KNOWLEDGE_CACHE.is_ingested(agent.name, item, result["digest"]):
+                continue  # already in this agent's memory from an earlier run
+            # agents are not started yet, so write to memory directly rather than through the mailbox
             try:
-                content = load_knowledge(item)
-                await agent.remember(f"[Knowledge from {item}]{content}")
+                stored = all(agent.store_knowledge(item, batch) for batch in KNOWLEDGE_CACHE.batches(item, batch_size))
             except Exception as e:
-                logging.warning(f"Failed to load knowledge from {item} for {agent.name}: {e}")
+                logging.warning(f"Failed to store knowledge from {item} for {agent.name}: {e}")
+                continue
+            if stored:
+                KNOWLEDGE_CACHE.mark_ingested(agent.name, item, result["digest"])
 
     # Execute tasks
     async def run_tasks(agent: Agent, role: Dict[str, Any]):
@@ -161,6 +226,7 @@ async def run_playbook(path):
         # Start all supervisors
     for sup in supervisors.values():
         await sup.start_all()
+    await MCP_POOL.supervisor.start_all()
 
     if taskflows:
         all_taskflows = [taskflow.run_all() for taskflow in taskflows.values()]
@@ -181,3 +247,8 @@ async def run_playbook(path):
                 print(f"🧾 {task_id}: {output}")
 
     await asyncio.gather(*[sup.stop_all() for sup in supervisors.values()])
+    await MCP_POOL.close()
+    await LLM_REGISTRY.close()
+    LOCAL_TOOL_EXECUTOR.shutdown()
+    TOOL_CACHE.close()
+    HTTP_CACHE.close()
@@ -2,11 +2,31 @@
 
 import json
 import asyncio
+import itertools
+import logging
+from typing import Any, Dict, Optional
 import websockets
 from .auth import Auth
 
 class RemoteClient:
-    def __init__(self, agent_name: str,  url="ws://localhost:8765", auth: str = "supersecret", reconnect_attempts=3, backoff=1.0,):
+    """Proxy for an agent on a RemoteServer.
+
+    Keeps one authenticated websocket open and multiplexes requests over it by id,
+    so many asks can be in flight at once. The connection is pinged every
+    `ping_interval` seconds and re-established on the next request after it drops.
+    """
+
+    def __init__(
+        self,
+        agent_name: str,
+        url="ws://localhost:8765",
+        auth: str = "supersecret",
+        reconnect_attempts=3,
+        backoff=1.0,
+        ping_interval: Optional[float] = 20.0,
+        timeout: Optional[float] = None,
+        session: Optional[str] = None,
+    ):
         self.agent_name = agent_name
         self.auth = Auth(auth or "supersecret")
         self.url = url
@@ -14,50 +34,95 @@ class RemoteClient:
         self.ws = None
         self.reconnect_attempts = reconnect_attempts
         self.backoff = backoff
+        self.ping_interval = ping_interval
+        self.timeout = timeout
+        # routing key for consistent-hash groups: keeps a conversation on one agent
+        self.session = session
         self._lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
+
+    def _connected(self) -> bool:
+        return self.ws is not None and self._reader is not None and not self._reader.done()
 
     async def _connect(self):
         for attempt in range(self.reconnect_attempts):
             try:
-                ws = await websockets.connect(self.url)
+                ws = await websockets.connect(self.url, ping_interval=self.ping_interval)
+                # tokens expire, so every (re)connect authenticates with a fresh one
+                self.token = self.auth.generate_token(self.agent_name)
                 await ws.send(json.dumps({"auth": self.token, "agent_name": self.agent_name}))
                 return ws
             except Exception as e:
-                print(f"Retrying connection ({attempt+1}/3)...")
-                await asyncio.sleep(1)
-        raise RuntimeError("Failed to connect after 3 retries")
+                print(f"Retrying connection ({attempt+1}/{self.reconnect_attempts})...")
+                await asyncio.sleep(self.backoff * (2 ** attempt))
+        raise RuntimeError(f"Failed to connect after {self.reconnect_attempts} retries")
+
+    async def _ensure_connected(self):
+        async with self._lock:
+            if self._connected():
+                return
+            self.ws = await self._connect()
+            self._reader = asyncio.create_task(self._read_loop(self.ws))
+
+    async def _read_loop(self, ws):
+        try:
+            async for raw in ws:
+                data = json.loads(raw)
+                fut = self._pending.pop(data.get("id"), None)
+                if fut is None:
+                    if "error" in data:
+                        logging.error(f"[RemoteClient] Error: {data['error']}")
+                    continue
+                if fut.done():
+                    continue
+                if "error" in data:
+                    fut.set_exception(RuntimeError(f"[RemoteClient] Error: {data['error']}"))
+                else:
+                    fut.set_result(data.get("result"))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            # requests in flight are not replayed: an ask is not safe to run twice
+            for fut in self._pending.values():
+                if not fut.done():
+                    fut.set_exception(RuntimeError("[RemoteClient] Lost connection during send"))
+            self._pending.clear()
 
     async def _send(self, message: dict):
+        await self._ensure_connected()
+        request_id = next(self._ids)
+        message["id"] = request_id
         message["token"] = self.token
         message["target"] = self.agent_name
+        if self.session is not None:
+            message["session"] = self.session
 
-        async with self._lock:
-            self.ws = await self._connect()
-            try:
-                await self.ws.send(json.dumps(message))
-                if message["kind"] == "ask":
-                    resp = await self.ws.recv()
-                    data = json.loads(resp)
-                    if "error" in data:
-                        raise RuntimeError(f"[RemoteClient] Error: {data['error']}")
-                    return data["result"]
-                elif message["kind"] == "cast":
-                    resp = await self.ws.recv()
-                    data = json.loads(resp)
-                    if "error" in data:
-                        raise RuntimeError(f"[RemoteClient] Error: {data['error']}")
-                    return data["result"]
-                elif message["kind"] == "remember":
-                    resp = await self.ws.recv()
-                    data = json.loads(resp)
-                    if "error" in data:
-                        raise RuntimeError(f"[RemoteClient] Error: {data['error']}")
-                    return data["result"]
-            except websockets.ConnectionClosed:
-                raise RuntimeError("[RemoteClient] Lost connection during send")
-            finally:
-                await self.ws.close()  # ✅ Ensures proper close frame sent
-                self.ws = None
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = fut
+        try:
+            await self.ws.send(json.dumps(message))
+            return await asyncio.wait_for(fut, self.timeout)
+        except websockets.ConnectionClosed:
+            raise RuntimeError("[RemoteClient] Lost connection during send")
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def close(self):
+        if self.ws:
+            await self.ws.close()  # ✅ Ensures proper close frame sent
+        if self._reader:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        self.ws = None
+        self._reader = None
+
+    async def __aenter__(self):
+        await self._ensure_connected()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
 
     async def ask(self, payload):
         return await self._send({
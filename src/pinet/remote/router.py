@@ -6,36 +6,188 @@
 #     "worker2": "ws://192.168.1.11:8765",
 # }
 
+from bisect import bisect
 from collections import defaultdict
+from contextlib import asynccontextmanager
 import asyncio
+import hashlib
+import time
+from typing import Any, Dict, List, Optional
 
 
-class Router:
+def _member_name(agent) -> str:
+    return getattr(agent, "name", None) or getattr(agent, "agent_name", None) or repr(agent)
+
+
+class RoundRobin:
+    """Take turns over the healthy members."""
+
     def __init__(self):
-        self.agents = defaultdict()
-        self.indices = defaultdict(int)
+        self.index = 0
+
+    def select(self, members: List[Any], key: Optional[str], router: "Router"):
+        agent = members[self.index % len(members)]
+        self.index += 1
+        return agent
+
+
+class LeastOutstanding:
+    """Pick the member with the fewest queued plus in-flight requests.
+
+    Local agents report their mailbox depth, in-flight calls and the message
+    being handled through metrics(); the router's own count of requests it sent
+    is used when that is higher, or for anything without metrics (e.g. a
+    RemoteClient to another node).
+    """
+
+    def select(self, members: List[Any], key: Optional[str], router: "Router"):
+        return min(members, key=router.load)
+
+
+class ConsistentHash:
+    """Send every request with the same session key to the same member.
+
+    Keeps conversation memory on one agent; when a member is ejected only its
+    share of keys moves. Requests without a key fall back to round-robin.
+    """
+
+    def __init__(self, replicas: int = 64):
+        self.replicas = replicas
+        self.fallback = RoundRobin()
+        self._ring: List[tuple] = []
+        self._ring_members: tuple = ()
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int(hashlib.md5(value.encode()).hexdigest()[:16], 16)
+
+    def _build(self, members: List[Any]):
+        ids = tuple(id(m) for m in members)
+        if ids == self._ring_members:
+            return
+        ring = []
+        for member in members:
+            for i in range(self.replicas):
+                ring.append((self._hash(f"{_member_name(member)}#{id(member)}#{i}"), member))
+        ring.sort(key=lambda point: point[0])
+        self._ring = ring
+        self._ring_members = ids
+
+    def select(self, members: List[Any], key: Optional[str], router: "Router"):
+        if key is None:
+            return self.fallback.select(members, key, router)
+        self._build(members)
+        hashes = [point[0] for point in self._ring]
+        return self._ring[bisect(hashes, self._hash(key)) % len(self._ring)][1]
+
+
+STRATEGIES = {
+    "round_robin": RoundRobin,
+    "least_outstanding": LeastOutstanding,
+    "consistent_hash": ConsistentHash,
+}
+
+
+class Router:
+    """Maps logical names to one agent or a load-balanced group of agents.
+
+    A member that fails `max_failures` requests in a row is ejected for
+    `ejection_time` seconds. If every member is ejected the whole group is
+    used again rather than failing outright.
+    """
+
+    def __init__(self, max_failures: int = 3, ejection_time: float = 30.0):
+        self.agents = defaultdict(list)
         self.lock = asyncio.Lock()
+        self.strategies: Dict[str, Any] = {}
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self._failures: Dict[int, int] = defaultdict(int)
+        self._ejected_until: Dict[int, float] = {}
+        self._outstanding: Dict[int, int] = defaultdict(int)
 
-    def register(self, logical_name: str, agent):
-        if logical_name in self.agents:
-            raise ValueError(f"Agent '{logical_name}' already registered")
-        self.agents[logical_name] = agent
-        print(f"[Router] Registered agent '{agent.name}' under '{logical_name}'")
-    
-    def resolve_agent(self, agent_name: str) -> str:
-        return self.agents.get(agent_name)
-    
-    def unregister(self, logical_name: str):
-        self.agents.pop(logical_name)
+    def register(self, logical_name: str, agent, strategy: Any = None):
+        """Add agent to the group behind logical_name (created on first use)."""
+        if any(member is agent for member in self.agents[logical_name]):
+            raise ValueError(f"Agent '{_member_name(agent)}' already registered under '{logical_name}'")
+        self.agents[logical_name].append(agent)
+        if strategy is not None or logical_name not in self.strategies:
+            self.set_strategy(logical_name, strategy or "round_robin")
+        print(f"[Router] Registered agent '{_member_name(agent)}' under '{logical_name}'")
+
+    def set_strategy(self, logical_name: str, strategy: Any):
+        """strategy: a name from STRATEGIES or any object with select(members, key, router)."""
+        if isinstance(strategy, str):
+            if strategy not in STRATEGIES:
+                raise ValueError(f"Unknown routing strategy '{strategy}'")
+            strategy = STRATEGIES[strategy]()
+        self.strategies[logical_name] = strategy
+
+    def resolve_agent(self, agent_name: str, key: Optional[str] = None):
+        members = self.agents.get(agent_name)
+        if not members:
+            return None
+        if len(members) == 1:
+            return members[0]
+        healthy = [m for m in members if self.is_healthy(m)] or members
+        return self.strategies[agent_name].select(healthy, key, self)
+
+    def unregister(self, logical_name: str, agent=None):
+        """Remove one agent from the group, or the whole group if agent is None."""
+        if agent is None:
+            self.agents.pop(logical_name)
+            self.strategies.pop(logical_name, None)
+        else:
+            self.agents[logical_name] = [m for m in self.agents[logical_name] if m is not agent]
+            if not self.agents[logical_name]:
+                self.unregister(logical_name)
         print(f"[Router] Unregistered agent '{logical_name}'")
 
-    # async def get_next(self, logical_name: str):
-    #     async with self.lock:
-    #         group = self.agents.get(logical_name , [])
-    #         if not group:
-    #             return None
-    #         index = self.indices[logical_name] % len(group)
-    #         self.indices[logical_name] += 1
-    #         return group[index]
-        
-        
\ No newline at end of file
+    def load(self, agent) -> int:
+        outstanding = self._outstanding[id(agent)]
+        if hasattr(agent, "metrics"):
+            try:
+                metrics = agent.metrics()
+                reported = metrics.get("depth", 0) + metrics.get("inflight", 0) + metrics.get("busy", 0)
+                return max(outstanding, reported)
+            except Exception:
+                pass
+        return outstanding
+
+    def is_healthy(self, agent) -> bool:
+        until = self._ejected_until.get(id(agent))
+        if until is None:
+            return True
+        if time.monotonic() >= until:
+            # ejection expired: let it take traffic again
+            del self._ejected_until[id(agent)]
+            self._failures[id(agent)] = 0
+            return True
+        return False
+
+    def report_success(self, agent):
+        self._failures[id(agent)] = 0
+
+    def report_failure(self, agent):
+        self._failures[id(agent)] += 1
+        if self._failures[id(agent)] >= self.max_failures:
+            self._ejected_until[id(agent)] = time.monotonic() + self.ejection_time
+            print(f"[Router] Ejected agent '{_member_name(agent)}' for {self.ejection_time}s")
+
+    @asynccontextmanager
+    async def lease(self, logical_name: str, key: Optional[str] = None):
+        """Select an agent for one request and record its outcome."""
+        agent = self.resolve_agent(logical_name, key)
+        if agent is None:
+            yield None
+            return
+        self._outstanding[id(agent)] += 1
+        try:
+            yield agent
+        except Exception:
+            self.report_failure(agent)
+            raise
+        else:
+            self.report_success(agent)
+        finally:
+            self._outstanding[id(agent)] -= 1
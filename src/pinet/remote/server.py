@@ -15,67 +15,112 @@ class RemoteServer:
     def __init__(self,  
                  host="localhost", 
                  port=8765, 
-                 auth: Optional[str] = None):
+                 auth: Optional[str] = None,
+                 max_inflight: int = 64):
         self.host = host
+        self.max_inflight = max_inflight
         self.port = port
         self.auth = Auth(auth or "supersecret")
         self.tokens = {}
         self.router = Router()
         
     async def ws_handler(self, websocket):
-        try:
-            auth_msg = await websocket.recv()
-            auth_data = json.loads(auth_msg)
-            if not self.auth.verify_token(auth_data.get("auth"), auth_data.get("agent_name")):
-                await websocket.send(json.dumps({"error": "Unauthorized"}))
-                await websocket.close()
-                return
+        tasks = set()
+        send_lock = asyncio.Lock()
+        slots = asyncio.Semaphore(self.max_inflight)
 
-            async for message in websocket:
-                try:
-                    data = json.loads(message)
-                    kind = data["kind"]
-                    method = data["method"]
-                    payload = data["payload"]
-                    target = data.get("target", "default")
+        async def reply(data: dict, request_id=None):
+            if request_id is not None:
+                data["id"] = request_id
+            async with send_lock:
+                await websocket.send(json.dumps(data))
+
+        async def process(data: dict):
+            request_id = data.get("id")
+            try:
+                kind = data["kind"]
+                method = data["method"]
+                payload = data["payload"]
+                target = data.get("target", "default")
 
-                    agent = self.router.resolve_agent(target)
+                # only the agent's own errors count against it: the reply is sent after
+                # the lease, so a client that disconnected cannot get a healthy agent ejected
+                async with self.router.lease(target, data.get("session")) as agent:
                     if not agent:
-                        await websocket.send(json.dumps({"error": f"Agent '{target}' not found"}))
-                        continue
-                    if kind == "ask":
+                        response = {"error": f"Agent '{target}' not found"}
+                    elif kind == "ask":
                         logging.info(f" Asking  {target}")
-                        result = await agent.ask(payload)
-                        await websocket.send(json.dumps({"result": result}))
+                        response = {"result": await agent.ask(payload)}
                     elif kind == "cast":
                         logging.info(f" Casting {method} to {target}")
                         await agent.cast(method, payload)
-                        await websocket.send(json.dumps({"result": "ok"}))
+                        response = {"result": "ok"}
                     elif kind == "remember":
                         logging.info(f" Remembering {payload} to {target}")
                         await agent.remember(payload)
-                        await websocket.send(json.dumps({"result": "ok"}))
+                        response = {"result": "ok"}
+                    else:
+                        response = {"error": f"Unknown kind '{kind}'"}
+                await reply(response, request_id)
+
+            except websockets.ConnectionClosed:
+                pass
+            except Exception as e:
+                logging.error(f"⚠️ Error processing message: {e}")
+                try:
+                    await reply({"error": str(e)}, request_id)
+                except websockets.ConnectionClosed:
+                    pass
+            finally:
+                slots.release()
+
+        try:
+            auth_msg = await websocket.recv()
+            auth_data = json.loads(auth_msg)
+            if not self.auth.verify_token(auth_data.get("auth"), auth_data.get("agent_name")):
+                await websocket.send(json.dumps({"error": "Unauthorized"}))
+                await websocket.close()
+                return
 
-                except Exception as e:
-                    logging.error(f"⚠️ Error processing message: {e}")
-                    await websocket.send(json.dumps({"error": str(e)}))
+            # each message is handled in its own task so a slow ask does not
+            # hold up the rest of the connection; replies carry the request id
+            async for message in websocket:
+                try:
+                    data = json.loads(message)
+                except json.JSONDecodeError as e:
+                    await reply({"error": f"Invalid JSON: {e}"})
+                    continue
+                await slots.acquire()
+                task = asyncio.create_task(process(data))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
 
         except websockets.ConnectionClosed as e:
             logging.info(f"🔌 Connection closed: {e.code} - {e.reason}")
         except Exception as e:
             print(f"🔥 Unexpected error: {e}")
+        finally:
+            for task in tasks:
+                task.cancel()
 
 
-    async def start(self, agents: List[Agent]):
+    async def start(self, agents: List[Agent], groups: Optional[Dict[str, List[Agent]]] = None):
         """Start the server and register agents
         
         Args:
             agents (List[Agent]): List of agents to register 
+            groups (Dict[str, List[Agent]]): Logical names served by a load-balanced
+                group of agents; pick the strategy with router.set_strategy
         """
         for agent in agents:
             await agent.start()
             self.tokens[agent.name] = self.auth.generate_token(agent.name)
             self.router.register(agent.name, agent)
+        for logical_name, members in (groups or {}).items():
+            self.tokens[logical_name] = self.auth.generate_token(logical_name)
+            for agent in members:
+                await agent.start()
+                self.router.register(logical_name, agent)
         async with websockets.serve(self.ws_handler, self.host, self.port):
             print(f"🌐 Listening on ws://{self.host}:{self.port}")
             await asyncio.Future()  # run forever
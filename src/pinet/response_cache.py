@@ -0,0 +1,124 @@
+# pinet/response_cache.py
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def context_scope(system_prompt_hash: Optional[str], messages: List[dict]) -> str:
+    """Hash of everything the LLM sees besides the prompt itself."""
+    payload = json.dumps([system_prompt_hash, messages], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Per-agent cache of LLM replies for repeated prompts.
+
+    Entries are scoped by a hash of the system prompt and the context messages,
+    so a reply is only reused when the model would have seen the same
+    conversation. Within a scope a prompt hits exactly, after whitespace and case
+    normalization. Entries expire after `ttl` seconds and the least recently used
+    are evicted beyond `max_entries`.
+
+    Setting `similarity` (e.g. 0.95) also matches near-duplicate prompts by cosine
+    similarity of their embeddings from the shared EmbeddingService. This is
+    opt-in because embeddings barely separate prompts that differ in one number
+    or name: "What is 2+3?" would get the cached answer to "What is 2+4?".
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: Optional[float] = 3600.0, similarity: Optional[float] = None, embedder=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._embedder = embedder
+        # (scope, normalized prompt) -> (response, expires_at, unit vector or None)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, float, Any]]" = OrderedDict()
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "stores": 0, "bypassed": 0, "evictions": 0, "expired": 0}
+
+    @staticmethod
+    def _normalize(prompt: str) -> str:
+        return " ".join(prompt.lower().split())
+
+    def _get_embedder(self):
+        if self._embedder is None and self.similarity is not None:
+            try:
+                from pinet.memory.embedding_service import EMBEDDING_SERVICE
+                self._embedder = EMBEDDING_SERVICE
+            except Exception as e:
+                logging.warning(f"[ResponseCache] Semantic lookup disabled: {e}")
+                self.similarity = None
+        return self._embedder
+
+    async def _embed(self, text: str):
+        embedder = self._get_embedder()
+        if embedder is None:
+            return None
+        try:
+            vector = np.asarray((await embedder.aencode([text]))[0], dtype=np.float32)
+        except Exception as e:
+            logging.warning(f"[ResponseCache] Semantic lookup disabled: {e}")
+            self.similarity = None
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _expired(self, key, entry, now: float) -> bool:
+        if entry[1] and entry[1] <= now:
+            del self._entries[key]
+            self.stats["expired"] += 1
+            return True
+        return False
+
+    async def get(self, scope: str, prompt: str) -> Optional[str]:
+        now = time.monotonic()
+        key = (scope, self._normalize(prompt))
+        entry = self._entries.get(key)
+        if entry is not None and not self._expired(key, entry, now):
+            self._entries.move_to_end(key)
+            self.stats["exact_hits"] += 1
+            return entry[0]
+
+        if self.similarity is not None:
+            candidates = [(k, e) for k, e in self._entries.items() if k[0] == scope and e[2] is not None]
+            if candidates:
+                vector = await self._embed(key[1])
+                if vector is not None:
+                    scores = np.stack([e[2] for _, e in candidates]) @ vector
+                    best = int(np.argmax(scores))
+                    best_key, best_entry = candidates[best]
+                    if scores[best] >= self.similarity and best_key in self._entries and not self._expired(best_key, best_entry, now):
+                        self._entries.move_to_end(best_key)
+                        self.stats["semantic_hits"] += 1
+                        return best_entry[0]
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, scope: str, prompt: str, response: str):
+        key = (scope, self._normalize(prompt))
+        vector = await self._embed(key[1]) if self.similarity is not None else None
+        expires = time.monotonic() + self.ttl if self.ttl else 0.0
+        self._entries[key] = (response, expires, vector)
+        self._entries.move_to_end(key)
+        self.stats["stores"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def bypass(self):
+        """Count a reply that was not cached because it ran tools or delegated."""
+        self.stats["bypassed"] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        lookups = stats["exact_hits"] + stats["semantic_hits"] + stats["misses"]
+        stats["size"] = len(self._entries)
+        stats["hit_rate"] = (stats["exact_hits"] + stats["semantic_hits"]) / lookups if lookups else 0.0
+        return stats
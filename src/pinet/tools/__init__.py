@@ -177,6 +177,51 @@ TOOL_MAPPINGS = {
     'cot_tools': ('.train.data.generatecot', None),                           # Full toolkit access
 }
 
+# How local tools are run (see pinet.mcp.executor.ToolExecutor):
+# `timeout` in seconds, `concurrency` caps simultaneous calls across all agents,
+# and `cpu` tools go to the process pool when one is configured.
+# `ttl` is how long a result may be reused for identical arguments
+# (see pinet.mcp.cache.ToolCache); tools without one are never cached.
+TOOL_POLICIES = {
+    # Network-bound
+    'internet_search': {'timeout': 30, 'ttl': 900},
+    'duckduckgo': {'timeout': 30, 'ttl': 900},
+    'searxng_search': {'timeout': 30, 'ttl': 900},
+    'searxng': {'ttl': 900},
+    'search_arxiv': {'timeout': 60, 'ttl': 3600},
+    'get_arxiv_paper': {'ttl': 86400},
+    'get_papers_by_author': {'ttl': 3600},
+    'get_papers_by_category': {'ttl': 3600},
+    'wiki_search': {'timeout': 30, 'ttl': 3600},
+    'wiki_summary': {'timeout': 30, 'ttl': 86400},
+    'wiki_page': {'timeout': 60, 'ttl': 86400},
+    'get_article': {'timeout': 60, 'ttl': 3600},
+    'get_news_sources': {'ttl': 86400},
+    'get_articles_from_source': {'timeout': 180, 'concurrency': 2, 'ttl': 900},
+    'get_trending_topics': {'timeout': 60, 'ttl': 900},
+    'scrape_page': {'timeout': 60, 'ttl': 600},
+    'extract_links': {'timeout': 60, 'ttl': 600},
+    'extract_text': {'timeout': 60, 'ttl': 600},
+    'crawl': {'timeout': 600, 'concurrency': 2},
+    'get_stock_price': {'timeout': 30, 'ttl': 60},
+    'get_stock_info': {'ttl': 3600},
+    'get_historical_data': {'timeout': 60, 'ttl': 3600},
+
+    # Local processes and code
+    'execute_command': {'timeout': 120, 'concurrency': 4},
+    'execute_code': {'timeout': 60, 'concurrency': 4},
+
+    # CPU-heavy
+    'solve_equation': {'timeout': 60, 'cpu': True, 'ttl': 86400},
+    'convert_units': {'ttl': 86400},
+    'calculate_statistics': {'cpu': True},
+    'calculate_financial': {'cpu': True},
+    'filter_data': {'cpu': True},
+    'group_by': {'cpu': True},
+    'pivot_table': {'cpu': True},
+    'get_summary': {'cpu': True},
+}
+
 _instances = {}  # Cache for class instances
 
 user_tools = load_user_tools()
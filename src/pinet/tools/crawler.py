@@ -0,0 +1,284 @@
+"""Asynchronous crawl engine behind SpiderTools.crawl.
+
+Usage:
+from pinet.tools.crawler import AsyncCrawler
+async for page in AsyncCrawler(concurrency=20).crawl("https://example.com", max_pages=100):
+    print(page["url"], page["title"])
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; PraisonAI/1.0; +http://praisonai.com/bot)',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+# robots.txt per origin, shared by every crawl in the process: {origin: (parser or None, fetched_at)}
+ROBOTS_CACHE: Dict[str, Tuple[Optional[RobotFileParser], float]] = {}
+ROBOTS_TTL = 3600.0
+
+
+def normalize_url(url: str) -> str:
+    """URL without fragment, default port or case differences in scheme and host."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+class Frontier:
+    """URLs waiting to be fetched, deduplicated by a short hash of the normalized URL."""
+
+    def __init__(self):
+        self._queue: deque = deque()
+        self._seen: set = set()
+
+    @staticmethod
+    def _digest(url: str) -> bytes:
+        return hashlib.blake2b(url.encode(), digest_size=8).digest()
+
+    def add(self, url: str) -> bool:
+        url = normalize_url(url)
+        digest = self._digest(url)
+        if digest in self._seen:
+            return False
+        self._seen.add(digest)
+        self._queue.append(url)
+        return True
+
+    def mark(self, url: str):
+        """Record a URL (e.g. a redirect target) as seen without queueing it."""
+        self._seen.add(self._digest(normalize_url(url)))
+
+    def pop(self) -> str:
+        return self._queue.popleft()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+def parse_page(url: str, html: str) -> Dict[str, Any]:
+    """Title, text, meta tags and links of a page in a single lxml pass."""
+    import lxml.html
+
+    document = lxml.html.document_fromstring(html)
+    for element in document.xpath('//script|//style'):
+        element.drop_tree()
+    title = document.findtext('.//title')
+    meta_tags = {}
+    for meta in document.iter('meta'):
+        name = meta.get('name') or meta.get('property')
+        if name:
+            meta_tags[name] = meta.get('content')
+    links = []
+    for anchor in document.iter('a'):
+        href = anchor.get('href')
+        if href:
+            links.append({
+                'url': urljoin(url, href),
+                'text': anchor.text_content().strip(),
+                'title': anchor.get('title', ''),
+            })
+    return {
+        'title': title.strip() if title else None,
+        'content': ' '.join(document.text_content().split()),
+        'meta_tags': meta_tags,
+        'links': links,
+    }
+
+
+class _Host:
+    """Politeness state for one host: a concurrency cap and a minimum gap between requests."""
+
+    def __init__(self, per_host: int, delay: float):
+        self.slots = asyncio.Semaphore(per_host)
+        self.delay = delay
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait_turn(self):
+        async with self.lock:
+            wait = self.next_start - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.next_start = time.monotonic() + self.delay
+
+
+class AsyncCrawler:
+    """Breadth-first crawler with bounded concurrency and per-host politeness.
+
+    Up to `concurrency` requests run at once over one pooled HTTP client, with
+    at most `per_host` of them against the same host, started at least `delay`
+    seconds apart (or the host's robots.txt Crawl-delay, if larger). With
+    `respect_robots`, disallowed URLs are skipped; robots.txt files are cached
+    for the process. Pages are yielded as soon as they are fetched and parsed.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 10,
+        per_host: int = 4,
+        delay: float = 1.0,
+        timeout: float = 30,
+        verify_ssl: bool = True,
+        respect_robots: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self.delay = delay
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.respect_robots = respect_robots
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self._hosts: Dict[str, _Host] = {}
+        self._robots_locks: Dict[str, asyncio.Lock] = {}
+
+    def _host(self, url: str, delay: float) -> _Host:
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = _Host(self.per_host, max(self.delay, delay))
+        return self._hosts[host]
+
+    async def _robots(self, client: httpx.AsyncClient, url: str) -> Optional[RobotFileParser]:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        # one fetch per origin even when many workers reach a new host at once
+        async with self._robots_locks.setdefault(origin, asyncio.Lock()):
+            cached = ROBOTS_CACHE.get(origin)
+            if cached and time.time() - cached[1] < ROBOTS_TTL:
+                return cached[0]
+            parser = None
+            try:
+                response = await client.get(origin + "/robots.txt")
+                if response.status_code == 200:
+                    parser = RobotFileParser()
+                    parser.parse(response.text.splitlines())
+            except httpx.HTTPError as e:
+                logging.warning(f"Could not fetch robots.txt for {origin}: {e}")
+            ROBOTS_CACHE[origin] = (parser, time.time())
+            return parser
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> Optional[Dict[str, Any]]:
+        crawl_delay = 0.0
+        if self.respect_robots:
+            robots = await self._robots(client, url)
+            if robots is not None:
+                if not robots.can_fetch(self.headers['User-Agent'], url):
+                    logging.info(f"Skipping {url}: disallowed by robots.txt")
+                    return None
+                crawl_delay = float(robots.crawl_delay(self.headers['User-Agent']) or 0)
+        host = self._host(url, crawl_delay)
+        async with host.slots:
+            await host.wait_turn()
+            response = await client.get(url)
+        response.raise_for_status()
+        if 'html' not in response.headers.get('content-type', 'text/html'):
+            return None
+        final_url = str(response.url)
+        page = await asyncio.to_thread(parse_page, final_url, response.text)
+        return {
+            'url': final_url,
+            'status_code': response.status_code,
+            'encoding': response.encoding,
+            'headers': dict(response.headers),
+            'title': page['title'],
+            'content': page['content'],
+            'html': response.text,
+            'meta_tags': page['meta_tags'],
+            'links': page['links'],
+        }
+
+    async def crawl(
+        self,
+        start_url: str,
+        max_pages: int = 10,
+        same_domain: bool = True,
+        exclude_patterns: Optional[List[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield crawled pages, fetching at most max_pages URLs."""
+        patterns = [re.compile(p) for p in exclude_patterns or []]
+        start_host = urlsplit(start_url).netloc.lower()
+        frontier = Frontier()
+        frontier.add(start_url)
+        results: asyncio.Queue = asyncio.Queue()
+        started = 0
+        active = 0
+        wake = asyncio.Event()
+
+        def wanted(url: str) -> bool:
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https"):
+                return False
+            if same_domain and parts.netloc.lower() != start_host:
+                return False
+            return not any(p.search(url) for p in patterns)
+
+        async def visit(client: httpx.AsyncClient, url: str):
+            nonlocal active
+            try:
+                page = await self._fetch(client, url)
+                if page is not None:
+                    frontier.mark(page['url'])
+                    for link in page['links']:
+                        if wanted(link['url']):
+                            frontier.add(link['url'])
+                    await results.put(page)
+            except Exception as e:
+                logging.warning(f"Error crawling {url}: {e}")
+            finally:
+                active -= 1
+                wake.set()
+
+        async def schedule(client: httpx.AsyncClient):
+            nonlocal started, active
+            tasks = set()
+            try:
+                while True:
+                    while frontier and active < self.concurrency and started < max_pages:
+                        url = frontier.pop()
+                        started += 1
+                        active += 1
+                        task = asyncio.create_task(visit(client, url))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    if active == 0 and (not frontier or started >= max_pages):
+                        break
+                    wake.clear()
+                    await wake.wait()
+                await results.put(None)
+            finally:
+                # the consumer stopped early: drop the requests still in flight
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            verify=self.verify_ssl,
+            follow_redirects=True,
+            limits=limits,
+        ) as client:
+            scheduler = asyncio.create_task(schedule(client))
+            try:
+                while (page := await results.get()) is not None:
+                    yield page
+            finally:
+                scheduler.cancel()
+                await asyncio.gather(scheduler, return_exceptions=True)
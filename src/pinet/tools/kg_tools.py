@@ -1,9 +1,9 @@
 """Knowledge Graph Tool wrapper for use in Pinet tools registry"""
 
-from pinet.memory.knowledge_graph import KnowledgeGraphMemory
+from pinet.memory.knowledge_graph import KG_INSTANCE
 
-# Shared knowledge graph instance
-kg_tools = KnowledgeGraphMemory("shared_kg")
+# Shared knowledge graph instance (persisted in agent_data/shared_kg)
+kg_tools = KG_INSTANCE
 
 def add_fact(payload):
     triplet = payload.get("triplet")
@@ -19,7 +19,7 @@ def query_kg(payload):
     return kg_tools.query(subject, predicate, obj)
 
 def reset_kg(_: dict = None):
-    kg_tools.graph.clear()
+    kg_tools.clear()
     return {"status": "cleared"}
 
 def get_all_facts(_: dict = None):
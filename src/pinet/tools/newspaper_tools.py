@@ -17,6 +17,8 @@ from importlib import util
 import json
 from urllib.parse import urlparse
 
+from pinet.utils.http_cache import HTTP_CACHE
+
 # Predefined list of popular news sources
 POPULAR_NEWS_SOURCES = {
     'technology': [
@@ -100,9 +102,15 @@ class NewspaperTools:
             config.browser_user_agent = 'Mozilla/5.0'
             config.language = language
             
-            # Download and parse article
+            # Download through the shared HTTP cache, then parse
             article = Article(url, config=config)
-            article.download()
+            response = HTTP_CACHE.get(
+                url,
+                headers={'User-Agent': config.browser_user_agent},
+                timeout=config.request_timeout,
+            )
+            response.raise_for_status()
+            article.download(input_html=response.text)
             article.parse()
             
             # Try to extract additional information
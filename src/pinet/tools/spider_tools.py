@@ -11,14 +11,28 @@ content = scrape_page("https://example.com")
 """
 
 import logging
-from typing import List, Dict, Union, Optional, Any
+from typing import AsyncIterator, List, Dict, Union, Optional, Any
 from importlib import util
+import asyncio
+import concurrent.futures
 import json
 from urllib.parse import urljoin, urlparse
 import re
 import os
 import hashlib
-import time
+
+from pinet.utils.http_cache import HTTP_CACHE
+
+
+def _run(coro):
+    """Run a coroutine to completion from sync code, even when called inside an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # this thread already runs a loop: use a fresh one on another thread
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
 
 class SpiderTools:
     """Tools for web scraping and crawling."""
@@ -81,9 +95,10 @@ class SpiderTools:
                 return {"error": error_msg}
             from bs4 import BeautifulSoup
 
-            # Make request
-            response = session.get(
+            # Make request (revalidated against the shared HTTP cache when stored)
+            response = HTTP_CACHE.get(
                 url,
+                session=session,
                 timeout=timeout,
                 verify=verify_ssl
             )
@@ -235,7 +250,10 @@ class SpiderTools:
         delay: float = 1.0,
         timeout: int = 30,
         verify_ssl: bool = True,
-        output_dir: Optional[str] = None
+        output_dir: Optional[str] = None,
+        concurrency: int = 10,
+        per_host: int = 4,
+        respect_robots: bool = False
     ) -> Union[List[Dict[str, Any]], Dict[str, str]]:
         """
         Crawl multiple pages starting from a URL.
@@ -245,86 +263,75 @@ class SpiderTools:
             max_pages: Maximum number of pages to crawl
             same_domain: Only crawl pages from the same domain
             exclude_patterns: List of regex patterns to exclude
-            delay: Delay between requests in seconds
+            delay: Minimum delay between requests to the same host in seconds
             timeout: Request timeout in seconds
             verify_ssl: Whether to verify SSL certificates
             output_dir: Directory to save crawled pages
+            concurrency: Maximum number of requests in flight
+            per_host: Maximum number of requests in flight to one host
+            respect_robots: Skip URLs disallowed by robots.txt and honour its Crawl-delay
             
         Returns:
             List[Dict] or Dict: Crawled pages or error dict
         """
+        async def collect():
+            pages = []
+            async for page in self.crawl_stream(
+                start_url, max_pages=max_pages, same_domain=same_domain,
+                exclude_patterns=exclude_patterns, delay=delay, timeout=timeout,
+                verify_ssl=verify_ssl, output_dir=output_dir, concurrency=concurrency,
+                per_host=per_host, respect_robots=respect_robots,
+            ):
+                pages.append(page)
+            return pages
+
         try:
-            # Create output directory if needed
-            if output_dir:
-                os.makedirs(output_dir, exist_ok=True)
-            
-            # Initialize crawl state
-            to_visit = {start_url}
-            visited = set()
-            results = []
-            
-            while to_visit and len(visited) < max_pages:
-                # Get next URL
-                url = to_visit.pop()
-                
-                # Skip if already visited
-                if url in visited:
-                    continue
-                
-                # Add to visited
-                visited.add(url)
-                
-                # Delay if not first request
-                if len(visited) > 1:
-                    time.sleep(delay)
-                
-                # Scrape page
-                result = self.scrape_page(
-                    url,
-                    extract_links=True,
-                    timeout=timeout,
-                    verify_ssl=verify_ssl
-                )
-                
-                if "error" in result:
-                    logging.warning(f"Error crawling {url}: {result['error']}")
-                    continue
-                
-                # Save result
-                results.append(result)
-                
-                # Save to file if requested
-                if output_dir:
-                    filename = hashlib.md5(url.encode()).hexdigest() + '.json'
-                    filepath = os.path.join(output_dir, filename)
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        json.dump(result, f, indent=2, ensure_ascii=False)
-                
-                # Add new links to visit
-                for link in result.get('links', []):
-                    link_url = link['url']
-                    parsed = urlparse(link_url)
-                    
-                    # Skip if not same domain and same_domain is True
-                    if same_domain and parsed.netloc != urlparse(start_url).netloc:
-                        continue
-                    
-                    # Skip if matches exclude patterns
-                    if exclude_patterns and any(
-                        re.compile(p).search(link_url) for p in exclude_patterns
-                    ):
-                        continue
-                    
-                    # Add to visit if not visited
-                    if link_url not in visited:
-                        to_visit.add(link_url)
-            
-            return results
+            return _run(collect())
         except Exception as e:
             error_msg = f"Error crawling from {start_url}: {str(e)}"
             logging.error(error_msg)
             return {"error": error_msg}
 
+    async def crawl_stream(
+        self,
+        start_url: str,
+        max_pages: int = 10,
+        same_domain: bool = True,
+        exclude_patterns: Optional[List[str]] = None,
+        delay: float = 1.0,
+        timeout: int = 30,
+        verify_ssl: bool = True,
+        output_dir: Optional[str] = None,
+        concurrency: int = 10,
+        per_host: int = 4,
+        respect_robots: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Like crawl, but yields each page as soon as it has been fetched and parsed.
+        """
+        if util.find_spec('lxml') is None:
+            raise ImportError("lxml package is not available. Please install it using: pip install lxml")
+        from .crawler import AsyncCrawler
+
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        crawler = AsyncCrawler(
+            concurrency=concurrency,
+            per_host=per_host,
+            delay=delay,
+            timeout=timeout,
+            verify_ssl=verify_ssl,
+            respect_robots=respect_robots,
+        )
+        async for page in crawler.crawl(start_url, max_pages, same_domain, exclude_patterns):
+            # Save to file if requested
+            if output_dir:
+                filename = hashlib.md5(page['url'].encode()).hexdigest() + '.json'
+                filepath = os.path.join(output_dir, filename)
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(page, f, indent=2, ensure_ascii=False)
+            yield page
+
     def extract_text(
         self,
         url: str,
@@ -368,6 +375,7 @@ _spider_tools = SpiderTools()
 scrape_page = _spider_tools.scrape_page
 extract_links = _spider_tools.extract_links
 crawl = _spider_tools.crawl
+crawl_stream = _spider_tools.crawl_stream
 extract_text = _spider_tools.extract_text
 
 if __name__ == "__main__":
@@ -417,7 +425,7 @@ if __name__ == "__main__":
     # 4. Crawl multiple pages
     print("4. Crawling Multiple Pages")
     print("------------------------------")
-    results = crawl(url, max_pages=2, delay=1.0)
+    results = crawl(url, max_pages=2)
     print(f"Crawl results from {url}:")
     if isinstance(results, list):
         print(f"Crawled {len(results)} pages")
@@ -1,3 +1,5 @@
 from .user_tools import load_user_tools
+from .tokens import estimate_tokens
+from .http_cache import HTTPCache, HTTP_CACHE
 
-__all__ = ["load_user_tools"]
+__all__ = ["load_user_tools", "estimate_tokens", "HTTPCache", "HTTP_CACHE"]
@@ -0,0 +1,267 @@
+# pinet/utils/http_cache.py
+import email.utils
+import hashlib
+import io
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# statuses stored; anything else always goes to the network
+CACHEABLE_STATUS = {200, 203}
+# heuristic freshness from Last-Modified is capped at a day (RFC 9111 §4.2.2)
+MAX_HEURISTIC = 86400.0
+
+_DIRECTIVE = re.compile(r'([\w-]+)\s*(?:=\s*"?([^",]*)"?)?')
+
+
+def _directives(value: Optional[str]) -> Dict[str, Optional[str]]:
+    return {m.group(1).lower(): m.group(2) for m in _DIRECTIVE.finditer(value or "")}
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness_lifetime(headers) -> float:
+    """Seconds a response stays fresh, from Cache-Control, Expires or Last-Modified."""
+    control = _directives(headers.get("Cache-Control"))
+    if "no-cache" in control:
+        return 0.0
+    if control.get("max-age") is not None:
+        try:
+            return max(0.0, float(control["max-age"]))
+        except ValueError:
+            return 0.0
+    date = _http_date(headers.get("Date")) or time.time()
+    if "Expires" in headers:
+        expires = _http_date(headers.get("Expires"))
+        return max(0.0, expires - date) if expires else 0.0
+    last_modified = _http_date(headers.get("Last-Modified"))
+    if last_modified:
+        return min(MAX_HEURISTIC, max(0.0, (date - last_modified) / 10))
+    return 0.0
+
+
+def _age(headers) -> float:
+    try:
+        return max(0.0, float(headers.get("Age", 0)))
+    except ValueError:
+        return 0.0
+
+
+class HTTPCache:
+    """On-disk private HTTP cache for GET requests, shared by scrapers and loaders.
+
+    A fresh entry (per Cache-Control max-age, Expires, or a heuristic from
+    Last-Modified) is served without touching the network. A stale one is
+    revalidated with If-None-Match / If-Modified-Since, and a 304 reuses the
+    stored body. Bodies are zlib-compressed in a SQLite file, and the least
+    recently used entries are evicted once the total exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: Path = Path("./agent_data") / "http_cache.sqlite", max_bytes: int = 256 * 1024 * 1024, enabled: bool = True):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._size = 0
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stores": 0, "evictions": 0, "bytes_saved": 0}
+
+    def configure(self, path: Optional[Path] = None, max_bytes: Optional[int] = None, enabled: Optional[bool] = None):
+        if path is not None and Path(path) != self.path:
+            self.close()
+            self.path = Path(path)
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if enabled is not None:
+            self.enabled = enabled
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, url TEXT, meta TEXT, body BLOB, size INTEGER, stored REAL, accessed REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        return self._conn
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _load(self, key: str):
+        with self._lock:
+            row = self._db.execute("SELECT meta, body, stored FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def _save(self, key: str, url: str, meta: dict, body: bytes, stored: float):
+        with self._lock:
+            db = self._db
+            old = db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, json.dumps(meta), body, len(body), stored, time.time()),
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            while self._size > self.max_bytes:
+                oldest = db.execute("SELECT key, size FROM responses ORDER BY accessed LIMIT 1").fetchone()
+                if oldest is None or oldest[0] == key:
+                    break
+                db.execute("DELETE FROM responses WHERE key = ?", (oldest[0],))
+                self._size -= oldest[1]
+                self.stats["evictions"] += 1
+            db.commit()
+
+    def _touch(self, key: str, meta: Optional[dict] = None, stored: Optional[float] = None):
+        with self._lock:
+            if meta is None:
+                self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+            else:
+                self._db.execute(
+                    "UPDATE responses SET meta = ?, stored = ?, accessed = ? WHERE key = ?",
+                    (json.dumps(meta), stored, time.time(), key),
+                )
+            self._db.commit()
+
+    @staticmethod
+    def _response(url: str, meta: dict, content: bytes, from_cache: bool) -> requests.Response:
+        response = requests.Response()
+        response.url = meta.get("url", url)
+        response.status_code = meta["status"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = meta.get("encoding")
+        response._content = content
+        # behave like a fully read response: iter_content()/iter_lines() replay the body
+        response._content_consumed = True
+        response.raw = io.BytesIO(content)
+        response.from_cache = from_cache
+        return response
+
+    def _vary_matches(self, meta: dict, headers: Dict[str, str]) -> bool:
+        request = CaseInsensitiveDict(headers)
+        return all(request.get(name) == value for name, value in meta.get("vary", {}).items())
+
+    def get(
+        self,
+        url: str,
+        session: Optional[requests.Session] = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """GET url through the cache; kwargs (timeout, verify, ...) go to requests.
+
+        The returned response has `from_cache` set when no body was downloaded.
+        """
+        http = session or requests
+        headers = dict(headers or {})
+        if not self.enabled:
+            response = http.get(url, headers=headers, **kwargs)
+            response.from_cache = False
+            return response
+        request_headers = CaseInsensitiveDict({**(session.headers if session else {}), **headers})
+
+        key = self._key(url)
+        try:
+            entry = self._load(key)
+        except sqlite3.Error as e:
+            logging.warning(f"[HTTPCache] Lookup failed for {url}: {e}")
+            entry = None
+        if entry is not None and not self._vary_matches(entry[0], request_headers):
+            entry = None
+
+        if entry is not None:
+            meta, body, stored = entry
+            age = _age(meta["headers"]) + time.time() - stored
+            if age < meta["lifetime"]:
+                self._touch(key)
+                self.stats["hits"] += 1
+                self.stats["bytes_saved"] += meta["length"]
+                return self._response(url, meta, zlib.decompress(body), True)
+            # stale: ask the server whether our copy is still good
+            if meta["headers"].get("ETag"):
+                headers["If-None-Match"] = meta["headers"]["ETag"]
+            if meta["headers"].get("Last-Modified"):
+                headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+
+        response = http.get(url, headers=headers, **kwargs)
+
+        if entry is not None and response.status_code == 304:
+            # the 304's headers update the stored ones (RFC 9111 §4.3.4)
+            meta["headers"].update({k: v for k, v in response.headers.items() if k.lower() != "content-length"})
+            meta["lifetime"] = freshness_lifetime(CaseInsensitiveDict(meta["headers"]))
+            self._touch(key, meta, time.time())
+            self.stats["revalidated"] += 1
+            self.stats["bytes_saved"] += meta["length"]
+            return self._response(url, meta, zlib.decompress(body), True)
+
+        self.stats["misses"] += 1
+        response.from_cache = False
+        self._store(key, url, response, request_headers)
+        return response
+
+    def _store(self, key: str, url: str, response: requests.Response, request_headers):
+        if response.status_code not in CACHEABLE_STATUS:
+            return
+        control = _directives(response.headers.get("Cache-Control"))
+        vary = [v.strip() for v in response.headers.get("Vary", "").split(",") if v.strip()]
+        if "no-store" in control or "*" in vary:
+            return
+        lifetime = freshness_lifetime(response.headers)
+        if not lifetime and not (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            return  # could neither be served nor revalidated
+        content = response.content
+        meta = {
+            "url": response.url,
+            "status": response.status_code,
+            "encoding": response.encoding,
+            # requests already decoded any Content-Encoding; the stored body is plain
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")},
+            "vary": {name: request_headers.get(name) for name in vary},
+            "lifetime": lifetime,
+            "length": len(content),
+        }
+        try:
+            self._save(key, url, meta, zlib.compress(content, 6), time.time())
+            self.stats["stores"] += 1
+        except sqlite3.Error as e:
+            logging.warning(f"[HTTPCache] Could not store {url}: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._size = 0
+
+    def metrics(self) -> Dict[str, float]:
+        return {**self.stats, "bytes": self._size}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Shared by scrape_page, get_article and knowledge URL loading
+HTTP_CACHE = HTTPCache()
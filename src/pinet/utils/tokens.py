@@ -0,0 +1,13 @@
+import re
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, model-agnostic token estimate (no tokenizer dependency).
+
+    Counts words and punctuation, with long words counted per ~4 characters,
+    which tracks BPE tokenizers closely enough for budgeting.
+    """
+    if not text:
+        return 0
+    return sum(max(1, len(w) // 4) for w in _WORD.findall(text))
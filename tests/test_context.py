@@ -0,0 +1,106 @@
+import asyncio
+
+from pinet.context import TRUNCATED, ContextBuilder, truncate
+from pinet.utils.tokens import estimate_tokens
+
+
+def turns(n, words=10):
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"turn{i} " + "word " * (words - 1)}
+        for i in range(n)
+    ]
+
+
+def total(messages):
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+def test_truncate_keeps_the_start():
+    text = "alpha " * 100
+    short = truncate(text, 20)
+
+    assert short.startswith("alpha alpha")
+    assert short.endswith(TRUNCATED)
+    assert estimate_tokens(short[: -len(TRUNCATED)]) <= 20
+    assert truncate("just a few words", 20) == "just a few words"
+
+
+def test_history_is_packed_newest_first_within_budget():
+    builder = ContextBuilder(token_budget=120)
+    messages = builder.build("what next?", turns(40))
+
+    assert total(messages) <= 120
+    assert messages[-1] == {"role": "user", "content": "what next?"}
+    kept = [m["content"].split()[0] for m in messages[:-1]]
+    # a contiguous run of the most recent turns, oldest first
+    assert kept == [f"turn{i}" for i in range(40 - len(kept), 40)]
+    assert 0 < len(kept) < 40
+
+
+def test_prompt_is_always_included():
+    builder = ContextBuilder(token_budget=200)
+    prompt = "question " * 1000
+
+    messages = builder.build(prompt, turns(5))
+
+    assert messages[-1]["role"] == "user"
+    assert messages[-1]["content"].startswith("question question")
+    assert messages[-1]["content"].endswith(TRUNCATED)
+    assert total(messages) <= 200
+
+
+def test_one_large_message_cannot_evict_the_conversation():
+    builder = ContextBuilder(token_budget=400, max_message_tokens=50)
+    history = turns(4) + [{"role": "user", "content": "tool output " * 500}] + turns(2)
+
+    messages = builder.build("next", history)
+
+    assert len(messages) == len(history) + 1
+    large = messages[4]["content"]
+    assert large.endswith(TRUNCATED)
+    assert estimate_tokens(large[: -len(TRUNCATED)]) <= 50
+
+
+def test_retrieved_notes_get_their_share_and_skip_duplicates():
+    builder = ContextBuilder(token_budget=200, retrieval_share=0.25)
+    history = turns(2)
+    retrieved = [history[0]["content"]] + [f"note{i} " + "fact " * 9 for i in range(10)]
+
+    messages = builder.build("q", history, retrieved=retrieved)
+
+    head = messages[0]["content"]
+    assert head.startswith("[Relevant memories]")
+    notes = head.splitlines()[1:]
+    assert notes and notes[0].startswith("note0")
+    assert history[0]["content"] not in notes
+    assert sum(estimate_tokens(n) for n in notes) <= (200 - 1) * 0.25
+
+
+def test_evicted_turns_are_summarized_in_the_background():
+    requests = []
+
+    async def summarizer(request):
+        requests.append(request)
+        return "the user asked about turns"
+
+    async def main():
+        builder = ContextBuilder(token_budget=60, summarize_batch=4, summarizer=summarizer)
+        history = turns(12)
+        builder.build("q", history)
+        await builder._summary_task
+        return builder, builder.build("q", history)
+
+    builder, messages = asyncio.run(main())
+
+    assert len(requests) == 1
+    assert "turn0" in requests[0][0]["content"]
+    assert messages[0]["content"] == "[Conversation summary] the user asked about turns"
+    assert builder.metrics()["summaries"] == 1
+
+
+def test_system_entries_in_history_become_user_notes():
+    history = [{"role": "system", "content": "tool registry reloaded"}, {"role": "assistant", "content": "ok"}]
+    messages = ContextBuilder(token_budget=200).build("hi", history)
+
+    assert {m["role"] for m in messages} <= {"user", "assistant"}
+    assert messages[0] == {"role": "user", "content": "[System note] tool registry reloaded"}
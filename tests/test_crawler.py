@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pinet.tools.crawler import AsyncCrawler, Frontier, normalize_url
+from pinet.tools.spider_tools import crawl
+
+
+def page(*links):
+    anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return f"<html><head><title>t</title></head><body>{anchors}</body></html>"
+
+
+class Site:
+    """Local HTTP server serving {path: (status, body)}; records request order, timing and concurrency."""
+
+    def __init__(self, routes, latency=0.0):
+        self.routes = routes
+        self.latency = latency
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with site._lock:
+                    site.requests.append((self.path, time.monotonic()))
+                    site.active += 1
+                    site.max_active = max(site.max_active, site.active)
+                try:
+                    time.sleep(site.latency)
+                    status, body = site.routes.get(self.path, (404, "not found"))
+                    content_type = "text/plain" if self.path == "/robots.txt" else "text/html"
+                    data = body.encode()
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                finally:
+                    with site._lock:
+                        site.active -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, path="/"):
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+    def paths(self):
+        return [path for path, _ in self.requests if path != "/robots.txt"]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def serve():
+    sites = []
+
+    def make(routes, latency=0.0):
+        site = Site(routes, latency)
+        sites.append(site)
+        return site
+
+    yield make
+    for site in sites:
+        site.close()
+
+
+def crawl_all(crawler, url, **kwargs):
+    async def run():
+        return [page async for page in crawler.crawl(url, **kwargs)]
+    return asyncio.run(run())
+
+
+def test_normalize_url():
+    assert normalize_url("HTTP://Example.COM:80/a?b=1#frag") == "http://example.com/a?b=1"
+    assert normalize_url("https://example.com:443") == "https://example.com/"
+    assert normalize_url("https://example.com:8443/x") == "https://example.com:8443/x"
+
+
+def test_frontier_dedup():
+    frontier = Frontier()
+    assert frontier.add("http://a.com/x#top")
+    assert not frontier.add("HTTP://A.com:80/x#bottom")
+    frontier.mark("http://a.com/y")
+    assert not frontier.add("http://a.com/y")
+    assert len(frontier) == 1
+    assert frontier.pop() == "http://a.com/x"
+
+
+def test_per_host_cap(serve):
+    leaves = [f"/p{i}" for i in range(12)]
+    site = serve({"/": (200, page(*leaves)), **{p: (200, page()) for p in leaves}}, latency=0.05)
+
+    pages = crawl_all(AsyncCrawler(concurrency=10, per_host=2, delay=0), site.url(), max_pages=13)
+
+    assert len(pages) == 13
+    assert site.max_active == 2
+
+
+def test_delay_spaces_requests_to_a_host(serve):
+    leaves = [f"/p{i}" for i in range(4)]
+    site = serve({"/": (200, page(*leaves)), **{p: (200, page()) for p in leaves}})
+
+    crawl_all(AsyncCrawler(per_host=4, delay=0.05), site.url(), max_pages=5)
+
+    starts = sorted(t for _, t in site.requests)
+    assert len(starts) == 5
+    assert min(b - a for a, b in zip(starts, starts[1:])) >= 0.045
+
+
+def test_robots_disallow_and_crawl_delay(serve):
+    robots = "User-agent: *\nDisallow: /private\nCrawl-delay: 1\n"
+    site = serve({
+        "/robots.txt": (200, robots),
+        "/": (200, page("/private", "/p0", "/p1")),
+        "/private": (200, page()),
+        "/p0": (200, page()),
+        "/p1": (200, page()),
+    })
+
+    pages = crawl_all(AsyncCrawler(respect_robots=True), site.url(), max_pages=10)
+
+    assert "/private" not in site.paths()
+    assert sorted(p["url"] for p in pages) == sorted(site.url(p) for p in ("/", "/p0", "/p1"))
+    assert [path for path, _ in site.requests].count("/robots.txt") == 1
+    starts = sorted(t for path, t in site.requests if path != "/robots.txt")
+    assert min(b - a for a, b in zip(starts, starts[1:])) >= 0.95
+
+
+def test_max_pages_counts_failed_fetches(serve):
+    routes = {"/": (200, page("/bad0", "/p0", "/bad1", "/p1", "/bad2", "/p2"))}
+    routes.update({f"/bad{i}": (500, "error") for i in range(3)})
+    routes.update({f"/p{i}": (200, page()) for i in range(3)})
+    site = serve(routes)
+
+    pages = crawl_all(AsyncCrawler(concurrency=1, delay=0), site.url(), max_pages=5)
+
+    assert site.paths() == ["/", "/bad0", "/p0", "/bad1", "/p1"]
+    assert [p["url"] for p in pages] == [site.url(p) for p in ("/", "/p0", "/p1")]
+
+
+def test_crawl_inside_running_loop(serve):
+    site = serve({"/": (200, page("/a", "/b")), "/a": (200, page()), "/b": (200, page())})
+
+    async def called_from_a_coroutine():
+        # the sync tool must not try to start a second loop on this thread
+        return crawl(site.url(), max_pages=3)
+
+    pages = asyncio.run(called_from_a_coroutine())
+
+    assert isinstance(pages, list)
+    assert sorted(p["url"] for p in pages) == sorted(site.url(p) for p in ("/", "/a", "/b"))
+    # a bare crawl() is polite: one request per second to the site
+    starts = sorted(t for _, t in site.requests)
+    assert min(b - a for a, b in zip(starts, starts[1:])) >= 0.95
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from pinet.memory.embedding_service import EmbeddingService
+
+
+class GatedModel:
+    """Fake SentenceTransformer: each text becomes [len(text)]; encode blocks until the gate opens."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+        self.batches = []
+
+    def encode(self, texts, batch_size=None):
+        self.batches.append(list(texts))
+        self.entered.set()
+        self.gate.wait(5)
+        if "boom" in texts:
+            raise RuntimeError("model failed")
+        return np.array([[float(len(t))] for t in texts])
+
+
+@pytest.fixture
+def service():
+    service = EmbeddingService(max_wait=0.01)
+    service._model = GatedModel()
+    return service
+
+
+def test_concurrent_requests_are_batched(service):
+    service._model.gate.set()
+
+    async def main():
+        return await asyncio.gather(*[service.aencode(["a" * i]) for i in range(1, 6)])
+
+    assert asyncio.run(main()) == [[[float(i)]] for i in range(1, 6)]
+    assert len(service._model.batches) < 5
+    assert service.metrics()["requests"] == 5
+
+
+def test_cancelled_awaiters_do_not_kill_the_worker(service):
+    model = service._model
+
+    async def main():
+        running = service.submit(["warm"])  # holds the worker inside encode
+        await asyncio.to_thread(model.entered.wait, 5)
+        in_flight = asyncio.ensure_future(service.aencode(["in-flight"]))
+        queued = asyncio.ensure_future(service.aencode(["queued"]))
+        waiting = service.submit(["sync"])
+        await asyncio.sleep(0)
+        queued.cancel()
+        model.gate.set()
+        await asyncio.sleep(0.05)
+        # cancelled after its batch was picked up: the result is delivered to nobody
+        in_flight.cancel()
+        return running, waiting, queued
+
+    running, waiting, queued = asyncio.run(main())
+    assert running.result(timeout=1) == [[4.0]]
+    assert waiting.result(timeout=1) == [[4.0]]
+    assert queued.cancelled()
+    assert all("queued" not in batch for batch in model.batches)
+    assert service._worker.is_alive()
+    assert service.encode(["again"]) == [[5.0]]
+
+
+def test_model_errors_fail_the_whole_batch_only(service):
+    service._model.gate.set()
+
+    with pytest.raises(RuntimeError, match="model failed"):
+        service.encode(["boom"])
+    assert service.encode(["fine"]) == [[4.0]]
+    assert service._worker.is_alive()
+
+
+def test_empty_request_does_not_start_the_worker(service):
+    assert service.encode([]) == []
+    assert service._worker is None
@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+
+from pinet.behaviours.gen_server import GenServer
+from pinet.behaviours.supervisor import Supervisor
+
+
+class Recorder:
+    """Handler that logs start/end of every message and tracks how many run at once."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.events = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, method, payload, state):
+        self.events.append(("start", method, payload))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if payload == "boom":
+                raise ValueError("boom")
+            await asyncio.sleep(self.delay)
+            return payload
+        finally:
+            self.active -= 1
+            self.events.append(("end", method, payload))
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_calls_run_one_at_a_time_by_default():
+    async def main():
+        handler = Recorder()
+        server = GenServer("serial", handler)
+        await server.start()
+        results = await asyncio.gather(*[server.call("ask", i) for i in range(4)])
+        await server.stop()
+        return handler, results
+
+    handler, results = run(main())
+    assert results == [0, 1, 2, 3]
+    assert handler.peak == 1
+
+
+def test_concurrent_calls_are_bounded_by_max_concurrency():
+    async def main():
+        handler = Recorder()
+        server = GenServer("pool", handler, max_concurrency=3, concurrent_methods={"ask"})
+        await server.start()
+        results = await asyncio.gather(*[server.call("ask", i) for i in range(7)])
+        await server.stop()
+        return handler, results
+
+    handler, results = run(main())
+    assert results == list(range(7))
+    assert handler.peak == 3
+
+
+def test_state_mutating_messages_drain_in_flight_calls_and_run_alone():
+    async def main():
+        handler = Recorder()
+        server = GenServer("drain", handler, max_concurrency=4, concurrent_methods={"ask"})
+        await server.start()
+        first = [asyncio.create_task(server.call("ask", i)) for i in range(2)]
+        await asyncio.sleep(0)
+        await server.cast("remember", "note")
+        later = asyncio.create_task(server.call("ask", 2))
+        await asyncio.gather(*first, later)
+        await server.stop()
+        return handler.events
+
+    events = run(main())
+    remember_start = events.index(("start", "remember", "note"))
+    remember_end = events.index(("end", "remember", "note"))
+    # everything dequeued before the cast finished before it started...
+    assert events.index(("end", "ask", 0)) < remember_start
+    assert events.index(("end", "ask", 1)) < remember_start
+    # ...and nothing dequeued after it started until it was done
+    assert events.index(("start", "ask", 2)) > remember_end
+
+
+def test_call_waiting_for_a_slot_fails_when_stopped():
+    async def main():
+        server = GenServer("stopping", Recorder(delay=1.0), max_concurrency=2, shutdown_timeout=0.05)
+        await server.start()
+        calls = [asyncio.create_task(server.call("ask", i)) for i in range(3)]
+        await asyncio.sleep(0.02)
+        await server.stop()
+        return await asyncio.wait_for(asyncio.gather(*calls, return_exceptions=True), 1.0)
+
+    results = run(main())
+    assert all(isinstance(r, RuntimeError) and "stopped" in str(r) for r in results)
+
+
+def test_failing_call_does_not_cancel_its_siblings():
+    async def main():
+        handler = Recorder(delay=0.1)
+        supervisor = Supervisor("sup", backoff_base=0.01)
+        server = GenServer("siblings", handler, supervisor=supervisor, max_concurrency=4)
+        await server.start()
+        healthy = [asyncio.create_task(server.call("ask", i)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        failing = asyncio.create_task(server.call("ask", "boom"))
+        results = await asyncio.gather(*healthy, failing, return_exceptions=True)
+        await asyncio.sleep(0.05)  # let the supervisor restart the server
+        after = await server.call("ask", "after")
+        await server.stop()
+        return results, after
+
+    results, after = run(main())
+    assert results[:3] == [0, 1, 2]
+    assert isinstance(results[3], ValueError)
+    assert after == "after"
+
+
+def test_metrics_report_busy_while_a_message_is_handled():
+    async def main():
+        server = GenServer("busy", Recorder(delay=0.1))
+        await server.start()
+        call = asyncio.create_task(server.call("ask", 1))
+        await asyncio.sleep(0.02)
+        during = server.metrics()
+        await call
+        after = server.metrics()
+        await server.stop()
+        return during, after
+
+    during, after = run(main())
+    assert during["busy"] == 1 and during["depth"] == 0
+    assert after["busy"] == 0
+
+
+def test_max_concurrency_must_be_positive():
+    with pytest.raises(ValueError):
+        GenServer("bad", Recorder(), max_concurrency=0)
+
+
+class SlowLLM:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def chat(self, messages):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        return "ok"
+
+
+@pytest.mark.parametrize("concurrent_asks, peak", [(False, 1), (True, 3)])
+def test_agent_asks_run_concurrently_only_when_opted_in(tmp_path, monkeypatch, concurrent_asks, peak):
+    from pinet.agent import Agent
+    monkeypatch.chdir(tmp_path)
+
+    async def main():
+        agent = await Agent.create(
+            "asker", memory={"enabled": False}, max_concurrency=3, concurrent_asks=concurrent_asks,
+        )
+        agent.llm = SlowLLM()
+        await agent.server.start()
+        replies = await asyncio.gather(*[agent.server.call("ask", f"q{i}") for i in range(3)])
+        await agent.server.stop()
+        return replies, agent.llm.peak
+
+    assert run(main()) == (["ok"] * 3, peak)
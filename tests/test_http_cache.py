@@ -0,0 +1,144 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import pinet.knowledge.knowledge as knowledge
+from pinet.utils.http_cache import HTTPCache, freshness_lifetime
+
+BODY = "First paragraph of the page.\n\nSecond paragraph of the page.\n"
+
+
+class Origin:
+    """Local server whose responses depend on the path; records every request's path and validator."""
+
+    def __init__(self):
+        self.requests = []
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                etag = self.headers.get("If-None-Match")
+                origin.requests.append((self.path, etag))
+                if self.path.startswith("/etag") and etag == '"v1"':
+                    self.send_response(304)
+                    self.send_header("ETag", '"v1"')
+                    self.end_headers()
+                    return
+                data = BODY.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                if self.path.startswith("/fresh"):
+                    self.send_header("Cache-Control", "max-age=60")
+                elif self.path.startswith("/etag"):
+                    self.send_header("Cache-Control", "no-cache")
+                    self.send_header("ETag", '"v1"')
+                elif self.path.startswith("/nostore"):
+                    self.send_header("Cache-Control", "no-store")
+                    self.send_header("ETag", '"v1"')
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+
+@pytest.fixture
+def origin():
+    server = Origin()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    http_cache = HTTPCache(path=tmp_path / "http_cache.sqlite")
+    yield http_cache
+    http_cache.close()
+
+
+def test_freshness_lifetime():
+    assert freshness_lifetime({"Cache-Control": "public, max-age=120"}) == 120
+    assert freshness_lifetime({"Cache-Control": "no-cache, max-age=120"}) == 0
+    assert freshness_lifetime({
+        "Date": "Mon, 01 Jan 2024 00:00:00 GMT",
+        "Expires": "Mon, 01 Jan 2024 00:10:00 GMT",
+    }) == 600
+    # heuristic: a tenth of the time since the last change
+    assert freshness_lifetime({
+        "Date": "Mon, 01 Jan 2024 00:00:00 GMT",
+        "Last-Modified": "Sun, 31 Dec 2023 23:00:00 GMT",
+    }) == 360
+
+
+def test_fresh_response_is_served_without_a_request(origin, cache):
+    first = cache.get(origin.url("/fresh"), timeout=5)
+    second = cache.get(origin.url("/fresh"), timeout=5)
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.text == BODY
+    assert len(origin.requests) == 1
+    assert cache.metrics()["hits"] == 1
+
+
+def test_stale_response_is_revalidated(origin, cache):
+    cache.get(origin.url("/etag"), timeout=5)
+    revalidated = cache.get(origin.url("/etag"), timeout=5)
+
+    assert origin.requests == [("/etag", None), ("/etag", '"v1"')]
+    assert revalidated.status_code == 200
+    assert revalidated.from_cache
+    assert revalidated.text == BODY
+    assert cache.metrics()["revalidated"] == 1
+
+
+def test_no_store_is_never_cached(origin, cache):
+    cache.get(origin.url("/nostore"), timeout=5)
+    again = cache.get(origin.url("/nostore"), timeout=5)
+
+    assert not again.from_cache
+    assert origin.requests == [("/nostore", None), ("/nostore", None)]
+
+
+def test_cached_responses_can_be_iterated(origin, cache):
+    cache.get(origin.url("/fresh"), timeout=5)
+    cache.get(origin.url("/etag"), timeout=5)
+
+    for path in ("/fresh", "/etag"):
+        response = cache.get(origin.url(path), timeout=5)
+        assert response.from_cache
+        assert list(response.iter_lines(decode_unicode=True)) == BODY.splitlines()
+
+
+def test_least_recently_used_entries_are_evicted(origin, tmp_path):
+    small = HTTPCache(path=tmp_path / "small.sqlite", max_bytes=100)
+    try:
+        for path in ("/fresh-a", "/fresh-b", "/fresh-c"):
+            small.get(origin.url(path), timeout=5)
+        assert small.metrics()["evictions"] >= 1
+        assert small.metrics()["bytes"] <= 100
+        assert small.get(origin.url("/fresh-c"), timeout=5).from_cache
+        assert not small.get(origin.url("/fresh-a"), timeout=5).from_cache
+    finally:
+        small.close()
+
+
+def test_knowledge_url_loads_twice_through_the_cache(origin, cache, monkeypatch):
+    monkeypatch.setattr(knowledge, "HTTP_CACHE", cache)
+
+    first = list(knowledge.load_knowledge(origin.url("/etag")))
+    second = list(knowledge.load_knowledge(origin.url("/etag")))
+
+    assert first == second
+    assert "Second paragraph" in " ".join(second)
+    assert not any("Failed to load" in chunk for chunk in second)
+    assert cache.metrics()["revalidated"] == 1
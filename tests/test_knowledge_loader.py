@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from pinet.knowledge import loader
+from pinet.knowledge.loader import KnowledgeCache, load_knowledge_sources
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return KnowledgeCache(tmp_path / "cache")
+
+
+def test_chunks_are_streamed_to_disk_and_read_back_in_batches(tmp_path, cache, monkeypatch):
+    source = tmp_path / "kb.txt"
+    source.write_text("x")
+    produced = []
+
+    def chunks(path, chunk_size, overlap):
+        for i in range(5):
+            produced.append(i)
+            yield f"chunk {i}"
+
+    monkeypatch.setattr(loader, "load_knowledge", chunks)
+    loaded = asyncio.run(load_knowledge_sources([str(source)], cache=cache))
+
+    result = loaded[str(source)]
+    assert set(result) == {"digest", "cached"} and not result["cached"]
+    assert [len(batch) for batch in cache.batches(str(source), 2)] == [2, 2, 1]
+    assert [c for batch in cache.batches(str(source), 2) for c in batch] == [f"chunk {i}" for i in range(5)]
+
+    # unchanged source: served from disk without parsing again
+    monkeypatch.setattr(loader, "load_knowledge", lambda *a, **k: pytest.fail("unchanged source was re-read"))
+    again = asyncio.run(load_knowledge_sources([str(source)], cache=cache))[str(source)]
+    assert again == {"digest": result["digest"], "cached": True}
+
+
+def test_failed_parse_keeps_the_previous_chunks(tmp_path, cache, monkeypatch):
+    source = tmp_path / "kb.txt"
+    source.write_text("x")
+    monkeypatch.setattr(loader, "load_knowledge", lambda *a, **k: iter(["old"]))
+    asyncio.run(load_knowledge_sources([str(source)], cache=cache))
+
+    def broken(*args, **kwargs):
+        yield "new"
+        raise OSError("read failed")
+
+    source.write_text("changed")
+    monkeypatch.setattr(loader, "load_knowledge", broken)
+    result = asyncio.run(load_knowledge_sources([str(source)], cache=cache))[str(source)]
+
+    assert isinstance(result["error"], OSError)
+    assert list(cache.batches(str(source))) == [["old"]]
@@ -0,0 +1,162 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from pinet.llms.registry import ClientRegistry, RateLimiter, is_retryable
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={"retry-after": retry_after} if retry_after else {})
+
+
+class Flaky:
+    """Upstream call that raises the queued errors first, then answers."""
+
+    def __init__(self, *errors, delay=0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"answer {self.calls}"
+
+
+@pytest.fixture
+def registry():
+    registry = ClientRegistry()
+    registry.configure(KEY, max_retries=2, backoff=0.001, max_backoff=0.01)
+    return registry
+
+
+KEY = ClientRegistry.key("test", "secret")
+
+
+def test_is_retryable():
+    assert is_retryable(StatusError(429))
+    assert is_retryable(StatusError(503))
+    assert is_retryable(ConnectionError())
+    assert not is_retryable(StatusError(400))
+    assert not is_retryable(ValueError("bad request"))
+
+
+def test_key_does_not_keep_the_raw_api_key():
+    assert "secret" not in repr(KEY)
+    assert ClientRegistry.key("test", "secret") == KEY
+
+
+def test_retryable_errors_are_retried(registry):
+    call = Flaky(StatusError(429), StatusError(503))
+
+    assert asyncio.run(registry.call(KEY, call)) == "answer 3"
+    assert registry.stats == {"calls": 3, "retries": 2, "coalesced": 0, "failures": 0}
+
+
+def test_non_retryable_errors_fail_immediately(registry):
+    call = Flaky(StatusError(400))
+
+    with pytest.raises(StatusError):
+        asyncio.run(registry.call(KEY, call))
+    assert call.calls == 1
+    assert registry.stats["failures"] == 1
+
+
+def test_gives_up_after_max_retries(registry):
+    call = Flaky(*[StatusError(500)] * 5)
+
+    with pytest.raises(StatusError):
+        asyncio.run(registry.call(KEY, call))
+    assert call.calls == 3
+    assert registry.stats["retries"] == 2
+
+
+def test_backoff_honours_retry_after_up_to_the_cap(registry):
+    registry.configure(KEY, max_backoff=5.0)
+
+    assert registry._backoff(KEY, 0, StatusError(429, retry_after="2")) == 2.0
+    assert registry._backoff(KEY, 0, StatusError(429, retry_after="60")) == 5.0
+    assert 0 <= registry._backoff(KEY, 3, StatusError(429)) <= 0.008
+
+
+def test_identical_concurrent_requests_are_coalesced(registry):
+    call = Flaky(delay=0.02)
+
+    async def main():
+        return await asyncio.gather(
+            registry.call(KEY, call, coalesce={"prompt": "hi"}),
+            registry.call(KEY, call, coalesce={"prompt": "hi"}),
+            registry.call(KEY, call, coalesce={"prompt": "bye"}),
+        )
+
+    results = asyncio.run(main())
+    assert results[0] == results[1]
+    assert call.calls == 2
+    assert registry.stats["coalesced"] == 1
+    assert registry.metrics()["inflight"] == 0
+
+
+def test_cancelled_caller_does_not_cancel_a_shared_request(registry):
+    call = Flaky(delay=0.05)
+
+    async def main():
+        first = asyncio.create_task(registry.call(KEY, call, coalesce="same"))
+        second = asyncio.create_task(registry.call(KEY, call, coalesce="same"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "answer 1"
+    assert call.calls == 1
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rpm=600)  # ten a second, a minute's worth up front
+
+    async def main():
+        limiter.requests.tokens = 0
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await limiter.acquire()
+        await limiter.acquire()
+        return loop.time() - start
+
+    assert asyncio.run(main()) >= 0.15
+
+
+def test_client_settings_cannot_change_once_the_client_exists(registry):
+    registry.configure(KEY, max_connections=10)
+    built = []
+    registry.client(KEY, lambda limits, timeout: built.append((limits.max_connections, timeout)) or object())
+
+    registry.configure(KEY, max_connections=10, timeout=120.0, max_retries=3)  # unchanged: fine
+    with pytest.raises(ValueError, match="max_connections"):
+        registry.configure(KEY, max_connections=20)
+    with pytest.raises(ValueError, match="timeout"):
+        registry.configure(KEY, timeout=5.0)
+    assert built == [(10, 120.0)]
+    assert registry.settings(KEY)["max_retries"] == 3
+
+
+def test_rate_limiter_does_not_block_while_waiting():
+    limiter = RateLimiter(rpm=600)
+
+    async def main():
+        limiter.requests.tokens = 0
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        await asyncio.sleep(0)
+        # the cancelled waiter returned its reservation instead of holding up the next one
+        await limiter.acquire()
+        return loop.time() - start
+
+    assert asyncio.run(main()) < 0.15
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from pinet.behaviours.actor import Actor, MailboxFull, OverflowPolicy
+from pinet.behaviours.gen_server import GenServer
+
+
+async def noop(actor, msg):
+    pass
+
+
+def filled(overflow, dropped=None):
+    """An unstarted actor whose two-slot mailbox already holds "a" and "b"."""
+    actor = Actor("box", noop, capacity=2, overflow=overflow, on_drop=dropped.append if dropped is not None else None)
+
+    async def fill():
+        await actor.send("a")
+        await actor.send("b")
+    return actor, fill
+
+
+def queued(actor):
+    return [msg for _, msg in actor._mailbox._queue]
+
+
+def test_block_waits_for_space():
+    async def main():
+        actor, fill = filled(OverflowPolicy.BLOCK)
+        await fill()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(actor.send("c"), 0.05)
+        return actor
+
+    actor = asyncio.run(main())
+    assert queued(actor) == ["a", "b"]
+
+
+def test_drop_newest_discards_the_incoming_message():
+    dropped = []
+
+    async def main():
+        actor, fill = filled(OverflowPolicy.DROP_NEWEST, dropped)
+        await fill()
+        await actor.send("c")
+        return actor
+
+    actor = asyncio.run(main())
+    assert queued(actor) == ["a", "b"]
+    assert dropped == ["c"]
+    assert actor.metrics()["dropped"] == 1
+
+
+def test_drop_oldest_evicts_the_head_of_the_queue():
+    dropped = []
+
+    async def main():
+        actor, fill = filled("drop_oldest", dropped)
+        await fill()
+        await actor.send("c")
+        return actor
+
+    actor = asyncio.run(main())
+    assert queued(actor) == ["b", "c"]
+    assert dropped == ["a"]
+
+
+def test_reject_raises_in_the_sender():
+    async def main():
+        actor, fill = filled(OverflowPolicy.REJECT)
+        await fill()
+        with pytest.raises(MailboxFull):
+            await actor.send("c")
+        return actor
+
+    actor = asyncio.run(main())
+    metrics = actor.metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["depth"] == 2 and metrics["max_depth"] == 2
+
+
+def test_dropped_call_fails_its_caller():
+    async def handler(method, payload, state):
+        await asyncio.sleep(1)
+
+    async def main():
+        server = GenServer("full", handler, mailbox_size=1, overflow="drop_newest")
+        first = asyncio.create_task(server.call("ask", 1))  # queued, nothing drains the mailbox yet
+        await asyncio.sleep(0)
+        with pytest.raises(MailboxFull):
+            await server.call("ask", 2)
+        first.cancel()
+
+    asyncio.run(main())
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        Actor("box", noop, capacity=1, overflow="spill")
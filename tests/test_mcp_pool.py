@@ -0,0 +1,32 @@
+from pinet.mcp.pool import MCPPool
+
+SERVER = {"command": "python -m some_server --port 1", "env": {"MODE": "test"}}
+
+
+def test_equivalent_commands_share_a_key():
+    assert MCPPool.key(SERVER) == MCPPool.key({**SERVER, "command": ["python", "-m", "some_server", "--port", "1"]})
+    assert MCPPool.key(SERVER) != MCPPool.key({**SERVER, "env": {"MODE": "prod"}})
+
+
+def test_client_options_do_not_start_another_server():
+    pool = MCPPool()
+
+    plain = pool.get(SERVER)
+    cached = pool.get({**SERVER, "cache_ttl": 60, "pool_size": 3})
+
+    assert pool.get(dict(SERVER)) is plain
+    assert cached is not plain and cached.cache_ttl == 60
+    # same server process, and the same tool-result namespace
+    assert cached.runner is plain.runner
+    assert cached.namespace == plain.namespace
+    assert len(pool.supervisor._children) == 1
+
+
+def test_pool_size_starts_several_instances():
+    pool = MCPPool()
+
+    client = pool.get({**SERVER, "pool_size": 2})
+
+    assert len(pool.supervisor._children) == 2
+    assert len(client.runner.connections) == 2
+    assert pool.get({**SERVER, "cache_ttl": 5}).runner.connections == client.runner.connections
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from pinet.knowledge.rag_system import RAGSystem
+
+CHUNKS = [
+    "Actors process one message at a time from a mailbox.",
+    "Supervisors restart failed children with exponential backoff.",
+    "The router spreads requests across a group of agents.",
+    "Embeddings are cached on disk by content hash.",
+    "Knowledge chunks are ranked by BM25 and vector similarity.",
+]
+
+
+class VectorStore:
+    """Stands in for ChromaMemory; records how chunks arrive and answers searches from a script."""
+
+    def __init__(self, hits=()):
+        self.added = []
+        self.docs = set()
+        self.hits = list(hits)
+
+    def add_many(self, items):
+        items = list(items)
+        self.added.append(items)
+        self.docs.update(items)
+
+    def flush(self):
+        pass
+
+    def search(self, query, top_k=3):
+        return self.hits[:top_k]
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "kb.txt"
+    path.write_text("\n\n".join(CHUNKS))
+    return str(path)
+
+
+def rag(source, chunks=CHUNKS, vector_store=None, **kwargs):
+    system = RAGSystem("kb", source, vector_store=vector_store or VectorStore(), **kwargs)
+    system.load_knowledge = lambda: iter(chunks)
+    return system
+
+
+def test_ingest_streams_batches_and_keeps_text_out_of_the_manifest(source):
+    system = rag(source, chunks=CHUNKS + [CHUNKS[0]], batch_size=2)
+
+    assert system.ingest() == 5
+    # one add_many per batch, duplicates dropped
+    assert [len(batch) for batch in system.vector_chroma.added] == [2, 2, 1]
+    manifest = json.loads(system.index_path.read_text())
+    assert len(manifest["ids"]) == 5 and manifest["digest"]
+    assert "chunks" not in manifest and CHUNKS[0] not in system.index_path.read_text()
+
+
+def test_keyword_search_finds_chunks_without_vector_hits(source):
+    system = rag(source)
+    system.ingest()
+
+    assert "Supervisors restart" in system.retrieve_knowledge("how are failed children restarted?")
+
+
+def test_vector_hits_outside_the_knowledge_base_are_ignored(source):
+    store = VectorStore(hits=["an unrelated conversation message", CHUNKS[3]])
+    system = rag(source, vector_store=store, token_budget=20)
+    system.ingest()
+
+    result = system.retrieve_knowledge("zzz")
+    assert result == CHUNKS[3]
+
+
+def test_unchanged_source_is_re_added_from_the_chunk_store(source):
+    rag(source).ingest()
+
+    fresh = VectorStore()
+    restarted = rag(source, vector_store=fresh, batch_size=3)
+    restarted.load_knowledge = lambda: pytest.fail("unchanged source was re-read")
+
+    assert restarted.ingest() == 5
+    assert fresh.docs == set(CHUNKS)
+    assert [len(batch) for batch in fresh.added] == [3, 2]
+
+
+def test_failed_reload_keeps_the_previous_index(source):
+    first = rag(source)
+    first.ingest()
+    manifest = first.index_path.read_text()
+
+    def broken():
+        yield "A new chunk that never gets committed."
+        raise OSError("disk went away")
+
+    with open(source, "a") as f:
+        f.write("\n\nchanged")
+    second = rag(source, batch_size=1)
+    second.load_knowledge = broken
+
+    assert second.ingest() == 5
+    assert first.index_path.read_text() == manifest
+    assert "Supervisors restart" in second.retrieve_knowledge("failed children restarted")
+    assert "never gets committed" not in second.retrieve_knowledge("new chunk committed")
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+import websockets
+
+from pinet.remote import RemoteClient, RemoteServer
+
+
+class EchoAgent:
+    """Stands in for an Agent: asks sleep for payload["t"] seconds and echo the payload."""
+
+    def __init__(self, name):
+        self.name = name
+        self.remembered = []
+
+    async def ask(self, payload):
+        await asyncio.sleep(payload.get("t", 0))
+        if payload.get("fail"):
+            raise ValueError("agent failed")
+        return {"agent": self.name, "echo": payload}
+
+    async def remember(self, payload):
+        self.remembered.append(payload)
+
+    async def cast(self, method, payload):
+        pass
+
+
+async def serving(body, agents=("echo",)):
+    """Run body(server, url, connections) against a RemoteServer on a free port."""
+    server = RemoteServer(auth="test-secret")
+    registered = {name: EchoAgent(name) for name in agents}
+    for name, agent in registered.items():
+        server.router.register(name, agent)
+    connections = []
+
+    async def handler(websocket):
+        connections.append(websocket)
+        await server.ws_handler(websocket)
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        return await body(registered, f"ws://127.0.0.1:{port}", connections)
+
+
+def client(url, **kwargs):
+    return RemoteClient("echo", url=url, auth="test-secret", backoff=0.01, **kwargs)
+
+
+def test_concurrent_asks_share_one_connection():
+    async def body(agents, url, connections):
+        async with client(url) as remote:
+            start = time.monotonic()
+            results = await asyncio.gather(*[remote.ask({"t": t}) for t in (0.3, 0.1, 0.2)])
+            return results, time.monotonic() - start, len(connections)
+
+    results, elapsed, connections = asyncio.run(serving(body))
+    # replies came back out of order and were matched to their requests by id
+    assert [r["echo"]["t"] for r in results] == [0.3, 0.1, 0.2]
+    assert elapsed < 0.5
+    assert connections == 1
+
+
+def test_agent_errors_fail_only_their_request():
+    async def body(agents, url, connections):
+        async with client(url) as remote:
+            failing = remote.ask({"fail": True})
+            ok = remote.ask({"t": 0.05})
+            return await asyncio.gather(failing, ok, return_exceptions=True)
+
+    failed, ok = asyncio.run(serving(body))
+    assert isinstance(failed, RuntimeError) and "agent failed" in str(failed)
+    assert ok["agent"] == "echo"
+
+
+def test_reconnects_on_the_next_request_after_a_drop():
+    async def body(agents, url, connections):
+        async with client(url) as remote:
+            await remote.remember("first")
+            await connections[0].close()
+            await asyncio.sleep(0.05)
+            await remote.remember("second")
+            return agents["echo"].remembered, len(connections)
+
+    remembered, connections = asyncio.run(serving(body))
+    assert remembered == ["first", "second"]
+    assert connections == 2
+
+
+def test_requests_in_flight_fail_when_the_connection_drops():
+    async def body(agents, url, connections):
+        async with client(url) as remote:
+            waiting = asyncio.ensure_future(remote.ask({"t": 5}))
+            await asyncio.sleep(0.05)
+            await connections[0].close()
+            with pytest.raises(RuntimeError, match="Lost connection"):
+                await asyncio.wait_for(waiting, 2)
+
+    asyncio.run(serving(body))
+
+
+def test_unknown_agent_is_reported():
+    async def body(agents, url, connections):
+        async with RemoteClient("nobody", url=url, auth="test-secret") as remote:
+            with pytest.raises(RuntimeError, match="not found"):
+                await remote.ask({})
+
+    asyncio.run(serving(body))
@@ -0,0 +1,136 @@
+import asyncio
+
+import numpy as np
+
+from pinet.response_cache import ResponseCache, context_scope
+
+
+class Embedder:
+    """Bag-of-letters vectors: prompts that differ by a word or two stay close."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def aencode(self, texts):
+        self.calls += 1
+        vectors = []
+        for text in texts:
+            vector = np.zeros(26, dtype=np.float32)
+            for ch in text:
+                if "a" <= ch <= "z":
+                    vector[ord(ch) - ord("a")] += 1
+            vectors.append(vector)
+        return vectors
+
+
+SCOPE = context_scope("system", [{"role": "user", "content": "hello"}])
+
+
+def test_exact_hit_after_normalization():
+    cache = ResponseCache(similarity=None)
+
+    async def main():
+        await cache.put(SCOPE, "What is the  capital of France?", "Paris")
+        return await cache.get(SCOPE, "  what is the capital\nof france? ")
+
+    assert asyncio.run(main()) == "Paris"
+    assert cache.metrics()["exact_hits"] == 1
+
+
+def test_scope_covers_system_prompt_and_context():
+    cache = ResponseCache(similarity=None)
+    other_context = context_scope("system", [{"role": "user", "content": "goodbye"}])
+    other_system = context_scope("another system", [{"role": "user", "content": "hello"}])
+
+    async def main():
+        await cache.put(SCOPE, "question", "answer")
+        return await cache.get(other_context, "question"), await cache.get(other_system, "question")
+
+    assert asyncio.run(main()) == (None, None)
+    assert cache.metrics()["misses"] == 2
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache(ttl=0.05, similarity=None)
+
+    async def main():
+        await cache.put(SCOPE, "question", "answer")
+        fresh = await cache.get(SCOPE, "question")
+        await asyncio.sleep(0.06)
+        return fresh, await cache.get(SCOPE, "question")
+
+    assert asyncio.run(main()) == ("answer", None)
+    assert cache.metrics()["expired"] == 1
+    assert cache.metrics()["size"] == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache(max_entries=2, similarity=None)
+
+    async def main():
+        await cache.put(SCOPE, "a", "1")
+        await cache.put(SCOPE, "b", "2")
+        await cache.get(SCOPE, "a")
+        await cache.put(SCOPE, "c", "3")
+        return [await cache.get(SCOPE, p) for p in ("a", "b", "c")]
+
+    assert asyncio.run(main()) == ["1", None, "3"]
+    assert cache.metrics()["evictions"] == 1
+
+
+def test_semantic_hit_within_the_same_scope():
+    embedder = Embedder()
+    cache = ResponseCache(similarity=0.9, embedder=embedder)
+    other = context_scope(None, [])
+
+    async def main():
+        await cache.put(SCOPE, "summarize the quarterly sales report", "summary")
+        near = await cache.get(SCOPE, "please summarize the quarterly sales report")
+        far = await cache.get(SCOPE, "xyz")
+        elsewhere = await cache.get(other, "please summarize the quarterly sales report")
+        return near, far, elsewhere
+
+    assert asyncio.run(main()) == ("summary", None, None)
+    stats = cache.metrics()
+    assert stats["semantic_hits"] == 1 and stats["misses"] == 2
+    # no entries in the other scope, so its lookup skipped the embedder
+    assert embedder.calls == 3
+
+
+def test_exact_matching_is_the_default():
+    embedder = Embedder()
+    cache = ResponseCache(embedder=embedder)
+
+    async def main():
+        await cache.put(SCOPE, "What is 2+4?", "6")
+        return await cache.get(SCOPE, "What is 2+3?"), await cache.get(SCOPE, "what is 2+4?")
+
+    assert asyncio.run(main()) == (None, "6")
+    assert embedder.calls == 0
+
+
+def test_failing_embedder_falls_back_to_exact_matching():
+    class Broken:
+        async def aencode(self, texts):
+            raise RuntimeError("model not available")
+
+    cache = ResponseCache(similarity=0.9, embedder=Broken())
+
+    async def main():
+        await cache.put(SCOPE, "question", "answer")
+        return await cache.get(SCOPE, "question"), await cache.get(SCOPE, "another question")
+
+    assert asyncio.run(main()) == ("answer", None)
+    assert cache.similarity is None
+
+
+def test_hit_rate():
+    cache = ResponseCache(similarity=None)
+
+    async def main():
+        await cache.get(SCOPE, "q")
+        await cache.put(SCOPE, "q", "a")
+        await cache.get(SCOPE, "q")
+
+    asyncio.run(main())
+    assert cache.metrics()["hit_rate"] == 0.5
@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from pinet.remote import RemoteServer, Router
+
+
+class Member:
+    def __init__(self, name, depth=0, inflight=0, busy=0):
+        self.name = name
+        self.load = {"depth": depth, "inflight": inflight, "busy": busy}
+
+    def metrics(self):
+        return self.load
+
+    async def ask(self, payload):
+        return self.name
+
+
+def group(router, strategy, *members):
+    for member in members:
+        router.register("pool", member)
+    router.set_strategy("pool", strategy)
+    return members
+
+
+def test_round_robin_takes_turns():
+    router = Router()
+    a, b = group(router, "round_robin", Member("a"), Member("b"))
+
+    assert [router.resolve_agent("pool") for _ in range(4)] == [a, b, a, b]
+
+
+def test_least_outstanding_counts_queued_in_flight_and_busy():
+    router = Router()
+    queued, running, idle = group(
+        router, "least_outstanding", Member("queued", depth=2), Member("running", busy=1), Member("idle"),
+    )
+
+    assert router.resolve_agent("pool") is idle
+    idle.load["inflight"] = 3
+    assert router.resolve_agent("pool") is running
+
+
+def test_least_outstanding_counts_leased_requests():
+    router = Router()
+    a, b = group(router, "least_outstanding", object(), object())
+
+    async def main():
+        async with router.lease("pool") as first:
+            async with router.lease("pool") as second:
+                return first, second
+
+    first, second = asyncio.run(main())
+    assert {id(first), id(second)} == {id(a), id(b)}
+
+
+def test_consistent_hash_keeps_sessions_on_one_member():
+    router = Router()
+    members = group(router, "consistent_hash", *[Member(f"m{i}") for i in range(4)])
+    sessions = [f"session-{i}" for i in range(200)]
+
+    before = {s: router.resolve_agent("pool", s) for s in sessions}
+    assert all(router.resolve_agent("pool", s) is before[s] for s in sessions)
+    assert len({id(m) for m in before.values()}) == 4
+
+    for _ in range(router.max_failures):
+        router.report_failure(members[0])
+    after = {s: router.resolve_agent("pool", s) for s in sessions}
+    # only the ejected member's sessions moved
+    moved = [s for s in sessions if after[s] is not before[s]]
+    assert moved and all(before[s] is members[0] for s in moved)
+
+
+def test_failing_members_are_ejected_then_readmitted():
+    router = Router(max_failures=2, ejection_time=0.05)
+    a, b = group(router, "round_robin", Member("a"), Member("b"))
+
+    router.report_failure(a)
+    router.report_success(a)
+    router.report_failure(a)
+    assert router.is_healthy(a)
+    router.report_failure(a)
+    assert not router.is_healthy(a)
+    assert {router.resolve_agent("pool").name for _ in range(4)} == {"b"}
+
+    # everyone ejected: use the whole group rather than fail
+    router.report_failure(b)
+    router.report_failure(b)
+    assert router.resolve_agent("pool") in (a, b)
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert router.is_healthy(a) and router.is_healthy(b)
+
+
+def test_lease_reports_agent_errors():
+    router = Router(max_failures=1)
+    router.register("solo", Member("solo"))
+
+    async def main():
+        with pytest.raises(ValueError):
+            async with router.lease("solo"):
+                raise ValueError("agent failed")
+
+    asyncio.run(main())
+    assert not router.is_healthy(router.agents["solo"][0])
+
+
+class ClosingSocket:
+    """Server side of a connection whose client goes away while its ask is running."""
+
+    def __init__(self):
+        self.sent = asyncio.Event()
+
+    async def recv(self):
+        return json.dumps({"auth": None, "agent_name": "solo"})
+
+    async def send(self, message):
+        self.sent.set()
+        raise websockets.ConnectionClosed(None, None)
+
+    async def close(self):
+        pass
+
+    async def __aiter__(self):
+        yield json.dumps({"id": 1, "kind": "ask", "method": "ask", "payload": "hi", "target": "solo"})
+        await self.sent.wait()
+
+
+def test_client_disconnect_does_not_count_against_the_agent():
+    server = RemoteServer()
+    server.router.max_failures = 1
+    agent = Member("solo")
+    server.router.register("solo", agent)
+    server.auth.verify_token = lambda token, subject: True
+
+    async def main():
+        socket = ClosingSocket()
+        await server.ws_handler(socket)
+        return socket.sent.is_set()
+
+    assert asyncio.run(main())
+    assert server.router.is_healthy(agent)
+    assert server.router._failures[id(agent)] == 0
@@ -0,0 +1,108 @@
+import asyncio
+import sys
+import textwrap
+import time
+
+import pytest
+
+from pinet.mcp.errors import MCPConnectionError
+from pinet.mcp.stdio_runner import StdioMCPRunner
+
+# Answers each request on its own thread, so replies come back in completion order, not request order.
+SERVER = textwrap.dedent("""
+    import json, os, sys, threading, time
+    lock = threading.Lock()
+    pong = threading.Event()
+
+    def send(message):
+        with lock:
+            sys.stdout.write(json.dumps(message) + "\\n")
+            sys.stdout.flush()
+
+    def answer(msg):
+        args = msg.get("params", {}).get("arguments", {})
+        mode = args.get("mode")
+        if mode == "exit":
+            os._exit(1)
+        if mode == "notify":
+            send({"jsonrpc": "2.0", "method": "notifications/progress", "params": {"progress": 1}})
+        if mode == "ping":
+            send({"jsonrpc": "2.0", "id": "srv-1", "method": "ping"})
+            pong.wait(5)
+        time.sleep(args.get("t", 0))
+        send({"jsonrpc": "2.0", "id": msg["id"], "result": {"echo": args, "pinged": pong.is_set()}})
+
+    print("booting\\n" * 20000, file=sys.stderr, flush=True)  # more than a pipe buffer
+    for line in sys.stdin:
+        msg = json.loads(line)
+        if "method" not in msg:
+            pong.set()  # the client's reply to our ping
+        elif "id" in msg:
+            threading.Thread(target=answer, args=(msg,)).start()
+""")
+
+
+@pytest.fixture
+def command(tmp_path):
+    script = tmp_path / "server.py"
+    script.write_text(SERVER)
+    return [sys.executable, str(script)]
+
+
+def with_runner(command, body, **kwargs):
+    async def main():
+        runner = StdioMCPRunner(command, **kwargs)
+        try:
+            await runner.initialize()
+            return await body(runner)
+        finally:
+            await runner.close()
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_share_one_process(command):
+    async def body(runner):
+        start = time.monotonic()
+        results = await asyncio.gather(*[runner.call_tool("slow", {"t": t}) for t in (0.3, 0.1, 0.2)])
+        return results, time.monotonic() - start
+
+    results, elapsed = with_runner(command, body)
+    # each reply reached its own caller even though they arrived out of order
+    assert [r["result"]["echo"]["t"] for r in results] == [0.3, 0.1, 0.2]
+    assert elapsed < 0.55
+
+
+def test_notifications_and_server_requests_are_handled(command):
+    notifications = []
+
+    async def body(runner):
+        await runner.call_tool("slow", {"mode": "notify"})
+        return await runner.call_tool("slow", {"mode": "ping"})
+
+    result = with_runner(command, body, on_notification=notifications.append)
+    assert result["result"]["pinged"]
+    assert notifications == [{"jsonrpc": "2.0", "method": "notifications/progress", "params": {"progress": 1}}]
+
+
+def test_requests_time_out(command):
+    async def body(runner):
+        runner.timeout = 0.1
+        with pytest.raises(MCPConnectionError, match="timed out"):
+            await runner.call_tool("slow", {"t": 1})
+        return runner._pending
+
+    assert with_runner(command, body) == {}
+
+
+def test_server_exit_fails_pending_requests(command):
+    async def body(runner):
+        waiting = asyncio.ensure_future(runner.call_tool("slow", {"t": 5}))
+        await asyncio.sleep(0.05)
+        with pytest.raises(MCPConnectionError):
+            await runner.call_tool("slow", {"mode": "exit"})
+        with pytest.raises(MCPConnectionError):
+            await asyncio.wait_for(waiting, 2)
+        with pytest.raises(MCPConnectionError, match="not running"):
+            await runner.call_tool("slow", {})
+
+    with_runner(command, body)
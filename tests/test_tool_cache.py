@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from pinet.mcp.cache import ToolCache
+
+
+class Tool:
+    """Upstream tool call returning a fresh dict (or the given result) each time."""
+
+    def __init__(self, delay=0.0, result=None):
+        self.delay = delay
+        self.result = result
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result if self.result is not None else {"content": [{"type": "text", "text": f"call {self.calls}"}]}
+
+
+def call(cache, tool, ttl=60, arguments=None):
+    return cache.call("server", "search", arguments or {"q": "pinet"}, ttl, tool)
+
+
+def test_results_are_reused_within_ttl():
+    cache = ToolCache()
+    tool = Tool()
+
+    async def main():
+        first = await call(cache, tool)
+        second = await call(cache, tool, arguments={"q": "pinet"})
+        other = await call(cache, tool, arguments={"q": "other"})
+        return first, second, other
+
+    first, second, other = asyncio.run(main())
+    assert first == second
+    assert other != first
+    assert tool.calls == 2
+    assert cache.metrics()["hits"] == 1
+
+
+def test_results_expire_after_ttl():
+    cache = ToolCache()
+    tool = Tool()
+
+    async def main():
+        await call(cache, tool, ttl=0.05)
+        await asyncio.sleep(0.06)
+        return await call(cache, tool, ttl=0.05)
+
+    assert asyncio.run(main())["content"][0]["text"] == "call 2"
+    assert cache.metrics()["expired"] == 1
+
+
+def test_tools_without_ttl_are_not_cached():
+    cache = ToolCache()
+    tool = Tool()
+
+    async def main():
+        await call(cache, tool, ttl=None)
+        await call(cache, tool, ttl=None)
+
+    asyncio.run(main())
+    assert tool.calls == 2
+    assert cache.metrics()["size"] == 0
+
+
+def test_concurrent_identical_calls_share_one_upstream_call():
+    cache = ToolCache()
+    tool = Tool(delay=0.02)
+
+    async def main():
+        return await asyncio.gather(*[call(cache, tool) for _ in range(5)])
+
+    results = asyncio.run(main())
+    assert tool.calls == 1
+    assert all(r == results[0] for r in results)
+    # every caller got its own copy
+    assert len({id(r) for r in results}) == 5
+    stats = cache.metrics()
+    assert stats["misses"] == 1 and stats["coalesced"] == 4
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    cache = ToolCache()
+    tool = Tool(delay=0.05)
+
+    async def main():
+        first = asyncio.create_task(call(cache, tool))
+        second = asyncio.create_task(call(cache, tool))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main())["content"][0]["text"] == "call 1"
+    assert tool.calls == 1
+
+
+def test_failures_are_not_cached():
+    cache = ToolCache()
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await call(cache, Tool(result=RuntimeError("down")))
+        error = await call(cache, Tool(result={"isError": True, "content": []}))
+        return error, await call(cache, Tool())
+
+    error, result = asyncio.run(main())
+    assert error["isError"]
+    assert result["content"][0]["text"] == "call 1"
+    assert cache.metrics()["errors"] == 1
+
+
+def test_mutating_a_result_does_not_change_the_cache():
+    cache = ToolCache()
+    tool = Tool()
+
+    async def main():
+        first = await call(cache, tool)
+        first["content"].clear()
+        return await call(cache, tool)
+
+    assert asyncio.run(main())["content"][0]["text"] == "call 1"
+
+
+def test_results_survive_a_restart_on_disk(tmp_path):
+    tool = Tool()
+    first = ToolCache(path=tmp_path / "tools.sqlite")
+    try:
+        asyncio.run(call(first, tool))
+    finally:
+        first.close()
+
+    second = ToolCache(path=tmp_path / "tools.sqlite")
+    try:
+        result = asyncio.run(call(second, tool))
+    finally:
+        second.close()
+    assert result["content"][0]["text"] == "call 1"
+    assert tool.calls == 1
+    assert second.metrics()["disk_hits"] == 1
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from pinet.agent import Agent
+from pinet.llms.base import BaseLLM
+from pinet.response_cache import ResponseCache
+
+SPECS = [{"name": "lookup", "description": "Look a word up", "parameters": {"type": "object", "properties": {}}}]
+
+
+class ScriptedLLM(BaseLLM):
+    """Native tool-calling LLM that plays back one reply per step and records what it was sent."""
+
+    native_tools = True
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+        self.requests = []
+
+    async def complete(self, prompt):
+        raise AssertionError("not used")
+
+    async def chat(self, messages):
+        raise AssertionError("tool turns go through chat_tools")
+
+    async def chat_tools(self, messages, tools, final=False, on_text=None):
+        self.requests.append({"messages": list(messages), "tools": tools, "final": final})
+        content, calls = self.steps.pop(0) if self.steps else ("", [{"name": "lookup", "arguments": {"q": "again"}}])
+        calls = [] if final else [{"id": f"call{len(self.requests)}-{i}", **c} for i, c in enumerate(calls)]
+        if on_text and content:
+            await on_text(content)
+        return {"content": content, "tool_calls": calls, "message": {"role": "assistant", "content": content, "calls": calls}}
+
+
+class Dictionary:
+    """MCP route serving the lookup tool."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def call_tool(self, name, args):
+        self.calls.append(args)
+        if args.get("q") == "missing":
+            raise KeyError("no such word")
+        return {"definition": f"meaning of {args['q']}"}
+
+
+@pytest.fixture
+def agent():
+    agent = Agent("tester")
+    agent.use_memory = False
+    agent.rag_system = None
+    agent.mcps = {"dict": Dictionary()}
+    agent.allowed_tools = {"lookup": "dict"}
+
+    async def specs():
+        return SPECS
+    agent._describe_tool_specs = specs
+    return agent
+
+
+def test_tool_results_are_fed_back_until_the_model_answers(agent):
+    agent.llm = ScriptedLLM(
+        ("Let me check.", [{"name": "lookup", "arguments": {"q": "pinet"}}, {"name": "lookup", "arguments": {"q": "missing"}}]),
+        ("", [{"name": "lookup", "arguments": {"q": "actor"}}]),
+        ("Done: pinet and actor.", []),
+    )
+
+    reply, calls = asyncio.run(agent._tool_loop([{"role": "user", "content": "define things"}]))
+
+    assert (reply, calls) == ("Done: pinet and actor.", 3)
+    assert agent.mcps["dict"].calls == [{"q": "pinet"}, {"q": "missing"}, {"q": "actor"}]
+    requests = agent.llm.requests
+    assert all(r["tools"] == SPECS for r in requests)
+    second = requests[1]["messages"]
+    assert second[1]["role"] == "assistant"
+    assert second[2] == {"role": "tool", "tool_call_id": "call1-0", "content": '{"definition": "meaning of pinet"}'}
+    # a failing tool becomes text for the model instead of ending the turn
+    assert second[3]["content"].startswith("[Tool lookup Error]")
+    assert len(requests[2]["messages"]) == len(second) + 2
+    assert agent.tool_stats == {"tool_turns": 1, "llm_steps": 3, "tool_calls": 3}
+
+
+def test_last_step_must_answer(agent):
+    agent.max_tool_steps = 2
+    agent.llm = ScriptedLLM()  # would call tools forever
+
+    reply, calls = asyncio.run(agent._tool_loop([{"role": "user", "content": "loop"}]))
+
+    assert [r["final"] for r in agent.llm.requests] == [False, False, True]
+    assert calls == 2
+    assert reply == ""
+
+
+def test_tool_results_are_truncated_to_the_message_cap(agent):
+    agent.context.max_message_tokens = 64
+
+    async def huge(name, args):
+        return "word " * 1000
+    agent.run_tool = huge
+    agent.llm = ScriptedLLM(("", [{"name": "lookup", "arguments": {}}]), ("ok", []))
+
+    asyncio.run(agent._tool_loop([{"role": "user", "content": "q"}]))
+
+    result = agent.llm.requests[1]["messages"][-1]["content"]
+    assert result.endswith("…[truncated]")
+    assert len(result) < 400
+
+
+def test_tool_specs_are_described_once_per_tool_set(agent):
+    described = []
+
+    async def specs():
+        described.append(1)
+        return SPECS
+    agent._describe_tool_specs = specs
+
+    async def main():
+        await agent._cached_tool_specs()
+        await agent._cached_tool_specs()
+        agent.allowed_tools = {**agent.allowed_tools, "define": "dict"}
+        await agent._cached_tool_specs()
+
+    asyncio.run(main())
+    assert len(described) == 2
+
+
+def test_replies_that_used_tools_are_not_cached(agent):
+    agent.response_cache = ResponseCache(similarity=None)
+    agent.llm = ScriptedLLM(
+        ("", [{"name": "lookup", "arguments": {"q": "pinet"}}]), ("pinet is a framework", []),
+        ("", [{"name": "lookup", "arguments": {"q": "pinet"}}]), ("pinet is a framework", []),
+        ("hello there", []), ("hello again", []),
+    )
+
+    async def main():
+        first = [await agent._ask("what is pinet?") for _ in range(2)]
+        second = [await agent._ask("say hello") for _ in range(2)]
+        return first, second
+
+    first, second = asyncio.run(main())
+    # no tool ran for "say hello", so its second ask is a cache hit
+    assert second == ["hello there", "hello there"]
+    assert first == ["pinet is a framework", "pinet is a framework"]
+    assert len(agent.llm.requests) == 5
+    stats = agent.response_cache.metrics()
+    assert stats["bypassed"] == 2 and stats["exact_hits"] == 1